@@ -0,0 +1,180 @@
+BEGIN;
+
+-- Materialised season statistics {{{
+ALTER TABLE season_stats
+  DROP CONSTRAINT season_stats_guildid_userid_fkey,
+  ADD FOREIGN KEY (guildid, userid) REFERENCES members (guildid, userid) ON DELETE CASCADE;
+
+CREATE FUNCTION season_stats_add(_guildid BIGINT, _userid BIGINT, _voice INTEGER, _xp INTEGER, _messages INTEGER)
+  RETURNS VOID
+AS $$
+  BEGIN
+    -- Serialise against season rebuilds for this guild
+    PERFORM pg_advisory_xact_lock(_guildid);
+    INSERT INTO season_stats (guildid, userid, voice_stats, xp_stats, message_stats, season_start)
+    SELECT _guildid, _userid, _voice, _xp, _messages, season_start
+    FROM guild_config WHERE guildid = _guildid
+    ON CONFLICT (guildid, userid) DO UPDATE SET
+      voice_stats = season_stats.voice_stats + EXCLUDED.voice_stats,
+      xp_stats = season_stats.xp_stats + EXCLUDED.xp_stats,
+      message_stats = season_stats.message_stats + EXCLUDED.message_stats,
+      updated_at = now();
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE FUNCTION season_stats_voice_trigger()
+  RETURNS TRIGGER
+AS $$
+  DECLARE
+    _season_start TIMESTAMPTZ;
+    _duration INTEGER;
+  BEGIN
+    SELECT season_start INTO _season_start FROM guild_config WHERE guildid = NEW.guildid;
+    IF _season_start IS NULL OR NEW.start_time >= _season_start THEN
+      _duration := NEW.duration;
+    ELSE
+      _duration := GREATEST(
+        EXTRACT(EPOCH FROM (NEW.start_time + NEW.duration * interval '1 second' - _season_start)), 0
+      );
+    END IF;
+    IF _duration > 0 THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, _duration, 0, 0);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_voice_sessions
+  AFTER INSERT ON voice_sessions
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_voice_trigger();
+
+CREATE FUNCTION season_stats_xp_trigger()
+  RETURNS TRIGGER
+AS $$
+  BEGIN
+    IF NEW.amount != 0 AND NOT EXISTS (
+      SELECT 1 FROM guild_config WHERE guildid = NEW.guildid AND season_start > NEW.earned_at
+    ) THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, 0, NEW.amount, 0);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_member_experience
+  AFTER INSERT ON member_experience
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_xp_trigger();
+
+CREATE FUNCTION season_stats_text_trigger()
+  RETURNS TRIGGER
+AS $$
+  BEGIN
+    IF NEW.messages != 0 AND NOT EXISTS (
+      SELECT 1 FROM guild_config WHERE guildid = NEW.guildid AND season_start > NEW.start_time
+    ) THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, 0, 0, NEW.messages);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_text_sessions
+  AFTER INSERT ON text_sessions
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_text_trigger();
+
+CREATE FUNCTION rebuild_season_stats(_guildid BIGINT)
+  RETURNS VOID
+AS $$
+  DECLARE
+    _season_start TIMESTAMPTZ;
+  BEGIN
+    PERFORM pg_advisory_xact_lock(_guildid);
+    SELECT season_start INTO _season_start FROM guild_config WHERE guildid = _guildid;
+
+    DELETE FROM season_stats WHERE guildid = _guildid;
+
+    INSERT INTO season_stats (guildid, userid, voice_stats, xp_stats, message_stats, season_start)
+    SELECT
+      _guildid, userid,
+      SUM(voice)::INTEGER, SUM(xp)::INTEGER, SUM(messages)::INTEGER,
+      _season_start
+    FROM (
+      SELECT
+        userid,
+        SUM(
+          EXTRACT(EPOCH FROM (
+            start_time + duration * interval '1 second'
+            - GREATEST(start_time, COALESCE(_season_start, start_time))
+          ))
+        ) AS voice,
+        0 AS xp,
+        0 AS messages
+      FROM voice_sessions
+      WHERE
+        guildid = _guildid
+        AND (_season_start IS NULL OR start_time + duration * interval '1 second' > _season_start)
+      GROUP BY userid
+      UNION ALL
+      SELECT userid, 0, SUM(amount), 0
+      FROM member_experience
+      WHERE guildid = _guildid AND (_season_start IS NULL OR earned_at >= _season_start)
+      GROUP BY userid
+      UNION ALL
+      SELECT userid, 0, 0, SUM(messages)
+      FROM text_sessions
+      WHERE guildid = _guildid AND (_season_start IS NULL OR start_time >= _season_start)
+      GROUP BY userid
+    ) AS season_totals
+    GROUP BY userid;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+SELECT rebuild_season_stats(guildid) FROM guild_config;
+-- }}}
+
+-- Resumable rank refreshes {{{
+CREATE TABLE rank_refreshes(
+  guildid BIGINT PRIMARY KEY REFERENCES guild_config ON DELETE CASCADE,
+  actorid BIGINT,
+  channelid BIGINT,
+  messageid BIGINT,
+  started_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+-- }}}
+
+-- App command sync planning {{{
+ALTER TABLE bot_config ADD COLUMN app_commands_hash TEXT;
+ALTER TABLE shard_data ADD COLUMN app_commands_hash TEXT;
+
+CREATE TABLE app_command_ids(
+  appname TEXT NOT NULL REFERENCES bot_config(appname) ON DELETE CASCADE,
+  scope BIGINT NOT NULL,
+  name TEXT NOT NULL,
+  commandid BIGINT NOT NULL,
+  PRIMARY KEY (appname, scope, name)
+);
+-- }}}
+
+-- Reminder execution claims {{{
+ALTER TABLE reminders ADD COLUMN claimed_by TEXT;
+ALTER TABLE reminders ADD COLUMN claimed_until TIMESTAMPTZ;
+-- }}}
+
+-- Shard-local channel webhooks {{{
+ALTER TABLE channel_webhooks ADD COLUMN guildid BIGINT;
+CREATE INDEX channel_webhooks_guildid ON channel_webhooks (guildid);
+
+-- Backfill the guilds of the channels we create webhooks in
+UPDATE channel_webhooks SET guildid = timers.guildid
+  FROM timers WHERE timers.channelid = channel_webhooks.channelid;
+UPDATE channel_webhooks SET guildid = guild_config.guildid
+  FROM guild_config
+  WHERE channel_webhooks.guildid IS NULL
+    AND channel_webhooks.channelid IN (guild_config.event_log_channel, guild_config.mod_log_channel);
+UPDATE channel_webhooks SET guildid = schedule_guild_config.guildid
+  FROM schedule_guild_config
+  WHERE channel_webhooks.guildid IS NULL AND schedule_guild_config.lobby_channel = channel_webhooks.channelid;
+-- }}}
+
+INSERT INTO VersionHistory (version, author) VALUES (15, 'v14-v15 migration');
+COMMIT;
@@ -4,7 +4,7 @@ CREATE TABLE VersionHistory(
   time TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP NOT NULL,
   author TEXT
 );
-INSERT INTO VersionHistory (version, author) VALUES (14, 'Initial Creation');
+INSERT INTO VersionHistory (version, author) VALUES (15, 'Initial Creation');
 
 
 CREATE OR REPLACE FUNCTION update_timestamp_column()
@@ -41,7 +41,8 @@ CREATE TABLE bot_config(
   appname TEXT PRIMARY KEY REFERENCES app_config(appname) ON DELETE CASCADE,
   sponsor_prompt TEXT,
   sponsor_message TEXT,
-  default_skin TEXT
+  default_skin TEXT,
+  app_commands_hash TEXT
 );
 
 CREATE TABLE shard_data(
@@ -50,7 +51,16 @@ CREATE TABLE shard_data(
   shard_id INTEGER NOT NULL,
   shard_count INTEGER NOT NULL,
   last_login TIMESTAMPTZ,
-  guild_count INTEGER
+  guild_count INTEGER,
+  app_commands_hash TEXT
+);
+
+CREATE TABLE app_command_ids(
+  appname TEXT NOT NULL REFERENCES bot_config(appname) ON DELETE CASCADE,
+  scope BIGINT NOT NULL,
+  name TEXT NOT NULL,
+  commandid BIGINT NOT NULL,
+  PRIMARY KEY (appname, scope, name)
 );
 
 CREATE TYPE OnlineStatus AS ENUM(
@@ -194,9 +204,11 @@ CREATE INDEX visible_statistics_guilds ON visible_statistics (guildid);
 
 CREATE TABLE channel_webhooks(
   channelid BIGINT NOT NULL PRIMARY KEY,
+  guildid BIGINT,
   webhookid BIGINT NOT NULL,
   token TEXT NOT NULL
 );
+CREATE INDEX channel_webhooks_guildid ON channel_webhooks (guildid);
 -- }}}
 
 -- Economy Data {{{
@@ -330,7 +342,9 @@ CREATE TABLE reminders(
     failed BOOLEAN,
     created_at TIMESTAMPTZ DEFAULT now(),
     title TEXT,
-    footer TEXT
+    footer TEXT,
+    claimed_by TEXT,
+    claimed_until TIMESTAMPTZ
 );
 CREATE INDEX reminder_users ON reminders (userid);
 -- }}}
@@ -956,6 +970,14 @@ CREATE TABLE member_ranks(
   FOREIGN KEY (guildid, userid) REFERENCES members (guildid, userid)
 );
 
+CREATE TABLE rank_refreshes(
+  guildid BIGINT PRIMARY KEY REFERENCES guild_config ON DELETE CASCADE,
+  actorid BIGINT,
+  channelid BIGINT,
+  messageid BIGINT,
+  started_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
 CREATE TABLE season_stats(
   guildid BIGINT NOT NULL,
   userid BIGINT NOT NULL,
@@ -965,9 +987,133 @@ CREATE TABLE season_stats(
   season_start TIMESTAMPTZ,
   updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
   PRIMARY KEY (guildid, userid),
-  FOREIGN KEY (guildid, userid) REFERENCES members (guildid, userid)
+  FOREIGN KEY (guildid, userid) REFERENCES members (guildid, userid) ON DELETE CASCADE
 );
 
+CREATE FUNCTION season_stats_add(_guildid BIGINT, _userid BIGINT, _voice INTEGER, _xp INTEGER, _messages INTEGER)
+  RETURNS VOID
+AS $$
+  BEGIN
+    -- Serialise against season rebuilds for this guild
+    PERFORM pg_advisory_xact_lock(_guildid);
+    INSERT INTO season_stats (guildid, userid, voice_stats, xp_stats, message_stats, season_start)
+    SELECT _guildid, _userid, _voice, _xp, _messages, season_start
+    FROM guild_config WHERE guildid = _guildid
+    ON CONFLICT (guildid, userid) DO UPDATE SET
+      voice_stats = season_stats.voice_stats + EXCLUDED.voice_stats,
+      xp_stats = season_stats.xp_stats + EXCLUDED.xp_stats,
+      message_stats = season_stats.message_stats + EXCLUDED.message_stats,
+      updated_at = now();
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE FUNCTION season_stats_voice_trigger()
+  RETURNS TRIGGER
+AS $$
+  DECLARE
+    _season_start TIMESTAMPTZ;
+    _duration INTEGER;
+  BEGIN
+    SELECT season_start INTO _season_start FROM guild_config WHERE guildid = NEW.guildid;
+    IF _season_start IS NULL OR NEW.start_time >= _season_start THEN
+      _duration := NEW.duration;
+    ELSE
+      _duration := GREATEST(
+        EXTRACT(EPOCH FROM (NEW.start_time + NEW.duration * interval '1 second' - _season_start)), 0
+      );
+    END IF;
+    IF _duration > 0 THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, _duration, 0, 0);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_voice_sessions
+  AFTER INSERT ON voice_sessions
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_voice_trigger();
+
+CREATE FUNCTION season_stats_xp_trigger()
+  RETURNS TRIGGER
+AS $$
+  BEGIN
+    IF NEW.amount != 0 AND NOT EXISTS (
+      SELECT 1 FROM guild_config WHERE guildid = NEW.guildid AND season_start > NEW.earned_at
+    ) THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, 0, NEW.amount, 0);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_member_experience
+  AFTER INSERT ON member_experience
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_xp_trigger();
+
+CREATE FUNCTION season_stats_text_trigger()
+  RETURNS TRIGGER
+AS $$
+  BEGIN
+    IF NEW.messages != 0 AND NOT EXISTS (
+      SELECT 1 FROM guild_config WHERE guildid = NEW.guildid AND season_start > NEW.start_time
+    ) THEN
+      PERFORM season_stats_add(NEW.guildid, NEW.userid, 0, 0, NEW.messages);
+    END IF;
+    RETURN NULL;
+  END;
+$$ LANGUAGE PLPGSQL;
+
+CREATE TRIGGER season_stats_text_sessions
+  AFTER INSERT ON text_sessions
+  FOR EACH ROW EXECUTE PROCEDURE season_stats_text_trigger();
+
+CREATE FUNCTION rebuild_season_stats(_guildid BIGINT)
+  RETURNS VOID
+AS $$
+  DECLARE
+    _season_start TIMESTAMPTZ;
+  BEGIN
+    PERFORM pg_advisory_xact_lock(_guildid);
+    SELECT season_start INTO _season_start FROM guild_config WHERE guildid = _guildid;
+
+    DELETE FROM season_stats WHERE guildid = _guildid;
+
+    INSERT INTO season_stats (guildid, userid, voice_stats, xp_stats, message_stats, season_start)
+    SELECT
+      _guildid, userid,
+      SUM(voice)::INTEGER, SUM(xp)::INTEGER, SUM(messages)::INTEGER,
+      _season_start
+    FROM (
+      SELECT
+        userid,
+        SUM(
+          EXTRACT(EPOCH FROM (
+            start_time + duration * interval '1 second'
+            - GREATEST(start_time, COALESCE(_season_start, start_time))
+          ))
+        ) AS voice,
+        0 AS xp,
+        0 AS messages
+      FROM voice_sessions
+      WHERE
+        guildid = _guildid
+        AND (_season_start IS NULL OR start_time + duration * interval '1 second' > _season_start)
+      GROUP BY userid
+      UNION ALL
+      SELECT userid, 0, SUM(amount), 0
+      FROM member_experience
+      WHERE guildid = _guildid AND (_season_start IS NULL OR earned_at >= _season_start)
+      GROUP BY userid
+      UNION ALL
+      SELECT userid, 0, 0, SUM(messages)
+      FROM text_sessions
+      WHERE guildid = _guildid AND (_season_start IS NULL OR start_time >= _season_start)
+      GROUP BY userid
+    ) AS season_totals
+    GROUP BY userid;
+  END;
+$$ LANGUAGE PLPGSQL;
+
 -- }}}
 
 -- Rented Room data {{{
@@ -1413,6 +1559,7 @@ CREATE TABLE links(
 
 CREATE TABLE channel_webhooks(
   channelid BIGINT PRIMARY KEY,
+  guildid BIGINT,
   webhookid BIGINT NOT NULL,
   token TEXT NOT NULL
 );
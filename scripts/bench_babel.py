@@ -0,0 +1,89 @@
+# !/bin/python3
+"""
+Startup benchmark for the LeoBabel translator.
+
+Compares eagerly loading every supported (locale, domain) catalogue with lazy loading,
+and times attaching the translator to an application command tree.
+Reads the supported locales and domains from the [BABEL] section of the given config file.
+
+Usage: python scripts/bench_babel.py [config/example-bot.conf]
+"""
+import sys
+import os
+import time
+import asyncio
+import configparser
+
+sys.path.insert(0, os.path.join(os.getcwd()))
+sys.path.insert(0, os.path.join(os.getcwd(), "src"))
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    print(f"{label:<40} {duration:8.4f}s")
+    return result
+
+
+async def atimed(label, coro):
+    start = time.perf_counter()
+    result = await coro
+    duration = time.perf_counter() - start
+    print(f"{label:<40} {duration:8.4f}s")
+    return result
+
+
+def main(configfile='config/example-bot.conf'):
+    import discord
+    from babel.translator import LeoBabel, SOURCE_LOCALE
+
+    config = configparser.ConfigParser()
+    config.read(configfile)
+    section = config['BABEL']
+
+    class BenchBabel(LeoBabel):
+        def read_supported(self):
+            locales = (loc.strip(', ') for loc in section.get('locales', '').split(','))
+            self.supported_locales = {loc for loc in locales if loc}
+            self.supported_locales.add(SOURCE_LOCALE)
+            domains = (dom.strip(', ') for dom in section.get('domains', '').split(','))
+            self.supported_domains = {dom for dom in domains if dom}
+            self.prewarm = False
+
+    def eager():
+        babel = BenchBabel()
+        babel._load()
+        babel._prewarm_catalogues()
+        return babel
+
+    def lazy():
+        babel = BenchBabel()
+        babel._load()
+        return babel
+
+    print(
+        f"LeoBabel benchmark with {len(section.get('locales', '').split(','))} locales "
+        f"and {len(section.get('domains', '').split(','))} domains"
+    )
+    timed("eager load (all catalogues)", eager)
+    babel = timed("lazy load", lazy)
+
+    def first_use():
+        for locale in babel.supported_locales:
+            for domain in babel.supported_domains:
+                babel.get_translator(locale, domain)
+    timed("first use of every catalogue", first_use)
+    timed("memoised use of every catalogue", first_use)
+
+    async def attach():
+        client = discord.Client(intents=discord.Intents.none())
+        tree = discord.app_commands.CommandTree(client)
+        await atimed("tree.set_translator (lazy)", tree.set_translator(lazy()))
+        await tree.set_translator(None)
+        await client.close()
+    asyncio.run(attach())
+
+
+if __name__ == '__main__':
+    main(*sys.argv[1:2])
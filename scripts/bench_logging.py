@@ -0,0 +1,84 @@
+# !/bin/python3
+"""
+Microbenchmark for the logging context decorators.
+
+Measures the per-call overhead of `log_wrap` (isolating in a new task, and the `fast` path)
+against an undecorated coroutine, with each call emitting a single DEBUG record
+through a handler using `ContextInjection` and the standard log format.
+Reports the time per call, and the overhead over the undecorated coroutine.
+
+Usage: python scripts/bench_logging.py [calls]
+"""
+import sys
+import os
+import io
+import time
+import asyncio
+import logging
+
+sys.path.insert(0, os.path.join(os.getcwd()))
+sys.path.insert(0, os.path.join(os.getcwd(), "src"))
+
+
+async def atimed(label, coro_func, calls, baseline=None):
+    start = time.perf_counter()
+    for _ in range(calls):
+        await coro_func()
+    duration = time.perf_counter() - start
+    per_call = duration / calls * 1e6
+    overhead = f"{per_call - baseline:+8.2f}us" if baseline is not None else ""
+    print(f"{label:<40} {duration:8.3f}s {per_call:8.2f}us/call {overhead}")
+    return per_call
+
+
+def main(calls=100_000):
+    from meta.logger import log_wrap, logging_context, log_fmt, ContextInjection
+
+    bench_logger = logging.getLogger('bench_logging')
+    bench_logger.propagate = False
+    bench_logger.setLevel(logging.DEBUG)
+    handler = logging.StreamHandler(io.StringIO())
+    handler.setLevel(logging.DEBUG)
+    handler.setFormatter(log_fmt)
+    handler.addFilter(ContextInjection())
+    bench_logger.addHandler(handler)
+
+    async def handler_body():
+        bench_logger.debug("Processing message")
+
+    async def bare():
+        await handler_body()
+
+    @log_wrap(stack=('Bench', 'Message Event'))
+    async def isolated():
+        await handler_body()
+
+    @log_wrap(stack=('Bench', 'Message Event'), fast=True)
+    async def fast():
+        await handler_body()
+
+    @log_wrap(stack=('Bench', 'Message Event'), fast=True)
+    async def fast_nested():
+        with logging_context(context="mid: 0"):
+            await handler_body()
+
+    async def disabled():
+        # DEBUG disabled, so records are discarded before any context formatting
+        bench_logger.setLevel(logging.INFO)
+        try:
+            await atimed("log_wrap(fast) with DEBUG disabled", fast, calls)
+        finally:
+            bench_logger.setLevel(logging.DEBUG)
+
+    async def run():
+        print(f"log_wrap benchmark with {calls} calls, one DEBUG record per call")
+        baseline = await atimed("undecorated", bare, calls)
+        await atimed("log_wrap (isolated task)", isolated, calls, baseline)
+        await atimed("log_wrap(fast=True)", fast, calls, baseline)
+        await atimed("log_wrap(fast=True) + logging_context", fast_nested, calls, baseline)
+        await disabled()
+    asyncio.run(run())
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:2]))
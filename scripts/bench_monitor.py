@@ -0,0 +1,81 @@
+# !/bin/python3
+"""
+Microbenchmark for the TaskMonitor scheduling structure.
+
+Schedules a large number of tasks, then applies churn (reschedules and cancellations),
+and finally drains the monitor as the executor would, reporting the time taken by each phase.
+
+Usage: python scripts/bench_monitor.py [tasks] [churn]
+"""
+import sys
+import os
+import time
+import random
+import heapq
+
+sys.path.insert(0, os.path.join(os.getcwd()))
+sys.path.insert(0, os.path.join(os.getcwd(), "src"))
+
+
+def timed(label, func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    print(f"{label:<40} {duration:8.3f}s")
+    return result
+
+
+def drain(monitor):
+    # Pop every live task in order, as the monitor loop does
+    count = 0
+    last = None
+    while (entry := monitor._peek()) is not None:
+        heapq.heappop(monitor._heap)
+        monitor._taskmap.pop(entry[2], None)
+        monitor._taskgen.pop(entry[2], None)
+        if last is not None and entry[0] < last:
+            raise ValueError("Tasks drained out of order!")
+        last = entry[0]
+        count += 1
+    return count
+
+
+def main(n=1_000_000, churn=1_000_000):
+    from utils.monitor import TaskMonitor
+
+    rng = random.Random(0)
+    now = int(time.time())
+    horizon = 60 * 60 * 24 * 30
+
+    print(f"TaskMonitor benchmark with {n} tasks and {churn} churn operations")
+
+    monitor = TaskMonitor()
+    tasks = [(i, now + rng.randrange(horizon)) for i in range(n)]
+    timed("schedule_tasks (bulk)", monitor.schedule_tasks, *tasks)
+
+    single = TaskMonitor()
+
+    def schedule_singly():
+        for taskid, timestamp in tasks:
+            single.schedule_task(taskid, timestamp)
+    timed("schedule_task (one at a time)", schedule_singly)
+    del single
+
+    def apply_churn():
+        for _ in range(churn):
+            taskid = rng.randrange(n)
+            if rng.random() < 0.75:
+                monitor.schedule_task(taskid, now + rng.randrange(horizon))
+            else:
+                monitor.cancel_tasks(taskid)
+    timed("churn (75% reschedule, 25% cancel)", apply_churn)
+    print(f"{'live tasks / heap entries':<40} {len(monitor._taskmap)} / {len(monitor._heap)}")
+
+    live = len(monitor._taskmap)
+    drained = timed("drain in order", drain, monitor)
+    if drained != live:
+        raise ValueError(f"Drained {drained} tasks but {live} were live!")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
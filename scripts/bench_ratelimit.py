@@ -0,0 +1,84 @@
+# !/bin/python3
+"""
+Microbenchmark for the RateLimit key store.
+
+Sends requests for a large number of distinct keys through a `RateLimitStore`,
+and through the previous representation of one `Bucket` per key in a dictionary,
+reporting the time taken and the memory held by each.
+
+Usage: python scripts/bench_ratelimit.py [keys] [requests]
+"""
+import sys
+import os
+import time
+import random
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.getcwd()))
+sys.path.insert(0, os.path.join(os.getcwd(), "src"))
+
+
+def timed(label, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    duration = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<40} {duration:8.3f}s {current / 2**20:10.1f}MiB held {peak / 2**20:10.1f}MiB peak")
+    return result
+
+
+def main(n=1_000_000, requests=3_000_000):
+    from utils.ratelimits import RateLimitStore, Bucket, BucketFull
+
+    rng = random.Random(0)
+    keys = [(rng.getrandbits(63), rng.getrandbits(63)) for _ in range(n)]
+    stream = [keys[rng.randrange(n)] for _ in range(requests)]
+
+    print(f"RateLimit store benchmark with {n} keys and {requests} requests")
+
+    def run_store():
+        store = RateLimitStore(5, 10, maxsize=n)
+        refused = 0
+        for key in stream:
+            try:
+                store.request(key)
+            except BucketFull:
+                refused += 1
+        return store, refused
+    store, refused = timed("RateLimitStore (GCRA)", run_store)
+    print(f"{'keys held / refused':<40} {len(store)} / {refused}")
+    del store
+
+    def run_buckets():
+        buckets = {}
+        refused = 0
+        for key in stream:
+            if (bucket := buckets.get(key, None)) is None:
+                bucket = buckets[key] = Bucket(5, 10)
+            try:
+                bucket.request()
+            except BucketFull:
+                refused += 1
+        return buckets, refused
+    buckets, refused = timed("Bucket per key", run_buckets)
+    print(f"{'keys held / refused':<40} {len(buckets)} / {refused}")
+    del buckets
+
+    def run_bounded():
+        # Half sized store, keys expire and are evicted as the stream progresses
+        store = RateLimitStore(5, 0.5, maxsize=n // 2)
+        refused = 0
+        for key in stream:
+            try:
+                store.request(key)
+            except BucketFull:
+                refused += 1
+        return store, refused
+    store, refused = timed("RateLimitStore (bounded, evicting)", run_bounded)
+    print(f"{'keys held / refused':<40} {len(store)} / {refused}")
+
+
+if __name__ == '__main__':
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -120,7 +120,7 @@ class AnalyticsServer:
 
     async def run(self):
         setup_main_logger()
-        log_action_stack.set(['Analytics'])
+        log_action_stack.set(('Analytics',))
         log_app.set(conf.analytics['appname'])
 
         async with self.db.open():
@@ -20,6 +20,7 @@ from . import babel
 from .enums import locale_names
 from .settings import LocaleSettings
 from .settingui import LocaleSettingUI
+from .resolver import LocaleResolver
 
 _ = babel._
 _p = babel._p
@@ -32,10 +33,12 @@ class BabelCog(LionCog):
         self.bot = bot
         self.settings = LocaleSettings()
         self.t = self.bot.translator.t
+        self.resolver: Optional[LocaleResolver] = None
 
     async def cog_load(self):
         if not self.bot.core:
             raise ValueError("CoreCog must be loaded first!")
+        self.resolver = LocaleResolver(self.bot.core.data)
         self.bot.core.guild_config.register_model_setting(LocaleSettings.ForceLocale)
         self.bot.core.guild_config.register_model_setting(LocaleSettings.GuildLocale)
         self.bot.core.user_config.register_model_setting(LocaleSettings.UserLocale)
@@ -53,11 +56,23 @@ class BabelCog(LionCog):
         """
         Fetch the best locale we can guess for this userid.
         """
-        data = await self.bot.core.data.User.fetch(userid)
-        if data:
-            return data.locale or data.locale_hint or SOURCE_LOCALE
-        else:
-            return SOURCE_LOCALE
+        return await self.resolver.user_locale(userid)
+
+    async def resolve_locales(self, *userids) -> dict[int, str]:
+        """
+        Bulk fetch the best locale we can guess for each of the given userids.
+        """
+        locales = await self.resolver.resolve_locales(*userids)
+        return {userid: locale or SOURCE_LOCALE for userid, locale in locales.items()}
+
+    @LionCog.listener('on_userset_locale')
+    async def _user_locale_updated(self, userid, setting):
+        self.resolver.set_user_locale(userid, setting.data)
+
+    @LionCog.listener('on_guildset_locale')
+    @LionCog.listener('on_guildset_force_locale')
+    async def _guild_locale_updated(self, guildid, setting):
+        self.resolver.invalidate_guild(guildid)
 
     async def bot_check_once(self, ctx: LionContext):  # type: ignore  # Type checker doesn't understand coro checks
         """
@@ -0,0 +1,134 @@
+from typing import Optional
+import logging
+
+from cachetools import TTLCache
+
+from core.data import CoreData
+
+from .translator import SOURCE_LOCALE
+
+logger = logging.getLogger(__name__)
+
+
+class LocaleResolver:
+    """
+    Cached locale resolution for background jobs.
+
+    Caches the configured locale of each user (falling back to their locale hint),
+    and the configured locale and force flag of each guild.
+    The caches are kept up to date from the locale setting update events (see `BabelCog`),
+    and otherwise expire after `ttl` seconds, which bounds staleness from updates on other shards.
+
+    Batch jobs (e.g. reminder bursts or schedule notifications) should use the bulk
+    `resolve_locales` and `resolve_member_locales` methods,
+    which load all uncached locales in a single query.
+    """
+    _missing = object()
+
+    def __init__(self, data: CoreData, maxsize: int = 100000, ttl: int = 60 * 60):
+        self.data = data
+
+        # userid -> locale or None
+        self._user_locales: TTLCache[int, Optional[str]] = TTLCache(maxsize, ttl)
+        # guildid -> (locale or None, forced)
+        self._guild_locales: TTLCache[int, tuple[Optional[str], bool]] = TTLCache(maxsize, ttl)
+
+    def __repr__(self):
+        return (
+            "<LocaleResolver "
+            f"users={len(self._user_locales)} "
+            f"guilds={len(self._guild_locales)}"
+            ">"
+        )
+
+    # Invalidation
+    def set_user_locale(self, userid: int, locale: Optional[str]):
+        """
+        Update the cached user locale, e.g. after the `user_locale` setting is changed.
+
+        Unsetting the locale invalidates the cache entry, since the locale hint may apply.
+        """
+        if locale is None:
+            self._user_locales.pop(userid, None)
+        else:
+            self._user_locales[userid] = locale
+
+    def invalidate_user(self, *userids: int):
+        for userid in userids:
+            self._user_locales.pop(userid, None)
+
+    def invalidate_guild(self, *guildids: int):
+        for guildid in guildids:
+            self._guild_locales.pop(guildid, None)
+
+    # Resolution
+    async def resolve_locales(self, *userids: int) -> dict[int, Optional[str]]:
+        """
+        Resolve the configured locales of the given users.
+
+        Users with no configured locale or locale hint resolve to None.
+        """
+        locales = {}
+        missing = []
+        for userid in userids:
+            if (locale := self._user_locales.get(userid, self._missing)) is self._missing:
+                missing.append(userid)
+            else:
+                locales[userid] = locale
+
+        if missing:
+            rows = await self.data.User.table.select_where(
+                userid=missing
+            ).select('userid', 'locale', 'locale_hint').with_no_adapter()
+            found = {row['userid']: (row['locale'] or row['locale_hint']) for row in rows}
+            for userid in missing:
+                locales[userid] = self._user_locales[userid] = found.get(userid, None)
+            logger.debug(
+                f"Resolved {len(missing)} uncached user locales out of {len(userids)} requested."
+            )
+        return locales
+
+    async def resolve_guild_locales(self, *guildids: int) -> dict[int, tuple[Optional[str], bool]]:
+        """
+        Resolve the configured locale and force flag of the given guilds.
+        """
+        locales = {}
+        missing = []
+        for guildid in guildids:
+            if (config := self._guild_locales.get(guildid, None)) is None:
+                missing.append(guildid)
+            else:
+                locales[guildid] = config
+
+        if missing:
+            rows = await self.data.Guild.table.select_where(
+                guildid=missing
+            ).select('guildid', 'locale', 'force_locale').with_no_adapter()
+            found = {row['guildid']: (row['locale'], bool(row['force_locale'])) for row in rows}
+            for guildid in missing:
+                locales[guildid] = self._guild_locales[guildid] = found.get(guildid, (None, False))
+        return locales
+
+    async def user_locale(self, userid: int) -> str:
+        """
+        The best locale we can guess for private communication with this user.
+        """
+        locales = await self.resolve_locales(userid)
+        return locales[userid] or SOURCE_LOCALE
+
+    async def resolve_member_locales(self, guildid: int, *userids: int) -> dict[int, str]:
+        """
+        Resolve the locale to use for each of the given members of a guild.
+
+        Uses the guild locale if the guild forces it,
+        otherwise the user locale, falling back to the guild locale.
+        """
+        guild_locale, forced = (await self.resolve_guild_locales(guildid))[guildid]
+        if forced and guild_locale:
+            return {userid: guild_locale for userid in userids}
+
+        user_locales = await self.resolve_locales(*userids)
+        return {
+            userid: user_locales[userid] or guild_locale or SOURCE_LOCALE
+            for userid in userids
+        }
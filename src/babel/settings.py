@@ -73,6 +73,7 @@ class LocaleSettings(SettingGroup):
         Exposed via dedicated setting command.
         """
         setting_id = 'user_locale'
+        _event = 'userset_locale'
 
         _display_name = _p('userset:locale', 'language')
         _desc = _p('userset:locale|desc', "Your preferred language for interacting with me.")
@@ -108,6 +109,7 @@ class LocaleSettings(SettingGroup):
         Exposed via `/config language` command and standard configuration interface.
         """
         setting_id = 'force_locale'
+        _event = 'guildset_force_locale'
         _write_ward = low_management_iward
 
         _display_name = _p('guildset:force_locale', 'force_language')
@@ -155,6 +157,7 @@ class LocaleSettings(SettingGroup):
         Exposed via `/config language` command, and standard configuration interface.
         """
         setting_id = 'guild_locale'
+        _event = 'guildset_locale'
         _write_ward = low_management_iward
 
         _display_name = _p('guildset:locale', 'language')
@@ -3,6 +3,7 @@ import logging
 from contextvars import ContextVar
 from collections import defaultdict
 from enum import Enum
+import asyncio
 
 import gettext
 
@@ -25,6 +26,8 @@ class LeoBabel(Translator):
         self.supported_locales = {loc.name for loc in Locale}
         self.supported_domains = {}
         self.translators = defaultdict(dict)  # locale -> domain -> GNUTranslator
+        self.prewarm = False
+        self._prewarm_task: Optional[asyncio.Task] = None
 
     def read_supported(self):
         """
@@ -41,35 +44,60 @@ class LeoBabel(Translator):
         stripped = (dom.strip(', ') for dom in domains.split(','))
         self.supported_domains = {dom for dom in stripped if dom}
 
+        self.prewarm = conf.babel.getboolean('prewarm', False)
+
     async def load(self):
         self._load()
+        if self.prewarm:
+            # Load the catalogues in the background
+            self._prewarm_task = asyncio.create_task(self._prewarm_catalogues(), name='babel-prewarm')
 
     def _load(self):
         """
-        Initialise the gettext translators for the supported_locales.
+        Prepare the translators for the supported_locales.
+
+        Catalogues are not read here,
+        instead they are loaded lazily on first use by `get_translator`.
         """
         self.read_supported()
-        missing = []
-        loaded = []
-        for locale in self.supported_locales:
-            for domain in self.supported_domains:
-                if locale == SOURCE_LOCALE:
-                    continue
-                try:
-                    translator = gettext.translation(domain, "locales/", languages=[locale])
-                    loaded.append(f"Loaded translator for <locale: {locale}> <domain: {domain}>")
-                except OSError:
-                    # Presume translation does not exist
-                    missing.append(f"Could not load translator for supported <locale: {locale}> <domain: {domain}>")
-                    translator = null
-
-                self.translators[locale][domain] = translator
-        if missing:
-            logger.warning('\n'.join(("Missing Translators:", *missing)))
-        if loaded:
-            logger.debug('\n'.join(("Loaded Translators:", *loaded)))
+        self.translators.clear()
+
+    def _load_translator(self, locale: str, domain: str):
+        """
+        Load and memoise the gettext translator for the given supported locale and domain.
+        """
+        try:
+            translator = gettext.translation(domain, "locales/", languages=[locale])
+            logger.debug(f"Loaded translator for <locale: {locale}> <domain: {domain}>")
+        except OSError:
+            # Presume translation does not exist
+            logger.warning(f"Could not load translator for supported <locale: {locale}> <domain: {domain}>")
+            translator = null
+
+        self.translators[locale][domain] = translator
+        return translator
+
+    async def _prewarm_catalogues(self):
+        """
+        Load every supported translator which has not yet been loaded.
+
+        Runs on the event loop one catalogue at a time, yielding in between,
+        so it cannot race `get_translator` on the shared translator cache, and stops when cancelled.
+        """
+        count = 0
+        for locale in list(self.supported_locales):
+            if locale == SOURCE_LOCALE:
+                continue
+            for domain in list(self.supported_domains):
+                if domain not in self.translators[locale]:
+                    self._load_translator(locale, domain)
+                    count += 1
+                    await asyncio.sleep(0)
+        logger.info(f"Prewarmed {count} translators.")
 
     async def unload(self):
+        if self._prewarm_task is not None and not self._prewarm_task.done():
+            self._prewarm_task.cancel()
         self.translators.clear()
 
     def get_translator(self, locale: Optional[str], domain):
@@ -80,12 +108,7 @@ class LeoBabel(Translator):
         elif locale in self.supported_locales and domain in self.supported_domains:
             translator = self.translators[locale].get(domain, None)
             if translator is None:
-                # This should never really happen because we already loaded the supported translators
-                logger.warning(
-                    f"Translator missing for supported <locale: {locale}> "
-                    "and <domain: {domain}>. Setting NullTranslator."
-                )
-                translator = self.translators[locale][domain] = null
+                translator = self._load_translator(locale, domain)
         else:
             # Unsupported
             translator = null
@@ -9,7 +9,7 @@ from discord.ext import commands
 
 from meta import CrocBot, LionBot, conf, sharding, appname, shard_talk, sockets, args
 from meta.app import shardname
-from meta.logger import log_context, log_action_stack, setup_main_logger
+from meta.logger import log_context, log_action_stack, setup_main_logger, handlers as live_log_handlers
 from meta.context import ctx_bot
 from meta.monitor import ComponentMonitor, StatusLevel, ComponentStatus, SystemMonitor
 
@@ -51,6 +51,30 @@ async def _data_monitor() -> ComponentStatus:
     return ComponentStatus(level, info, info, data)
 
 
+async def _live_log_monitor() -> ComponentStatus:
+    """
+    Component monitor callback for the webhook live loggers.
+    """
+    stats = [handler.stats() for handler in live_log_handlers]
+    data = {
+        key: sum(stat[key] for stat in stats)
+        for key in ('pending', 'received', 'coalesced', 'sent', 'dropped', 'ignored')
+    }
+    data['handlers'] = len(stats)
+    data['details'] = '\n'.join(map(repr, live_log_handlers))
+    if data['dropped'] or data['ignored']:
+        level = StatusLevel.UNSURE
+        info = "(UNSURE) Live loggers have lost records. "
+    else:
+        level = StatusLevel.OKAY
+        info = "(OK) "
+    info += (
+        "<LiveLoggers handlers={handlers} pending={pending} received={received} coalesced={coalesced} "
+        "sent={sent} dropped={dropped} ignored={ignored}>"
+    )
+    return ComponentStatus(level, info, info + "\n{details}", data)
+
+
 async def main():
     log_action_stack.set(("Initialising",))
     logger.info("Initialising StudyLion")
@@ -71,6 +95,7 @@ async def main():
             logger.critical(error)
             raise RuntimeError(error)
         system_monitor.add_component(ComponentMonitor('Database', _data_monitor))
+        system_monitor.add_component(ComponentMonitor('LiveLoggers', _live_log_monitor))
 
         translator = LeoBabel()
         ctx_translator.set(translator)
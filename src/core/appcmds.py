@@ -0,0 +1,54 @@
+from typing import Optional
+import hashlib
+import json
+
+import discord
+from discord import app_commands as appcmd
+
+
+# Scope of the global commands in `app_command_ids`
+GLOBAL_SCOPE = 0
+
+
+async def payload_hash(tree: appcmd.CommandTree, guild: Optional[discord.abc.Snowflake] = None) -> str:
+    """
+    Hash the (translated) payload `tree.sync` would send for the given scope.
+
+    Commands with the same hash have already been synced,
+    so the sync and the command ids it returned may be reused.
+    """
+    commands = tree._get_all_commands(guild=guild)
+    translator = tree.translator
+    if translator:
+        payload = [await command.get_translated_payload(tree, translator) for command in commands]
+    else:
+        payload = [command.to_dict(tree) for command in commands]
+    payload.sort(key=lambda command: (command.get('type', 1), command['name']))
+    encoded = json.dumps(payload, sort_keys=True, default=str).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def combined_hash(hashes: dict[int, str]) -> str:
+    """
+    Combine the payload hashes of several scopes into a single hash.
+    """
+    encoded = json.dumps(sorted(hashes.items())).encode()
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def command_ids(cmds: list[appcmd.AppCommand]) -> dict[str, int]:
+    """
+    Map the qualified names of the given commands and their subcommands to the command id used in mentions.
+    """
+    ids = {}
+
+    def walk(options, commandid):
+        for option in options:
+            if isinstance(option, appcmd.AppCommandGroup):
+                ids[option.qualified_name] = commandid
+                walk(option.options, commandid)
+
+    for cmd in cmds:
+        ids[cmd.name] = cmd.id
+        walk(cmd.options, cmd.id)
+    return ids
@@ -1,24 +1,33 @@
+import asyncio
 import logging
-from typing import Optional
+from typing import Optional, Type
 from collections import defaultdict
-from weakref import WeakValueDictionary
 
 import discord
-import discord.app_commands as appcmd
+from psycopg import sql
 
 from meta import LionBot, LionCog, LionContext
-from meta.app import shardname, appname
+from meta.app import shardname, appname, shard_talk
+from meta.monitor import ComponentMonitor, ComponentStatus, StatusLevel
 from meta.logger import log_wrap
+from meta.sharding import THIS_SHARD
+from data.conditions import Condition, Joiner
 from utils.lib import utc_now
+from utils.refresh import MessageRefresher
+from utils.actions import ActionExecutor
 
 from settings.groups import SettingGroup
+from settings.data import ListData
+from settings.cache import SettingCache
 
 from .data import CoreData
 from .lion import Lions
 from .lion_guild import GuildConfig
 from .lion_member import MemberConfig
 from .lion_user import UserConfig
-from .hooks import HookedChannel
+from .hooks import WebhookRegistry
+from .appcmds import GLOBAL_SCOPE, payload_hash, combined_hash, command_ids
+from .eventlog import EventLogDispatcher
 
 logger = logging.getLogger(__name__)
 
@@ -50,16 +59,37 @@ class CoreCog(LionCog):
         self.guild_setting_groups: list[SettingGroup] = []
         self.user_setting_groups: list[SettingGroup] = []
 
+        # Guild ListData settings to bulk load on startup, see `preload_guild_settings`
+        self.preload_settings: list[Type[ListData]] = []
+        self._settings_preloaded = False
+
         # Some ModelSetting registries
         # These are for more convenient direct access
         self.guild_config = GuildConfig
         self.user_config = UserConfig
         self.member_config = MemberConfig
 
-        self.app_cmd_cache: list[discord.app_commands.AppCommand] = []
-        self.cmd_name_cache: dict[str, discord.app_commands.AppCommand] = {}
+        # Built from the stored command ids by `sync_app_commands`
         self.mention_cache: dict[str, str] = keydefaultdict(self.mention_cmd)
-        self.hook_cache: WeakValueDictionary[int, HookedChannel] = WeakValueDictionary()
+
+        # Saved channel webhooks, preloaded on ready
+        self.webhooks = WebhookRegistry(bot)
+
+        # Shared debouncer for status message edits
+        self.refresher = MessageRefresher()
+
+        # Shared per-guild queue for bulk role, voice and channel actions
+        self.actions = ActionExecutor()
+
+        # Batched guild event log delivery
+        self.event_logs = EventLogDispatcher()
+
+        # Cross-shard setting cache invalidation
+        self.talk_setting_invalidate = shard_talk.register_route('invalidate setting')(
+            SettingCache.invalidate_named
+        )
+        self.cache_monitor = ComponentMonitor('SettingCaches', self._cache_monitor)
+        self.event_log_monitor = ComponentMonitor('EventLogs', self._event_log_monitor)
 
     async def cog_load(self):
         # Fetch (and possibly create) core data rows.
@@ -76,25 +106,91 @@ class CoreCog(LionCog):
 
         await self.bot.add_cog(self.lions)
 
-        # Load the app command cache
-        await self.reload_appcmd_cache()
+        SettingCache.invalidation_hook = self._broadcast_setting_write
+        self.bot.system_monitor.add_component(self.cache_monitor)
+        self.bot.system_monitor.add_component(self.event_log_monitor)
+
+        if self.bot.is_ready():
+            # Reloaded after startup, rebuild the app command cache
+            await self.sync_app_commands()
+
+    @log_wrap(action='Sync App Commands')
+    async def sync_app_commands(self):
+        """
+        Sync the application commands in the testing guilds on this shard,
+        and build the command mention cache.
+
+        The translated command payload of each scope is hashed and compared with the hash stored at the last sync,
+        in `shard_data` for the testing guilds on this shard, and in `bot_config` for the global commands.
+        Unchanged scopes are not synced, and the command ids stored at the last sync are reused for the mention cache,
+        so a restart without command changes makes no command requests.
+
+        Global commands are not synced here, but refetched when their payload has changed.
+        Their hash is only stored once every local global command has been registered.
+        """
+        tree = self.bot.tree
+        shard_count, shard_id = self.bot.shard_count, self.bot.shard_id
+        guildids = [
+            guildid for guildid in self.bot.testing_guilds
+            if not shard_count or (shard_id == ((guildid >> 22) % shard_count))
+        ]
+        for guildid in guildids:
+            tree.copy_global_to(guild=discord.Object(guildid))
+
+        guild_hash = combined_hash({
+            guildid: await payload_hash(tree, guild=discord.Object(guildid)) for guildid in guildids
+        })
+        global_hash = await payload_hash(tree)
+
+        scopes = [*self.bot.testing_guilds, GLOBAL_SCOPE]
+        rows = await self.data.app_command_ids.select_where(
+            appname=appname, scope=scopes
+        ).with_no_adapter()
+        stored: dict[int, dict[str, int]] = defaultdict(dict)
+        for row in rows:
+            stored[row['scope']][row['name']] = row['commandid']
 
-    async def reload_appcmd_cache(self):
-        for guildid in self.bot.testing_guilds:
-            self.app_cmd_cache += await self.bot.tree.fetch_commands(guild=discord.Object(guildid))
-        self.app_cmd_cache += await self.bot.tree.fetch_commands()
-        self.cmd_name_cache = {cmd.name: cmd for cmd in self.app_cmd_cache}
-        self.mention_cache = self._mention_cache_from(self.app_cmd_cache)
+        if guildids and guild_hash != self.shard_data.app_commands_hash:
+            for guildid in guildids:
+                stored[guildid] = command_ids(await tree.sync(guild=discord.Object(guildid)))
+                await self._save_command_ids(guildid, stored[guildid])
+            await self.shard_data.update(app_commands_hash=guild_hash)
+            logger.info(f"Synced application commands in {len(guildids)} testing guilds.")
+        elif guildids:
+            logger.info(f"Application commands in {len(guildids)} testing guilds are unchanged, skipping sync.")
 
-    def _mention_cache_from(self, cmds: list[appcmd.AppCommand | appcmd.AppCommandGroup]):
+        if global_hash != self.bot_config.app_commands_hash:
+            stored[GLOBAL_SCOPE] = command_ids(await tree.fetch_commands())
+            await self._save_command_ids(GLOBAL_SCOPE, stored[GLOBAL_SCOPE])
+            # The global commands are synced externally, so the local payload only matches once they are registered
+            missing = {cmd.name for cmd in tree._get_all_commands()} - stored[GLOBAL_SCOPE].keys()
+            if missing:
+                logger.warning(
+                    f"Global application commands {', '.join(sorted(missing))} are not registered. "
+                    "Refetching command ids on next start."
+                )
+            else:
+                await self.bot_config.update(app_commands_hash=global_hash)
+                logger.info("Global application commands changed, refetched command ids.")
+
+        # Global commands take precedence over the testing guild copies
         cache = keydefaultdict(self.mention_cmd)
-        for cmd in cmds:
-            cache[cmd.qualified_name if isinstance(cmd, appcmd.AppCommandGroup) else cmd.name] = cmd.mention
-            subcommands = [option for option in cmd.options if isinstance(option, appcmd.AppCommandGroup)]
-            if subcommands:
-                subcache = self._mention_cache_from(subcommands)
-                cache |= subcache
-        return cache
+        for scope in scopes:
+            for name, commandid in stored.get(scope, {}).items():
+                cache[name] = f"</{name}:{commandid}>"
+        self.mention_cache = cache
+
+    async def _save_command_ids(self, scope: int, ids: dict[str, int]):
+        async with self.bot.db.connection() as conn:
+            async with conn.transaction():
+                await self.data.app_command_ids.delete_where(
+                    appname=appname, scope=scope
+                ).with_connection(conn)
+                if ids:
+                    await self.data.app_command_ids.insert_many(
+                        ('appname', 'scope', 'name', 'commandid'),
+                        *((appname, scope, name, commandid) for name, commandid in ids.items())
+                    ).with_connection(conn)
 
     def mention_cmd(self, name: str):
         """
@@ -108,14 +204,117 @@ class CoreCog(LionCog):
             mention = f"</{name}:1110834049204891730>"
         return mention
 
-    def hooked_channel(self, channelid: int):
-        if (hooked := self.hook_cache.get(channelid, None)) is None:
-            hooked = HookedChannel(self.bot, channelid)
-            self.hook_cache[channelid] = hooked
-        return hooked
+    def _broadcast_setting_write(self, name: str, parent_id):
+        """
+        Setting invalidation hook, broadcasting the write to the other shards.
+        """
+        asyncio.create_task(
+            self._broadcast_setting_invalidation(name, parent_id),
+            name='setting-invalidate'
+        )
+
+    @log_wrap(action='Broadcast setting invalidation')
+    async def _broadcast_setting_invalidation(self, name: str, parent_id):
+        results = await self.talk_setting_invalidate(name, parent_id).broadcast()
+        failed = [appid for appid, result in results.items() if isinstance(result, Exception)]
+        if failed:
+            logger.warning(
+                f"Could not invalidate setting {name!r} <pid: {parent_id}> on peers {failed}."
+            )
+
+    async def _cache_monitor(self) -> ComponentStatus:
+        caches = [cache for cache in SettingCache.registry.values() if cache.hits or cache.misses or len(cache)]
+        hits = sum(cache.hits for cache in caches)
+        misses = sum(cache.misses for cache in caches)
+        data = dict(
+            caches=len(caches),
+            entries=sum(len(cache) for cache in caches),
+            hits=hits,
+            misses=misses,
+            hit_rate=f"{hits / (hits + misses):.1%}" if (hits or misses) else '-',
+            invalidations=sum(cache.invalidations for cache in caches),
+            details='\n'.join(map(repr, caches)),
+        )
+        short = (
+            "(OK) "
+            "<SettingCaches caches={caches} entries={entries} hits={hits} misses={misses} "
+            "hit_rate={hit_rate} invalidations={invalidations}>"
+        )
+        return ComponentStatus(StatusLevel.OKAY, short, short + "\n{details}", data)
+
+    async def _event_log_monitor(self) -> ComponentStatus:
+        data = self.event_logs.stats()
+        if data['saturated']:
+            level = StatusLevel.UNSURE
+            info = "(UNSURE) Event logs in {saturated} guilds are saturated and dropping events. "
+        else:
+            level = StatusLevel.OKAY
+            info = "(OK) "
+        info += (
+            "<EventLogs guilds={guilds} pending={pending} sent={sent} batches={batches} dropped={dropped}>"
+        )
+        return ComponentStatus(level, info, info, data)
+
+    def _active_guild_condition(self, column: str = 'guildid') -> Condition:
+        """
+        Condition filtering the given guild column to guilds we have not left.
+        """
+        return Condition(
+            sql.Identifier(column),
+            Joiner.IN,
+            sql.SQL("(SELECT guildid FROM {table} WHERE left_at IS NULL)").format(
+                table=sql.Identifier(self.data.Guild._tablename_)
+            )
+        )
+
+    async def register_preload_settings(self, *settings: Type[ListData]):
+        """
+        Register guild ListData settings to be bulk loaded on startup.
+
+        The settings must have a cache, and be keyed by guildid.
+        Settings registered after the startup preload (e.g. on a module reload) are loaded immediately.
+        """
+        for setting in settings:
+            if setting not in self.preload_settings:
+                self.preload_settings.append(setting)
+        if self._settings_preloaded:
+            await self.preload_guild_settings(*settings)
+
+    @log_wrap(action='Preload Guild Settings')
+    async def preload_guild_settings(self, *settings: Type[ListData]):
+        """
+        Load the given (or all registered) guild ListData settings
+        for every active guild on this shard, with one query per setting table.
+
+        Active guilds with no entries are cached as empty,
+        so the first reads after startup do not fall through to the database.
+        """
+        settings = settings or tuple(self.preload_settings)
+        if not settings:
+            return
+        rows = await self.data.Guild.table.select_where(
+            THIS_SHARD, left_at=None
+        ).select('guildid').with_no_adapter()
+        guildids = [row['guildid'] for row in rows]
+
+        counts = await asyncio.gather(*(
+            setting.preload(
+                THIS_SHARD, self._active_guild_condition(setting._id_column),
+                parent_ids=guildids
+            )
+            for setting in settings
+        ))
+        self._settings_preloaded = True
+        logger.info(
+            f"Preloaded {sum(counts)} entries of {len(settings)} guild settings "
+            f"for {len(guildids)} active guilds on this shard."
+        )
 
     async def cog_unload(self):
+        await self.event_logs.flush()
         await self.bot.remove_cog(self.lions.qualified_name)
+        if SettingCache.invalidation_hook == self._broadcast_setting_write:
+            SettingCache.invalidation_hook = None
         self.bot.remove_listener(self.shard_update_guilds, name='on_guild_join')
         self.bot.remove_listener(self.shard_update_guilds, name='on_guild_leave')
 
@@ -129,6 +328,40 @@ class CoreCog(LionCog):
     async def shard_update_guilds(self, guild):
         await self.shard_data.update(guild_count=len(self.bot.guilds))
 
+    @LionCog.listener('on_guild_join')
+    @log_wrap(action='Mark guild joined')
+    async def mark_guild_joined(self, guild: discord.Guild):
+        await self.data.Guild.table.update_where(guildid=guild.id).set(left_at=None)
+
+    @LionCog.listener('on_guild_remove')
+    @log_wrap(action='Mark guild left')
+    async def mark_guild_left(self, guild: discord.Guild):
+        await self.data.Guild.table.update_where(guildid=guild.id).set(left_at=utc_now())
+
+    @LionCog.listener('on_ready')
+    @log_wrap(action='Preload webhooks')
+    async def preload_webhooks(self):
+        if not self.webhooks.loaded:
+            await self.webhooks.preload()
+            logger.info(f"Loaded channel webhooks for this shard: {self.webhooks!r}")
+
+    @LionCog.listener('on_guild_channel_delete')
+    @log_wrap(action='Forget channel webhook')
+    async def forget_channel_webhook(self, channel: discord.abc.GuildChannel):
+        await self.webhooks.forget_channels([channel.id])
+
+    @LionCog.listener('on_guild_join')
+    @log_wrap(action='Load guild webhooks')
+    async def load_guild_webhooks(self, guild: discord.Guild):
+        # The guild may have saved webhooks from before we left, or from before a restart
+        if self.webhooks.loaded:
+            await self.webhooks.preload([channel.id for channel in guild.channels])
+
+    @LionCog.listener('on_guild_remove')
+    @log_wrap(action='Forget guild webhooks')
+    async def forget_guild_webhooks(self, guild: discord.Guild):
+        await self.webhooks.forget_channels([channel.id for channel in guild.channels], delete=False)
+
     @LionCog.listener('on_ping')
     async def handle_ping(self, *args, **kwargs):
         logger.info(f"Received ping with args {args}, kwargs {kwargs}")
@@ -49,7 +49,8 @@ class CoreData(Registry, name="core"):
             appname TEXT PRIMARY KEY REFERENCES app_config(appname) ON DELETE CASCADE,
             sponsor_prompt TEXT,
             sponsor_message TEXT,
-            default_skin TEXT
+            default_skin TEXT,
+            app_commands_hash TEXT
         );
         """
         _tablename_ = 'bot_config'
@@ -58,6 +59,7 @@ class CoreData(Registry, name="core"):
         default_skin = String()
         sponsor_prompt = String()
         sponsor_message = String()
+        app_commands_hash = String()
 
     class Shard(RowModel):
         """
@@ -69,7 +71,8 @@ class CoreData(Registry, name="core"):
             shard_id INTEGER NOT NULL,
             shard_count INTEGER NOT NULL,
             last_login TIMESTAMPTZ,
-            guild_count INTEGER
+            guild_count INTEGER,
+            app_commands_hash TEXT
         );
         """
         _tablename_ = 'shard_data'
@@ -80,6 +83,20 @@ class CoreData(Registry, name="core"):
         shard_count = Integer()
         last_login = Timestamp()
         guild_count = Integer()
+        app_commands_hash = String()
+
+    """
+    Schema
+    ------
+    CREATE TABLE app_command_ids(
+      appname TEXT NOT NULL REFERENCES bot_config(appname) ON DELETE CASCADE,
+      scope BIGINT NOT NULL,
+      name TEXT NOT NULL,
+      commandid BIGINT NOT NULL,
+      PRIMARY KEY (appname, scope, name)
+    );
+    """
+    app_command_ids = Table('app_command_ids')
 
     class User(RowModel):
         """
@@ -362,14 +379,17 @@ class CoreData(Registry, name="core"):
         ------
         CREATE TABLE channel_webhooks(
           channelid BIGINT NOT NULL PRIMARY KEY,
+          guildid BIGINT,
           webhookid BIGINT NOT NULL,
           token TEXT NOT NULL
         );
+        CREATE INDEX channel_webhooks_guildid ON channel_webhooks (guildid);
         """
         _tablename_ = 'channel_webhooks'
         _cache_ = {}
 
         channelid = Integer(primary=True)
+        guildid = Integer()
         webhookid = Integer()
         token = String()
 
@@ -0,0 +1,153 @@
+from typing import Optional, TYPE_CHECKING
+from collections import deque
+import asyncio
+import logging
+
+import discord
+
+if TYPE_CHECKING:
+    from .lion_guild import LionGuild
+
+logger = logging.getLogger(__name__)
+
+
+# Discord limits on the embeds in a single message
+MAX_EMBEDS = 10
+MAX_EMBED_CHARS = 6000
+
+
+class _GuildLog:
+    __slots__ = ('guildid', 'lguild', 'queue', 'task', 'sent', 'batches', 'dropped', 'saturated')
+
+    def __init__(self, guildid: int):
+        self.guildid = guildid
+        self.lguild: Optional['LionGuild'] = None
+        self.queue: deque[discord.Embed] = deque()
+        self.task: Optional[asyncio.Task] = None
+
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+        self.saturated = False
+
+
+class EventLogDispatcher:
+    """
+    Batched delivery of guild event log embeds.
+
+    Events logged through `LionGuild.log_event` are buffered per guild for `window` seconds,
+    and then delivered in as few webhook messages as possible,
+    each holding up to 10 embeds (within Discord's total embed size limit).
+    A burst of events (e.g. many members joining voice at once) is thus sent in a handful of
+    webhook calls rather than one call per event.
+
+    Each guild buffers at most `maxsize` pending embeds.
+    While a guild's buffer is full (e.g. because its webhook is ratelimited) new events are dropped,
+    and counted in the guild and global drop counters.
+    """
+    def __init__(self, window: float = 2, maxsize: int = 100):
+        self.window = window
+        self.maxsize = maxsize
+
+        self._logs: dict[int, _GuildLog] = {}
+
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
+
+    def __repr__(self):
+        return (
+            "<EventLogDispatcher "
+            f"guilds={len(self._logs)} "
+            f"pending={sum(len(log.queue) for log in self._logs.values())} "
+            f"sent={self.sent} "
+            f"batches={self.batches} "
+            f"dropped={self.dropped}"
+            ">"
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'guilds': len(self._logs),
+            'pending': sum(len(log.queue) for log in self._logs.values()),
+            'saturated': sum(1 for log in self._logs.values() if log.saturated),
+            'sent': self.sent,
+            'batches': self.batches,
+            'dropped': self.dropped,
+        }
+
+    def submit(self, lguild: 'LionGuild', embed: discord.Embed) -> bool:
+        """
+        Queue an embed for delivery to the event log of the given guild.
+
+        Returns whether the embed was accepted, or dropped because the guild log is saturated.
+        """
+        log = self._logs.get(lguild.guildid, None)
+        if log is None:
+            log = self._logs[lguild.guildid] = _GuildLog(lguild.guildid)
+        # Always deliver through the most recent LionGuild, which has the current configuration
+        log.lguild = lguild
+
+        if len(log.queue) >= self.maxsize:
+            log.dropped += 1
+            self.dropped += 1
+            if not log.saturated:
+                log.saturated = True
+                logger.warning(
+                    f"Event log in <gid: {log.guildid}> is saturated with {len(log.queue)} pending events. "
+                    "Dropping new events until it drains."
+                )
+            return False
+
+        log.queue.append(embed)
+        if log.task is None or log.task.done():
+            log.task = asyncio.create_task(self._run(log), name=f'event-log-{log.guildid}')
+        return True
+
+    def _take_batch(self, log: _GuildLog) -> list[discord.Embed]:
+        batch = []
+        chars = 0
+        while log.queue and len(batch) < MAX_EMBEDS:
+            size = len(log.queue[0])
+            if batch and chars + size > MAX_EMBED_CHARS:
+                break
+            batch.append(log.queue.popleft())
+            chars += size
+        return batch
+
+    async def _run(self, log: _GuildLog):
+        try:
+            while log.queue:
+                # Collect the rest of the burst
+                await asyncio.sleep(self.window)
+                while log.queue:
+                    batch = self._take_batch(log)
+                    await log.lguild._log_events(batch)
+                    log.sent += len(batch)
+                    log.batches += 1
+                    self.sent += len(batch)
+                    self.batches += 1
+                if log.saturated:
+                    log.saturated = False
+                    logger.info(
+                        f"Event log in <gid: {log.guildid}> drained after dropping {log.dropped} events."
+                    )
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            logger.exception(
+                f"Unhandled exception in event log dispatcher for <gid: {log.guildid}>. "
+                f"Discarding {len(log.queue)} pending events."
+            )
+            log.queue.clear()
+        finally:
+            if not log.queue and self._logs.get(log.guildid, None) is log:
+                self._logs.pop(log.guildid, None)
+
+    async def flush(self):
+        """
+        Wait for all pending events to be delivered, e.g. before shutdown.
+        """
+        tasks = [log.task for log in self._logs.values() if log.task is not None and not log.task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
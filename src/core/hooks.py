@@ -1,106 +1,224 @@
 from typing import Optional
+from weakref import WeakValueDictionary
 import logging
 import asyncio
 
 import discord
 
-from meta import LionBot
+from meta import LionBot, conf
+from meta.sharding import THIS_SHARD
+from data import NULL
 
 from .data import CoreData
 
 logger = logging.getLogger(__name__)
 
 
-MISSING = discord.utils.MISSING
+# Keyword arguments accepted by `discord.Webhook.edit_message`
+WEBHOOK_EDIT_KWARGS = ('content', 'embed', 'embeds', 'attachments', 'view', 'allowed_mentions')
 
 
-class HookedChannel:
-    def __init__(self, bot: LionBot, channelid: int):
-        self.bot = bot
-        self.channelid = channelid
+class WebhookRegistry:
+    """
+    Shard-wide registry of the webhooks we own in guild channels (e.g. event logs, timer and lobby channels).
+
+    Webhook ids and tokens are stored in the `channel_webhooks` table, keyed by channel with the owning guild,
+    and the rows for guilds on this shard are bulk loaded by `preload` once the shard is ready.
+    Afterwards, lookups are served from memory, with a channel missing from the registry having no webhook.
+    Before preloading (or for channels we cannot see), lookups fall back to fetching the channel row.
 
-        self.webhook: Optional[discord.Webhook] | MISSING = None
-        self.data: Optional[CoreData.LionHook] = None
+    All webhook invalidation (e.g. on `discord.NotFound` when sending) goes through `invalidate`,
+    so that a deleted webhook is forgotten everywhere and recreated at most once.
+    """
+    def __init__(self, bot: LionBot):
+        self.bot = bot
 
-        self.lock = asyncio.Lock()
+        # channelid -> (webhookid, token), or None if we know the channel has no webhook
+        self._hooks: dict[int, Optional[tuple[int, str]]] = {}
+        self._webhooks: dict[int, discord.Webhook] = {}
+        self._locks: WeakValueDictionary[int, asyncio.Lock] = WeakValueDictionary()
+        # Channels evicted from memory whose saved webhooks may still exist, e.g. in a guild we left
+        self._evicted: set[int] = set()
+        self.loaded = False
+
+        self.created = 0
+        self.invalidated = 0
+
+    def __repr__(self):
+        return (
+            "<WebhookRegistry "
+            f"loaded={self.loaded} "
+            f"webhooks={sum(1 for hook in self._hooks.values() if hook is not None)} "
+            f"created={self.created} "
+            f"invalidated={self.invalidated}"
+            ">"
+        )
 
     @property
-    def channel(self) -> Optional[discord.TextChannel | discord.VoiceChannel | discord.StageChannel]:
-        if not self.bot.is_ready():
-            raise ValueError("Cannot get hooked channel before ready.")
-        channel = self.bot.get_channel(self.channelid)
-        if channel and not isinstance(channel, (discord.TextChannel, discord.VoiceChannel, discord.StageChannel)):
-            raise ValueError(f"Hooked channel expects GuildChannel not '{channel.__class__.__name__}'")
-        return channel
-
-    async def get_webhook(self) -> Optional[discord.Webhook]:
+    def table(self):
+        return CoreData.LionHook.table
+
+    def _lock_for(self, channelid: int) -> asyncio.Lock:
+        if (lock := self._locks.get(channelid, None)) is None:
+            lock = self._locks[channelid] = asyncio.Lock()
+        return lock
+
+    def _as_webhook(self, channelid: int, webhookid: int, token: str) -> discord.Webhook:
+        webhook = discord.Webhook.partial(webhookid, token, client=self.bot)
+        webhook.proxy = conf.bot.get('proxy', None)
+        self._webhooks[channelid] = webhook
+        return webhook
+
+    async def preload(self, channelids: Optional[list[int]] = None):
+        """
+        Bulk load the saved webhooks for the given channels.
+
+        If no channels are given, loads every saved webhook in a channel on this shard,
+        after which the registry is considered complete.
+        """
+        if channelids is not None:
+            channelids = [channelid for channelid in channelids if channelid not in self._hooks]
+            if not channelids:
+                return
+            rows = await self.table.select_where(channelid=channelids).select(
+                'channelid', 'webhookid', 'token'
+            ).with_no_adapter()
+        else:
+            # The table is shared between shards, legacy rows without a guild are filtered locally
+            rows = await self.table.select_where(
+                THIS_SHARD | (CoreData.LionHook.guildid == NULL)
+            ).select(
+                'channelid', 'guildid', 'webhookid', 'token'
+            ).with_no_adapter()
+            rows = [
+                row for row in rows
+                if row['guildid'] is not None or self.bot.get_channel(row['channelid']) is not None
+            ]
+
+        for row in rows:
+            self._hooks[row['channelid']] = (row['webhookid'], row['token'])
+            self._webhooks.pop(row['channelid'], None)
+            self._evicted.discard(row['channelid'])
+        if channelids is not None:
+            for channelid in channelids:
+                self._hooks.setdefault(channelid, None)
+                self._evicted.discard(channelid)
+        else:
+            self.loaded = True
+        logger.debug(f"Preloaded {len(rows)} channel webhooks.")
+
+    def _known(self, channelid: int) -> bool:
         """
-        Fetch the saved discord.Webhook for this channel.
+        Whether we know if the channel has a saved webhook, without fetching it.
+        """
+        if channelid in self._hooks:
+            return True
+        return self.loaded and channelid not in self._evicted and self.bot.get_channel(channelid) is not None
+
+    def _cached_webhook(self, channelid: int) -> Optional[discord.Webhook]:
+        if (webhook := self._webhooks.get(channelid, None)) is None:
+            if (hook := self._hooks.get(channelid, None)) is not None:
+                webhook = self._as_webhook(channelid, *hook)
+        return webhook
+
+    async def _fetch(self, channelid: int):
+        rows = await self.table.select_where(channelid=channelid).select(
+            'webhookid', 'token'
+        ).with_no_adapter()
+        self._hooks[channelid] = (rows[0]['webhookid'], rows[0]['token']) if rows else None
+        self._evicted.discard(channelid)
+
+    async def get_webhook(self, channelid: int) -> Optional[discord.Webhook]:
+        """
+        Get the saved webhook in the given channel, if it exists.
 
-        Uses cached webhook if possible, but instantiates if required.
         Does not create a new webhook, use `create_webhook` for that.
         """
-        async with self.lock:
-            if self.webhook is MISSING:
-                hook = None
-            elif self.webhook is None:
-                # Fetch webhook data
-                data = await CoreData.LionHook.fetch(self.channelid)
-                if data is not None:
-                    # Instantiate Webhook
-                    hook = self.webhook = data.as_webhook(client=self.bot)
-                else:
-                    self.webhook = MISSING
-                    hook = None
-            else:
-                hook = self.webhook
-
-            return hook
-
-    async def create_webhook(self, **creation_kwargs) -> Optional[discord.Webhook]:
+        if not self._known(channelid):
+            async with self._lock_for(channelid):
+                if not self._known(channelid):
+                    await self._fetch(channelid)
+        return self._cached_webhook(channelid)
+
+    async def create_webhook(self, channel: discord.abc.GuildChannel, **creation_kwargs) -> Optional[discord.Webhook]:
         """
-        Create and save a new webhook in this channel.
+        Get the saved webhook in this channel, or create and save a new one.
 
-        Returns None if we could not create a new webhook.
+        Returns None if we do not have permission to create a webhook in this channel.
+        Raises `discord.HTTPException` if creation fails.
         """
-        async with self.lock:
-            if self.webhook is not MISSING:
-                # Delete any existing webhook
-                if self.webhook is not None:
-                    try:
-                        await self.webhook.delete()
-                    except discord.HTTPException as e:
-                        logger.info(
-                            f"Ignoring exception while refreshing webhook for {self.channelid}: {repr(e)}"
-                        )
-                await self.bot.core.data.LionHook.table.delete_where(channelid=self.channelid)
-                self.webhook = MISSING
-                self.data = None
-
-            channel = self.channel
-            if channel is not None and channel.permissions_for(channel.guild.me).manage_webhooks:
-                if 'avatar' not in creation_kwargs:
-                    avatar = self.bot.user.avatar if self.bot.user else None
-                    creation_kwargs['avatar'] = (await avatar.to_file()).fp.read() if avatar else None
-                webhook = await channel.create_webhook(**creation_kwargs)
-                self.data = await self.bot.core.data.LionHook.create(
-                    channelid=self.channelid,
-                    token=webhook.token,
-                    webhookid=webhook.id,
-                )
-                self.webhook = webhook
+        async with self._lock_for(channel.id):
+            if not self._known(channel.id):
+                await self._fetch(channel.id)
+            if (webhook := self._cached_webhook(channel.id)) is not None:
+                # Created while we were waiting for the lock
                 return webhook
+            if not channel.permissions_for(channel.guild.me).manage_webhooks:
+                return None
+
+            if 'avatar' not in creation_kwargs:
+                avatar = self.bot.user.avatar if self.bot.user else None
+                creation_kwargs['avatar'] = (await avatar.to_file()).fp.read() if avatar else None
+            webhook = await channel.create_webhook(**creation_kwargs)
+            await self.table.insert(
+                channelid=channel.id,
+                guildid=channel.guild.id,
+                webhookid=webhook.id,
+                token=webhook.token,
+            ).on_conflict(target=('channelid',), update=('guildid', 'webhookid', 'token'))
+            self._hooks[channel.id] = (webhook.id, webhook.token)
+            self._webhooks[channel.id] = webhook
+            self.created += 1
+            return webhook
+
+    async def invalidate(self, channelid: int, webhookid: Optional[int] = None) -> bool:
+        """
+        Forget the saved webhook in the given channel,
+        e.g. because it was deleted on the Discord side.
+
+        If `webhookid` is given, only invalidates the saved webhook if it is still that webhook,
+        so concurrent invalidations of the same deleted webhook do not discard its replacement.
 
-    async def invalidate(self, webhook: discord.Webhook):
+        Returns whether a saved webhook was invalidated.
+        """
+        hook = self._hooks.get(channelid, None)
+        if webhookid is not None and hook is not None and hook[0] != webhookid:
+            return False
+        self._hooks[channelid] = None
+        self._webhooks.pop(channelid, None)
+        if webhookid is not None:
+            rows = await self.table.delete_where(channelid=channelid, webhookid=webhookid)
+        else:
+            rows = await self.table.delete_where(channelid=channelid)
+        if rows:
+            self.invalidated += 1
+            logger.info(f"Invalidated saved webhook in <cid: {channelid}>.")
+        return bool(rows) or hook is not None
+
+    async def forget_channels(self, channelids: list[int], delete: bool = True):
+        """
+        Bulk forget the saved webhooks in the given channels, e.g. after they were deleted.
+
+        If `delete` is false, only evicts the webhooks from memory,
+        e.g. for a guild we have left, whose webhooks remain valid if we rejoin.
+        Evicted channels are fetched again on their next lookup, or bulk reloaded by `preload`.
+        """
+        if not delete:
+            self._evicted.update(channelids)
+        channelids = [channelid for channelid in channelids if channelid in self._hooks]
+        for channelid in channelids:
+            self._hooks.pop(channelid, None)
+            self._webhooks.pop(channelid, None)
+        if channelids and delete:
+            await self.table.delete_where(channelid=channelids)
+
+    @staticmethod
+    async def edit_message(webhook: discord.Webhook, messageid: int, **edit_args) -> discord.WebhookMessage:
         """
-        Invalidate the given webhook.
+        Edit a message previously sent by the webhook, without fetching it first.
 
-        To be used when the webhook has been deleted on the Discord side.
+        Accepts the `edit_args` of a `MessageArgs`,
+        and returns the edited message, which may be edited directly afterwards.
         """
-        async with self.lock:
-            if self.webhook is not None and self.webhook is not MISSING and self.webhook.id == webhook.id:
-                # Webhook provided matches current webhook
-                # Delete current webhook
-                self.webhook = MISSING
-                self.data = None
-            await self.bot.core.data.LionHook.table.delete_where(webhookid=webhook.id)
+        kwargs = {key: value for key, value in edit_args.items() if key in WEBHOOK_EDIT_KWARGS}
+        return await webhook.edit_message(messageid, **kwargs)
@@ -12,7 +12,6 @@ from utils.lib import Timezoned, utc_now
 from settings.groups import ModelConfig, SettingDotDict
 from babel.translator import ctx_locale
 
-from .hooks import HookedChannel
 from .data import CoreData
 from . import babel
 
@@ -120,8 +119,6 @@ class LionGuild(Timezoned):
         'config',
         '_guild',
         'voice_lock',
-        '_eventlogger',
-        '_tasks',
         '__weakref__'
     )
 
@@ -142,23 +139,9 @@ class LionGuild(Timezoned):
         # Avoids voice race-states
         self.voice_lock = asyncio.Lock()
 
-        # HookedChannel managing the webhook used to send guild event logs
-        # May be None if no event log is set or if the channel does not exist
-        self._eventlogger: Optional[HookedChannel] = None
-
-        # Set of background tasks associated with this guild (e.g. event logs)
-        # In theory we should ensure these are finished before the lguild is gcd
-        # But this is *probably* not an actual problem in practice
-        self._tasks = set()
-
     @property
-    def eventlogger(self) -> Optional[HookedChannel]:
-        channelid = self.data.event_log_channel
-        if channelid is None:
-            self._eventlogger = None
-        elif self._eventlogger is None or self._eventlogger.channelid != channelid:
-            self._eventlogger = self.bot.core.hooked_channel(channelid)
-        return self._eventlogger
+    def eventlog_channelid(self) -> Optional[int]:
+        return self.data.event_log_channel
 
     @property
     def guild(self):
@@ -188,14 +171,15 @@ class LionGuild(Timezoned):
 
     @log_wrap(action='get event hook')
     async def get_event_hook(self) -> Optional[discord.Webhook]:
-        hooked = self.eventlogger
+        channelid = self.eventlog_channelid
         ctx_locale.set(self.locale)
 
-        if hooked:
-            hook = await hooked.get_webhook()
+        if channelid is not None:
+            webhooks = self.bot.core.webhooks
+            hook = await webhooks.get_webhook(channelid)
             if hook is not None:
                 pass
-            elif (channel := hooked.channel) is None:
+            elif (channel := self.bot.get_channel(channelid)) is None:
                 # Event log channel doesn't exist
                 pass
             elif not channel.permissions_for(channel.guild.me).manage_webhooks:
@@ -214,7 +198,8 @@ class LionGuild(Timezoned):
                 # We should be able to create the hook
                 t = self.bot.translator.t
                 try:
-                    hook = await hooked.create_webhook(
+                    hook = await webhooks.create_webhook(
+                        channel,
                         name=t(_p(
                             'eventlog|create|name',
                             "{bot_name} Event Log"
@@ -231,31 +216,35 @@ class LionGuild(Timezoned):
                     )
             return hook
 
-    @log_wrap(action="Log Event")
-    async def _log_event(self, embed: discord.Embed, retry=True):
-        logger.debug(f"Logging event log event: {embed.to_dict()}")
+    @log_wrap(action="Log Events")
+    async def _log_events(self, embeds: list[discord.Embed], retry=True):
+        """
+        Send a batch of (at most 10) event log embeds in a single webhook message.
+
+        Used by the `EventLogDispatcher`, prefer `log_event` for logging events.
+        """
+        logger.debug(f"Logging {len(embeds)} event log events in <gid: {self.guildid}>.")
 
         hook = await self.get_event_hook()
         if hook is not None:
             try:
-                await hook.send(embed=embed)
+                await hook.send(embeds=embeds)
             except discord.NotFound:
                 logger.info(
                     f"Event log in <gid: {self.guildid}> invalidated. Recreating: {retry}"
                 )
-                hooked = self.eventlogger
-                if hooked is not None:
-                    await hooked.invalidate(hook)
+                if (channelid := self.eventlog_channelid) is not None:
+                    await self.bot.core.webhooks.invalidate(channelid, hook.id)
                     if retry:
-                        await self._log_event(embed, retry=False)
+                        await self._log_events(embeds, retry=False)
             except discord.HTTPException:
                 logger.warning(
-                    f"Discord exception occurred sending event log event: {embed.to_dict()}.",
+                    f"Discord exception occurred sending event log events: {[embed.to_dict() for embed in embeds]}.",
                     exc_info=True
                 )
             except Exception:
                 logger.exception(
-                    f"Unknown exception occurred sending event log event: {embed.to_dict()}."
+                    f"Unknown exception occurred sending event log events: {[embed.to_dict() for embed in embeds]}."
                 )
 
     def log_event(self,
@@ -270,6 +259,8 @@ class LionGuild(Timezoned):
         Synchronously log an event to the guild event log.
 
         Does nothing if the event log has not been set up.
+        Events are buffered briefly and delivered in batches (see `EventLogDispatcher`),
+        and may be dropped if the guild event log is saturated.
 
         Parameters
         ----------
@@ -293,6 +284,10 @@ class LionGuild(Timezoned):
             if possible.
             These will be added before the `fields` given.
         """
+        if self.eventlog_channelid is None:
+            # Nothing to log to, don't build or queue the embed
+            return
+
         t = self.bot.translator.t
 
         # Build embed
@@ -346,7 +341,5 @@ class LionGuild(Timezoned):
                 name=error_name, value=error_value, inline=False
             )
 
-        # Send embed
-        task = asyncio.create_task(self._log_event(embed=base), name='event-log')
-        self._tasks.add(task)
-        task.add_done_callback(self._tasks.discard)
+        # Queue embed for batched delivery
+        self.bot.core.event_logs.submit(self, base)
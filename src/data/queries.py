@@ -415,11 +415,37 @@ class Insert(ExtraMixin, TableQuery[QueryResult]):
         self._values = values
         return self
 
-    def on_conflict(self, ignore=False):
+    def on_conflict(self, ignore=False, target: tuple[str, ...] = (), update: tuple[str, ...] = ()):
+        """
+        Set the conflict behaviour of the insert.
+
+        Parameters
+        ----------
+        ignore: bool
+            Whether to ignore conflicting rows (`DO NOTHING`).
+
+        target: tuple[str]
+            Conflict target columns, required when upserting.
+
+        update: tuple[str]
+            Columns to overwrite with the inserted values on conflict (`DO UPDATE`).
+        """
         # TODO lots more we can do here
         # Maybe return a Conflict object that can chain itself (not the query)
         if ignore:
             self._conflict = RawExpr(sql.SQL('DO NOTHING'))
+        elif update:
+            if not target:
+                raise ValueError("Cannot upsert without a conflict target.")
+            self._conflict = RawExpr(
+                sql.SQL("({target}) DO UPDATE SET {updates}").format(
+                    target=sql.SQL(', ').join(map(sql.Identifier, target)),
+                    updates=sql.SQL(', ').join(
+                        sql.SQL("{column} = EXCLUDED.{column}").format(column=sql.Identifier(column))
+                        for column in update
+                    )
+                )
+            )
         return self
 
     @property
@@ -129,11 +129,11 @@ class LionBot(Bot):
         for extension in self.initial_extensions:
             await self.load_extension(extension)
 
-        for guildid in self.testing_guilds:
-            guild = discord.Object(guildid)
-            if not self.shard_count or (self.shard_id == ((guildid >> 22) % self.shard_count)):
-                self.tree.copy_global_to(guild=guild)
-                await self.tree.sync(guild=guild)
+        # Bulk load the guild settings registered by the modules, before we receive any events
+        await self.core.preload_guild_settings()
+
+        # Sync changed app commands, and load the command ids
+        await self.core.sync_app_commands()
 
     # To make the type checker happy about fetching cogs by name
     # TODO: Move this to stubs at some point
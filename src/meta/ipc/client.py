@@ -1,4 +1,4 @@
-from typing import Optional, TypeAlias, Any
+from typing import Optional, TypeAlias, Any, Callable, Coroutine
 import asyncio
 import logging
 import pickle
@@ -22,6 +22,8 @@ class AppClient:
         self.server_address = server_address
 
         self.peers = {appid: client_address}  # appid -> address
+        # Callbacks run whenever the peer list changes
+        self._peer_callbacks: list[Callable[[], Coroutine[Any, Any, None]]] = []
 
         self._listener: Optional[asyncio.Server] = None  # Local client server
         self._server = None  # Connection to the registry server
@@ -35,6 +37,21 @@ class AppClient:
     def my_peers(self):
         return {peerid: peer for peerid, peer in self.peers.items() if peerid.startswith(self.basename)}
 
+    def add_peer_callback(self, callback: Callable[[], Coroutine[Any, Any, None]]):
+        """
+        Register a coroutine function to be run whenever the peer list changes.
+        """
+        self._peer_callbacks.append(callback)
+        return callback
+
+    def remove_peer_callback(self, callback):
+        if callback in self._peer_callbacks:
+            self._peer_callbacks.remove(callback)
+
+    def _peers_changed(self):
+        for callback in self._peer_callbacks:
+            asyncio.create_task(callback())
+
     def register_route(self, name=None):
         def wrapper(coro):
             route = AppRoute(coro, client=self, name=name)
@@ -56,6 +73,7 @@ class AppClient:
             peers = pickle.loads(data)
             self.peers = peers
             self._server = (reader, writer)
+            self._peers_changed()
         except Exception:
             logger.exception(
                 "Could not connect to registry server. Trying again in 30 seconds.",
@@ -87,12 +105,15 @@ class AppClient:
 
     async def new_peer(self, appid, address):
         self.peers[appid] = address
+        self._peers_changed()
 
     async def peer_list(self, peers):
         self.peers = peers
+        self._peers_changed()
 
     async def drop_peer(self, appid):
         self.peers.pop(appid, None)
+        self._peers_changed()
 
     async def close(self):
         # Close connection to the server
@@ -7,7 +7,8 @@ import queue
 import multiprocessing
 from contextlib import contextmanager
 from io import StringIO
-from functools import wraps
+from collections import OrderedDict
+from functools import wraps, lru_cache
 from contextvars import ContextVar
 
 import discord
@@ -18,7 +19,7 @@ from .config import conf
 from . import sharding
 from .context import context
 from utils.lib import utc_now
-from utils.ratelimits import Bucket, BucketOverFull, BucketFull
+from utils.ratelimits import Bucket, BucketFull
 
 
 log_logger = logging.getLogger(__name__)
@@ -29,6 +30,23 @@ log_context: ContextVar[str] = ContextVar('logging_context', default='CTX: ROOT
 log_action_stack: ContextVar[tuple[str, ...]] = ContextVar('logging_action_stack', default=())
 log_app: ContextVar[str] = ContextVar('logging_shard', default="SHARD {:03}".format(sharding.shard_number))
 
+def _push_action_stack(current: tuple[str, ...], action=None, stack=None) -> tuple[str, ...]:
+    newstack = stack if stack is not None else current
+    if action is not None:
+        newstack = (*newstack, action)
+    return newstack
+
+
+def _reset_tokens(*pairs):
+    for var, token in pairs:
+        if token is not None:
+            try:
+                var.reset(token)
+            except ValueError:
+                # Token was created in a different Context, e.g. the coroutine is being garbage collected
+                pass
+
+
 def set_logging_context(
     context: Optional[str] = None,
     action: Optional[str] = None,
@@ -42,11 +60,9 @@ def set_logging_context(
     if context is not None:
         log_context.set(context)
     if action is not None or stack is not None:
-        astack = log_action_stack.get()
-        newstack = stack if stack is not None else astack
-        if action is not None:
-            newstack = (*newstack, action)
-        log_action_stack.set(newstack)
+        if stack is not None:
+            stack = tuple(stack)
+        log_action_stack.set(_push_action_stack(log_action_stack.get(), action, stack))
 
 
 @contextmanager
@@ -64,25 +80,19 @@ def logging_context(context=None, action=None, stack=None):
     (It will not necessarily break on async code,
      if the async code can be guaranteed to clean up in its own context.)
     """
-    if context is not None:
-        oldcontext = log_context.get()
-        log_context.set(context)
+    ctoken = log_context.set(context) if context is not None else None
+    stoken = None
     if action is not None or stack is not None:
-        astack = log_action_stack.get()
-        newstack = stack if stack is not None else astack
-        if action is not None:
-            newstack = (*newstack, action)
-        log_action_stack.set(newstack)
+        if stack is not None:
+            stack = tuple(stack)
+        stoken = log_action_stack.set(_push_action_stack(log_action_stack.get(), action, stack))
     try:
         yield
     finally:
-        if context is not None:
-            log_context.set(oldcontext)
-        if stack is not None or action is not None:
-            log_action_stack.set(astack)
+        _reset_tokens((log_context, ctoken), (log_action_stack, stoken))
 
 
-def with_log_ctx(isolate=True, **kwargs):
+def with_log_ctx(isolate=True, fast=False, **kwargs):
     """
     Execute a coroutine inside a given logging context.
 
@@ -92,21 +102,47 @@ def with_log_ctx(isolate=True, **kwargs):
     If `isolate` is false, just statically set the context,
     which will leak unless the coroutine is
     called in an externally copied context.
+
+    If `fast` is true, the logging context is pushed before awaiting the coroutine,
+    and restored afterwards, instead of isolating the coroutine in a new task.
+    This saves a task and context copy per call on hot paths, such as event listeners
+    (which discord.py already runs in their own task),
+    but only the logging context is restored, so the coroutine must not rely on
+    isolation of other context variables.
     """
+    context = kwargs.get('context', None)
+    action = kwargs.get('action', None)
+    stack = kwargs.get('stack', None)
+    if stack is not None:
+        stack = kwargs['stack'] = tuple(stack)
+
     def decorator(func):
-        @wraps(func)
-        async def wrapped(*w_args, **w_kwargs):
-            if isolate:
-                with logging_context(**kwargs):
-                    # Task creation will synchronously copy the context
-                    # This is gc safe
-                    name = kwargs.get('action', f"log-wrapped-{func.__name__}")
-                    task = asyncio.create_task(func(*w_args, **w_kwargs), name=name)
-                return await task
-            else:
-                # This will leak context changes
-                set_logging_context(**kwargs)
-                return await func(*w_args, **w_kwargs)
+        name = action if action is not None else f"log-wrapped-{func.__name__}"
+
+        if fast:
+            @wraps(func)
+            async def wrapped(*w_args, **w_kwargs):
+                ctoken = log_context.set(context) if context is not None else None
+                stoken = None
+                if action is not None or stack is not None:
+                    stoken = log_action_stack.set(_push_action_stack(log_action_stack.get(), action, stack))
+                try:
+                    return await func(*w_args, **w_kwargs)
+                finally:
+                    _reset_tokens((log_context, ctoken), (log_action_stack, stoken))
+        else:
+            @wraps(func)
+            async def wrapped(*w_args, **w_kwargs):
+                if isolate:
+                    with logging_context(**kwargs):
+                        # Task creation will synchronously copy the context
+                        # This is gc safe
+                        task = asyncio.create_task(func(*w_args, **w_kwargs), name=name)
+                    return await task
+                else:
+                    # This will leak context changes
+                    set_logging_context(**kwargs)
+                    return await func(*w_args, **w_kwargs)
         return wrapped
     return decorator
 
@@ -208,6 +244,34 @@ class ThreadFilter(logging.Filter):
         return 1 if record.threadName == self.thread else 0
 
 
+class LazyRepr:
+    """
+    Deferred `repr` of a logging context object, formatted on first use.
+
+    Most records are never rendered with their context (e.g. DEBUG records only written to stdout),
+    so this avoids formatting it for every record.
+    Pickles as the formatted string, so that records may still be sent to other processes.
+    """
+    __slots__ = ('obj', '_value')
+
+    def __init__(self, obj):
+        self.obj = obj
+        self._value = None
+
+    def __str__(self):
+        if self._value is None:
+            self._value = repr(self.obj)
+        return self._value
+
+    def __reduce__(self):
+        return (str, (str(self),))
+
+
+@lru_cache(maxsize=1024)
+def _format_action_stack(action_stack: tuple[str, ...]) -> str:
+    return ' ➔ '.join(action_stack)
+
+
 class ContextInjection(logging.Filter):
     def filter(self, record):
         # These guards are to allow override through _extra
@@ -220,7 +284,8 @@ class ContextInjection(logging.Filter):
             if hasattr(record, 'action'):
                 action_stack = (*action_stack, record.action)
             if action_stack:
-                record.actionstr = ' ➔ '.join(action_stack)
+                # Action stacks are immutable tuples, so we can memoise their formatting
+                record.actionstr = _format_action_stack(tuple(action_stack))
             else:
                 record.actionstr = "Unknown Action"
 
@@ -229,12 +294,12 @@ class ContextInjection(logging.Filter):
 
         if not hasattr(record, 'ctx'):
             if ctx := context.get():
-                record.ctx = repr(ctx)
+                record.ctx = LazyRepr(ctx)
             else:
                 record.ctx = None
 
         if getattr(record, 'with_ctx', False) and record.ctx:
-            record.ctxstr = '\n' + record.ctx
+            record.ctxstr = '\n' + str(record.ctx)
         else:
             record.ctxstr = ""
         return True
@@ -266,25 +331,97 @@ class LocalQueueHandler(QueueHandler):
             self.handleError(record)
 
 
-class WebHookHandler(logging.StreamHandler):
-    def __init__(self, webhook_url, prefix="", batch=True, loop=None):
+class _LiveLogEntry:
+    __slots__ = ('levelno', 'header', 'body', 'count', 'first_at', 'last_at')
+
+    def __init__(self, levelno, header, body, asctime):
+        self.levelno = levelno
+        self.header = header
+        self.body = body
+        self.count = 1
+        self.first_at = asctime
+        self.last_at = asctime
+
+    def render(self) -> str:
+        if self.count > 1:
+            timestr = f"[{self.first_at} -> {self.last_at}][x{self.count}]"
+        else:
+            timestr = f"[{self.first_at}]"
+        return f"{timestr}{self.header}\n{self.body}"
+
+
+class WebHookHandler(logging.Handler):
+    """
+    Live logging handler posting records to a Discord webhook.
+
+    Records are emitted from the logging listener thread,
+    and handed over to the handler's event loop (see `setup_main_logger`) for delivery.
+    Pending records are held in a ring buffer of at most `maxsize` distinct messages,
+    with identical messages (same level, origin, and text) coalesced into a single entry with a repeat count.
+    When the buffer is full the oldest entries are dropped.
+
+    The buffer is flushed as a single webhook message every `batch_delay` seconds,
+    or `urgent_delay` seconds after an error or critical record arrives.
+    Batches too long for a message are sent as a file attachment.
+    Delivery is ratelimited by `bucket`; while we are ratelimited records accumulate in the buffer.
+
+    The `dropped` and `ignored` (failed delivery) counters are exposed through `stats()`.
+    """
+    def __init__(self, webhook_url, prefix="", batch=True, loop=None, maxsize=500):
         super().__init__()
         self.webhook_url = webhook_url
         self.prefix = prefix
-        self.batched = ""
         self.batch = batch
         self.loop = loop
-        self.batch_delay = 10
-        self.batch_task = None
-        self.last_batched = None
-        self.waiting = []
+        self.maxsize = maxsize
+
+        self.batch_delay = 10 if batch else 1
+        self.urgent_delay = 1
+
+        # Coalescing key -> entry, in arrival order
+        self.pending: OrderedDict[tuple, _LiveLogEntry] = OrderedDict()
+        self.pending_records = 0
+        self.flush_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
 
         self.bucket = Bucket(20, 40)
+
+        # Metrics
+        self.received = 0
+        self.coalesced = 0
+        self.sent = 0
+        self.batches = 0
+        self.dropped = 0
         self.ignored = 0
+        self._unreported_drops = 0
 
         self.session = None
         self.webhook = None
 
+    def __repr__(self):
+        return (
+            "<WebHookHandler "
+            f"level={logging.getLevelName(self.level)} "
+            f"pending={self.pending_records} "
+            f"sent={self.sent} "
+            f"batches={self.batches} "
+            f"coalesced={self.coalesced} "
+            f"dropped={self.dropped} "
+            f"ignored={self.ignored}"
+            ">"
+        )
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'pending': self.pending_records,
+            'received': self.received,
+            'coalesced': self.coalesced,
+            'sent': self.sent,
+            'batches': self.batches,
+            'dropped': self.dropped,
+            'ignored': self.ignored,
+        }
+
     def get_loop(self):
         if self.loop is None:
             self.loop = asyncio.new_event_loop()
@@ -292,121 +429,123 @@ class WebHookHandler(logging.StreamHandler):
         return self.loop
 
     def emit(self, record):
-        self.format(record)
-        self.get_loop().call_soon_threadsafe(self._post, record)
+        if getattr(record, 'context', None) == 'Webhook Logger':
+            # Don't livelog livelog errors
+            # Otherwise we recurse and Cloudflare hates us
+            return
+        try:
+            asctime = getattr(record, 'asctime', None) or utc_now().strftime("%Y-%m-%d %H:%M:%S")
+            header = (
+                f"[{record.levelname}][{getattr(record, 'app', log_app.get())}]"
+                f"[{getattr(record, 'actionstr', '')}] <{getattr(record, 'context', '')}>"
+            )
+            ctx = getattr(record, 'ctx', None)
+            body = f"{record.msg}\n# Context: {ctx}" if ctx else str(record.msg)
+            # Only build the entry here, the buffer is owned by the handler loop
+            self.get_loop().call_soon_threadsafe(self._push, record.levelno, header, body, asctime)
+        except Exception:
+            self.handleError(record)
 
-    def _post(self, record):
-        if self.session is None:
-            self.setup()
-        asyncio.create_task(self.post(record))
+    def _push(self, levelno, header, body, asctime):
+        self.received += 1
+        key = (levelno, header, body)
+        if (entry := self.pending.get(key, None)) is not None:
+            entry.count += 1
+            entry.last_at = asctime
+            self.coalesced += 1
+        else:
+            if len(self.pending) >= self.maxsize:
+                _, oldest = self.pending.popitem(last=False)
+                self.pending_records -= oldest.count
+                self.dropped += oldest.count
+                self._unreported_drops += oldest.count
+            self.pending[key] = _LiveLogEntry(levelno, header, body, asctime)
+        self.pending_records += 1
+
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        if levelno >= logging.ERROR:
+            self._wakeup.set()
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = asyncio.create_task(self._run())
 
     def setup(self):
         self.session = aiohttp.ClientSession()
         self.webhook = Webhook.from_url(self.webhook_url, session=self.session)
 
-    async def post(self, record):
-        if record.context == 'Webhook Logger':
-            # Don't livelog livelog errors
-            # Otherwise we recurse and Cloudflare hates us
-            return
+    async def _run(self):
         log_context.set("Webhook Logger")
         log_action_stack.set(("Logging",))
-        log_app.set(record.app)
-
         try:
-            timestamp = utc_now().strftime("%d/%m/%Y, %H:%M:%S")
-            header = f"[{record.asctime}][{record.levelname}][{record.app}][{record.actionstr}] <{record.context}>"
-            context = f"\n# Context: {record.ctx}" if record.ctx else ""
-            message = f"{header}\n{record.msg}{context}"
-
-            if len(message) > 1900:
-                as_file = True
-            else:
-                as_file = False
-                message = "```md\n{}\n```".format(message)
-
-            # Post the log message(s)
-            if self.batch:
-                if len(message) > 1500:
-                    await self._send_batched_now()
-                    await self._send(message, as_file=as_file)
+            while self.pending:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=self.batch_delay)
+                except asyncio.TimeoutError:
+                    pass
                 else:
-                    self.batched += message
-                    if len(self.batched) + len(message) > 1500:
-                        await self._send_batched_now()
-                    else:
-                        asyncio.create_task(self._schedule_batched())
-            else:
-                await self._send(message, as_file=as_file)
+                    # Woken by an urgent record, collect the rest of the burst
+                    await asyncio.sleep(self.urgent_delay)
+                self._wakeup.clear()
+                await self.bucket.wait()
+                await self._flush()
+        except asyncio.CancelledError:
+            pass
         except Exception as ex:
-            print(f"Unexpected error occurred while logging to webhook: {repr(ex)}", file=sys.stderr)
+            print(f"Unexpected error occurred while flushing webhook logs: {repr(ex)}", file=sys.stderr)
 
-    async def _schedule_batched(self):
-        if self.batch_task is not None and not (self.batch_task.done() or self.batch_task.cancelled()):
-            # noop, don't reschedule if it is already scheduled
+    async def _flush(self):
+        if not self.pending:
             return
-        try:
-            self.batch_task = asyncio.create_task(asyncio.sleep(self.batch_delay))
-            await self.batch_task
-            await self._send_batched()
-        except asyncio.CancelledError:
-            return
-        except Exception as ex:
-            print(f"Unexpected error occurred while scheduling batched webhook log: {repr(ex)}", file=sys.stderr)
+        if self.session is None:
+            self.setup()
 
-    async def _send_batched_now(self):
-        if self.batch_task is not None and not self.batch_task.done():
-            self.batch_task.cancel()
-        self.last_batched = None
-        await self._send_batched()
+        entries = list(self.pending.values())
+        count = self.pending_records
+        self.pending.clear()
+        self.pending_records = 0
 
-    async def _send_batched(self):
-        if self.batched:
-            batched = self.batched
-            self.batched = ""
-            await self._send(batched)
+        lines = [entry.render() for entry in entries]
+        if self._unreported_drops:
+            lines.insert(0, f"# Dropped {self._unreported_drops} records, live logger could not keep up.")
+            self._unreported_drops = 0
+        message = '\n'.join(lines)
 
-    async def _send(self, message, as_file=False):
         try:
             self.bucket.request()
-        except BucketOverFull:
-            # Silently ignore
-            self.ignored += 1
-            return
-        except BucketFull:
-            logger.warning(
-                "Can't keep up! "
-                f"Ignoring records on live-logger {self.webhook.id}."
-            )
-            self.ignored += 1
-            return
-        else:
-            if self.ignored > 0:
-                logger.warning(
-                    "Can't keep up! "
-                    f"{self.ignored} live logging records on webhook {self.webhook.id} skipped, continuing."
-                )
-                self.ignored = 0
-
-        try:
-            if as_file or len(message) > 1900:
+            if len(message) > 1900:
+                worst = max(entries, key=lambda entry: entry.levelno)
+                summary = f"{count} records ({len(entries)} distinct), first of highest level:\n`{worst.header}`"
                 with StringIO(message) as fp:
                     fp.seek(0)
                     await self.webhook.send(
-                        f"{self.prefix}\n`{message.splitlines()[0]}`",
+                        f"{self.prefix}\n{summary}",
                         file=File(fp, filename="logs.md"),
                         username=log_app.get()
                     )
             else:
-                await self.webhook.send(self.prefix + '\n' + message, username=log_app.get())
+                await self.webhook.send(
+                    self.prefix + '\n' + "```md\n{}\n```".format(message),
+                    username=log_app.get()
+                )
+        except BucketFull:
+            # Should not happen after waiting on the bucket, but never block the logger on it
+            self.ignored += count
+            logger.warning(
+                "Can't keep up! "
+                f"Ignoring {count} records on live-logger {self.webhook.id}."
+            )
         except discord.HTTPException:
+            self.ignored += count
             logger.exception(
-                "Live logger errored. Slowing down live logger."
+                f"Live logger errored, ignoring {count} records. Slowing down live logger."
             )
             self.bucket.fill()
+        else:
+            self.sent += count
+            self.batches += 1
 
 
-handlers = []
+handlers: list[WebHookHandler] = []
 if webhook := conf.logging['general_log']:
     handler = WebHookHandler(webhook, batch=True)
     handlers.append(handler)
@@ -428,8 +567,17 @@ if webhook := conf.logging['critical_log']:
     handlers.append(handler)
 
 
+class ContextQueueHandler(QueueHandler):
+    def prepare(self, record):
+        record = super().prepare(record)
+        # Format the context now, before it is read from the listener thread
+        if isinstance(getattr(record, 'ctx', None), LazyRepr):
+            record.ctx = str(record.ctx)
+        return record
+
+
 def make_queue_handler(queue):
-    qhandler = QueueHandler(queue)
+    qhandler = ContextQueueHandler(queue)
     qhandler.setLevel(logging.INFO)
     qhandler.addFilter(ContextInjection())
     return qhandler
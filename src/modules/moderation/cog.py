@@ -121,13 +121,37 @@ class ModerationCog(LionCog):
                 except discord.HTTPException:
                     pass
 
-    async def get_ticket_webhook(self, guild: discord.Guild):
+    async def get_ticket_webhook(self, guild: discord.Guild) -> Optional[discord.Webhook]:
         """
         Get the ticket log webhook data, if it exists.
 
         If it does not exist, but the ticket channel is set, tries to create it.
         """
-        ...
+        ticket_log = (await self.settings.TicketLog.get(guild.id)).value
+        if not ticket_log:
+            return None
+        webhooks = self.bot.core.webhooks
+        hook = await webhooks.get_webhook(ticket_log.id)
+        if hook is None:
+            t = self.bot.translator.t
+            try:
+                hook = await webhooks.create_webhook(
+                    ticket_log,
+                    name=t(_p(
+                        'ticketlog|webhook|name',
+                        "{bot_name} Moderation"
+                    )).format(bot_name=guild.me.name),
+                    reason=t(_p(
+                        'ticketlog|webhook|audit_reason',
+                        "Creating ticket log webhook"
+                    )),
+                )
+            except discord.HTTPException:
+                logger.warning(
+                    f"Unexpected exception while creating ticket log webhook for <gid: {guild.id}>",
+                    exc_info=True
+                )
+        return hook
 
     # ----- Commands -----
     # modnote command
@@ -12,7 +12,7 @@ from meta.logger import log_wrap
 from meta.sharding import THIS_SHARD
 from meta.monitor import ComponentMonitor, ComponentStatus, StatusLevel
 from utils.lib import utc_now
-from utils.ratelimits import limit_concurrency
+from utils.ratelimits import Bucket, limit_concurrency
 from meta.sockets import Channel, register_channel
 
 from wards import low_management_ward
@@ -23,6 +23,7 @@ from .lib import TimerRole
 from .settings import TimerSettings
 from .settingui import TimerConfigUI
 from .timer import Timer
+from .scheduler import TimerScheduler
 from .options import TimerOptions
 from .ui.config import TimerOptionsUI
 
@@ -86,6 +87,10 @@ class TimerCog(LionCog):
         self.ready = False
         self.timers: dict[int, dict[int, Timer]] = defaultdict(dict)
 
+        # Central scheduler for timer stage changes and updates
+        # Discord edits from scheduled updates share a ratelimit of 10 timers per second
+        self.scheduler = TimerScheduler(edit_bucket=Bucket(20, 2))
+
     async def _monitor(self):
         timers = [timer for tguild in self.timers.values() for timer in tguild.values()]
         state = (
@@ -94,8 +99,8 @@ class TimerCog(LionCog):
             " guilds={guilds}"
             " members={members}"
             " running={running}"
-            " launched={launched}"
-            " looping={looping}"
+            " scheduled={scheduled}"
+            " ticks={ticks}"
             " locked={locked}"
             " voice_locked={voice_locked}"
             ">"
@@ -105,14 +110,17 @@ class TimerCog(LionCog):
             guilds=len(set(timer.data.guildid for timer in timers)),
             members=sum(len(timer.members) for timer in timers),
             running=sum(1 for timer in timers if timer.running),
-            launched=sum(1 for timer in timers if timer._run_task and not timer._run_task.done()),
-            looping=sum(1 for timer in timers if timer._loop_task and not timer._loop_task.done()),
+            scheduled=len(self.scheduler._timers),
+            ticks=len(self.scheduler._ticks),
             locked=sum(1 for timer in timers if timer._lock.locked()),
             voice_locked=sum(1 for timer in timers if timer.voice_lock.locked()),
         )
         if not self.ready:
             level = StatusLevel.STARTING
             info = f"(STARTING) Not ready. {state}"
+        elif not self.scheduler._monitor_task or self.scheduler._monitor_task.done():
+            level = StatusLevel.ERRORED
+            info = f"(ERRORED) Stage scheduler not running. {state}"
         else:
             level = StatusLevel.OKAY
             info = f"(OK) Ready. {state}"
@@ -134,8 +142,8 @@ class TimerCog(LionCog):
         """
         Detach TimerCog and unload components.
 
-        Clears caches and stops run-tasks for each active timer.
-        Does not exist until all timers have completed background tasks.
+        Clears caches, unloads each active timer, and stops the stage scheduler.
+        Does not exit until all scheduled updates in progress have completed.
         """
         timers = [timer for tguild in self.timers.values() for timer in tguild.values()]
         self.timers.clear()
@@ -143,6 +151,10 @@ class TimerCog(LionCog):
         if timers:
             await self._unload_timers(timers)
 
+        if self.scheduler._monitor_task and not self.scheduler._monitor_task.done():
+            self.scheduler._monitor_task.cancel()
+            await self.scheduler._monitor_task
+
     async def cog_check(self, ctx: LionContext):
         if not self.ready:
             raise CheckFailure(
@@ -286,6 +298,13 @@ class TimerCog(LionCog):
             await self._unload_timers(timers)
             self.timers.clear()
 
+        # Restart the stage scheduler
+        if self.scheduler._monitor_task and not self.scheduler._monitor_task.done():
+            self.scheduler._monitor_task.cancel()
+            await self.scheduler._monitor_task
+        self.scheduler = TimerScheduler(edit_bucket=Bucket(20, 2))
+        self.scheduler.start()
+
         # Fetch timers in guilds on this shard
         guildids = [guild.id for guild in self.bot.guilds]
         timer_data = await self.data.Timer.fetch_where(guildid=guildids)
@@ -314,13 +333,13 @@ class TimerCog(LionCog):
 
             tasks = []
             if leaving is not None:
-                tasks.append(asyncio.create_task(leaving.update_status_card()))
+                leaving.update_status_card_soon()
             if joining is not None:
                 joining.last_seen[member.id] = utc_now()
                 if not joining.running and joining.auto_restart:
                     tasks.append(asyncio.create_task(joining.start()))
                 else:
-                    tasks.append(asyncio.create_task(joining.update_status_card()))
+                    joining.update_status_card_soon()
 
             if tasks:
                 try:
@@ -388,8 +407,7 @@ class TimerCog(LionCog):
         tasks = []
         for timer in timers:
             current_channel = timer.notification_channel
-            current_hook = timer._hook
-            if current_channel and (not current_hook or current_hook.channelid != current_channel.id):
+            if current_channel and timer._hook_channelid != current_channel.id:
                 tasks.append(asyncio.create_task(timer.send_status()))
 
         if tasks:
@@ -1,4 +1,8 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
+from collections import namedtuple
+
+from cachetools import LRUCache
+from frozendict import frozendict
 
 from meta import LionBot
 from utils.lib import utc_now
@@ -10,15 +14,35 @@ if TYPE_CHECKING:
     from tracking.voice.cog import VoiceTrackerCog
 
 
-async def get_timer_card(bot: LionBot, timer: 'Timer', stage: 'Stage'):
-    voicecog: 'VoiceTrackerCog' = bot.get_cog('VoiceTrackerCog')
+# Static card arguments shared by all timers with the same skin, pattern, stage type and locale
+TimerCardTemplate = namedtuple('TimerCardTemplate', ('card_cls', 'skin', 'duration', 'locale'))
 
-    name = timer.base_name
-    if stage is not None:
-        duration = stage.duration
-        remaining = (stage.end - utc_now()).total_seconds()
+# Cache of template -> (dynamic card key -> rendered card data)
+_template_renders: LRUCache[TimerCardTemplate, LRUCache[tuple, bytes]] = LRUCache(maxsize=500)
+
+
+async def get_timer_template(bot: LionBot, timer: 'Timer', stage: 'Stage') -> TimerCardTemplate:
+    """
+    Build the static template for the timer card of the given stage.
+    """
+    if stage is None or stage.focused:
+        card_cls = FocusTimerCard
+        duration = stage.duration if stage is not None else timer.data.focus_length
     else:
-        remaining = duration = timer.data.focus_length
+        card_cls = BreakTimerCard
+        duration = stage.duration
+
+    skin = await bot.get_cog('CustomSkinCog').get_skinargs_for(
+        timer.data.guildid, None, card_cls.card_id
+    )
+    return TimerCardTemplate(card_cls, frozendict(skin), duration, timer.locale.value)
+
+
+def get_timer_users(bot: LionBot, timer: 'Timer') -> list[tuple]:
+    """
+    Build the dynamic card user list for the current timer members.
+    """
+    voicecog: 'VoiceTrackerCog' = bot.get_cog('VoiceTrackerCog')
 
     card_users = []
     guildid = timer.data.guildid
@@ -40,19 +64,58 @@ async def get_timer_card(bot: LionBot, timer: 'Timer', stage: 'Stage'):
             tag,
         )
         card_users.append(card_user)
+    return card_users
 
-    if stage is None or stage.focused:
-        card_cls = FocusTimerCard
+
+async def get_timer_card(bot: LionBot, timer: 'Timer', stage: 'Stage'):
+    template = await get_timer_template(bot, timer, stage)
+
+    if stage is not None:
+        remaining = (stage.end - utc_now()).total_seconds()
     else:
-        card_cls = BreakTimerCard
+        remaining = template.duration
 
-    skin = await bot.get_cog('CustomSkinCog').get_skinargs_for(
-        timer.data.guildid, None, card_cls.card_id
+    return template.card_cls(
+        timer.base_name,
+        remaining,
+        template.duration,
+        users=get_timer_users(bot, timer),
+    )
+
+
+async def render_timer_card(bot: LionBot, timer: 'Timer', stage: 'Stage') -> bytes:
+    """
+    Render the timer card for the given stage, reusing a previous render where possible.
+
+    Renders are cached against the static card template,
+    keyed by the dynamic card parts at minute resolution.
+    So repeated status updates in the same minute (e.g. from a burst of voice events)
+    only render the card once.
+    """
+    template = await get_timer_template(bot, timer, stage)
+    card_users = get_timer_users(bot, timer)
+
+    if stage is not None:
+        remaining = (stage.end - utc_now()).total_seconds()
+    else:
+        remaining = template.duration
+
+    key = (
+        timer.base_name,
+        int(remaining // 60),
+        tuple((user, int(duration // 60), tag) for user, duration, tag in card_users),
     )
+    renders: Optional[LRUCache] = _template_renders.get(template, None)
+    if renders is None:
+        renders = _template_renders[template] = LRUCache(maxsize=50)
+    elif (data := renders.get(key, None)) is not None:
+        return data
 
-    return card_cls(
-        name,
+    card = template.card_cls(
+        timer.base_name,
         remaining,
-        duration,
+        template.duration,
         users=card_users,
     )
+    data = renders[key] = await card.render()
+    return data
@@ -0,0 +1,124 @@
+from typing import Optional, TYPE_CHECKING
+from collections import defaultdict
+import asyncio
+
+from utils.monitor import TaskMonitor
+from utils.ratelimits import Bucket
+
+from . import logger
+
+if TYPE_CHECKING:
+    from .timer import Timer
+
+
+class TimerScheduler(TaskMonitor[int]):
+    """
+    Central scheduler for the stage changes and regular updates of running Timers.
+
+    Rather than each Timer running its own update loop,
+    running Timers register their next tick timestamp with the scheduler.
+    Monitor tasks are keyed by the (integral) tick timestamp,
+    so that all Timers sharing a tick are handled in a single wakeup.
+    Regular updates are aligned to minute boundaries (see `Timer.next_tick`) to maximise this coalescing.
+
+    Discord requests made from scheduled ticks are ratelimited through a single shared `Bucket`,
+    with stage changes served before regular updates.
+    """
+    def __init__(self, edit_bucket: Optional[Bucket] = None):
+        super().__init__()
+        # Shared ratelimit bucket for Discord edits across all timers
+        self.edit_bucket = edit_bucket or Bucket(20, 2)
+
+        self._timers: dict[int, 'Timer'] = {}  # channelid -> Timer
+        self._ticks: dict[int, set[int]] = defaultdict(set)  # tick timestamp -> channelids
+        self._timer_ticks: dict[int, int] = {}  # channelid -> tick timestamp
+
+    def __repr__(self):
+        return (
+            "<"
+                f"{self.__class__.__name__}"
+                f" timers={len(self._timers)}"
+                f" ticks={len(self._ticks)}"
+                f" running={len(self._running)}"
+                f" edit_bucket={self.edit_bucket}"
+                f" task={self._monitor_task}"
+                f">"
+        )
+
+    def schedule_timer(self, timer: 'Timer') -> None:
+        """
+        Schedule the next tick of the given Timer, replacing any existing scheduled tick.
+
+        If the Timer is not running, instead removes it from the schedule.
+        """
+        channelid = timer.data.channelid
+        tick = timer.next_tick()
+        if tick is None:
+            self.unschedule_timer(channelid)
+            return
+
+        current = self._timer_ticks.get(channelid, None)
+        if current is not None and current != tick:
+            self._drop_from_tick(channelid, current)
+
+        self._timers[channelid] = timer
+        self._timer_ticks[channelid] = tick
+        tick_timers = self._ticks[tick]
+        if not tick_timers:
+            self.schedule_task(tick, tick)
+        tick_timers.add(channelid)
+
+    def unschedule_timer(self, channelid: int) -> None:
+        """
+        Remove any scheduled tick for the timer in the given channel.
+        """
+        self._timers.pop(channelid, None)
+        tick = self._timer_ticks.pop(channelid, None)
+        if tick is not None:
+            self._drop_from_tick(channelid, tick)
+
+    def _drop_from_tick(self, channelid: int, tick: int):
+        tick_timers = self._ticks.get(tick, None)
+        if tick_timers is not None:
+            tick_timers.discard(channelid)
+            if not tick_timers:
+                self._ticks.pop(tick, None)
+                self.cancel_tasks(tick)
+
+    async def run_task(self, tick: int):
+        """
+        Run all the Timers scheduled for this tick.
+
+        Timers are started in order of priority as the shared edit bucket allows,
+        with stage changes taking precedence over regular updates.
+        """
+        channelids = self._ticks.pop(tick, set())
+        due = []
+        for channelid in channelids:
+            self._timer_ticks.pop(channelid, None)
+            if (timer := self._timers.pop(channelid, None)) is not None:
+                due.append(timer)
+        due.sort(key=lambda timer: not timer.stage_ended)
+
+        tasks = []
+        for timer in due:
+            await self.edit_bucket.wait()
+            self.edit_bucket.request()
+            tasks.append(asyncio.create_task(self._tick_timer(timer), name='timer-tick'))
+
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def _tick_timer(self, timer: 'Timer'):
+        if timer.data.channelid in self._timer_ticks:
+            # Timer was rescheduled (e.g. restarted) while waiting for the bucket
+            return
+        if not timer.running:
+            # Timer was stopped while waiting for the bucket
+            return
+        try:
+            await timer.tick()
+        except Exception:
+            logger.exception(
+                f"Unhandled exception while running scheduled tick for timer {timer!r}"
+            )
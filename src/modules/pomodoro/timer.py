@@ -1,5 +1,6 @@
 from typing import Optional, TYPE_CHECKING
 import math
+import io
 from collections import namedtuple
 import asyncio
 from datetime import timedelta, datetime
@@ -10,14 +11,13 @@ from meta import LionBot
 from meta.logger import log_wrap, log_context, set_logging_context
 from utils.lib import MessageArgs, utc_now, replace_multiple
 from core.lion_guild import LionGuild
-from core.data import CoreData
 from babel.translator import ctx_locale
 from gui.errors import RenderingException
 
 from . import babel, logger
 from .data import TimerData
 from .ui import TimerStatusUI
-from .graphics import get_timer_card
+from .graphics import render_timer_card
 from .lib import TimerRole, channel_name_keys, focus_alert_path, break_alert_path
 from .options import TimerConfig, TimerOptions
 
@@ -38,14 +38,12 @@ class Timer:
         'last_seen',
         'status_view',
         'last_status_message',
-        '_hook',
+        '_hook_channelid',
         '_state',
         '_lock',
         '_last_voice_update',
         '_voice_update_task',
         '_voice_update_lock',
-        '_run_task',
-        '_loop_task',
         'destroyed',
     )
 
@@ -64,7 +62,7 @@ class Timer:
         self.last_seen: dict[int, datetime] = {}  # memberid -> last seen timestamp
         self.status_view: Optional[TimerStatusUI] = None  # Current TimerStatusUI
         self.last_status_message: Optional[discord.Message] = None  # Last deliever notification message
-        self._hook: Optional[CoreData.LionHook] = None  # Cached notification webhook
+        self._hook_channelid: Optional[int] = None  # Channel of the last notification webhook used
 
         self._state: Optional[Stage] = None  # The currently active Stage
         self._lock = asyncio.Lock()  # Stage change and CRUD lock
@@ -76,11 +74,6 @@ class Timer:
         # Lock to prevent channel name update race
         self._voice_update_lock = asyncio.Lock()
 
-        # Wait task for the update loop. May be safely cancelled to pause updates.
-        self._run_task = None
-        # Main loop task. Should not be cancelled.
-        self._loop_task = None
-
         self.destroyed = False
 
     def __repr__(self):
@@ -143,49 +136,40 @@ class Timer:
     async def get_notification_webhook(self) -> Optional[discord.Webhook]:
         channel = self.notification_channel
         if channel:
-            cid = channel.id
-            if self._hook and self._hook.channelid == cid:
-                hook = self._hook
-            else:
-                hook = self._hook = await self.bot.core.data.LionHook.fetch(cid)
-                if not hook:
-                    # Attempt to create and save webhook
-                    # TODO: Localise
-                    t = self.bot.translator.t
-                    ctx_locale.set(self.locale.value)
-                    try:
-                        if channel.permissions_for(channel.guild.me).manage_webhooks:
-                            avatar = self.bot.user.avatar
-                            avatar_data = (await avatar.to_file()).fp.read() if avatar else None
-                            webhook = await channel.create_webhook(
-                                avatar=avatar_data,
-                                name=t(_p(
-                                    'timer|webhook|name',
-                                    "{bot_name} Pomodoro"
-                                )).format(bot_name=self.bot.user.name),
-                                reason=t(_p(
-                                    'timer|webhook|audit_reason',
-                                    "Pomodoro Notifications"
-                                ))
-                            )
-                            hook = await self.bot.core.data.LionHook.create(
-                                channelid=channel.id,
-                                token=webhook.token,
-                                webhookid=webhook.id
-                            )
-                        elif channel.permissions_for(channel.guild.me).send_messages:
-                            await channel.send(t(_p(
-                                'timer|webhook|error:insufficient_permissions',
-                                "I require the `MANAGE_WEBHOOKS` permission to send pomodoro notifications here!"
-                            )))
-                    except discord.HTTPException:
-                        logger.warning(
-                            "Unexpected Exception caught while creating timer notification webhook "
-                            f"for timer: {self!r}",
-                            exc_info=True
+            webhooks = self.bot.core.webhooks
+            hook = await webhooks.get_webhook(channel.id)
+            if not hook:
+                # Attempt to create and save webhook
+                # TODO: Localise
+                t = self.bot.translator.t
+                ctx_locale.set(self.locale.value)
+                try:
+                    if channel.permissions_for(channel.guild.me).manage_webhooks:
+                        hook = await webhooks.create_webhook(
+                            channel,
+                            name=t(_p(
+                                'timer|webhook|name',
+                                "{bot_name} Pomodoro"
+                            )).format(bot_name=self.bot.user.name),
+                            reason=t(_p(
+                                'timer|webhook|audit_reason',
+                                "Pomodoro Notifications"
+                            ))
                         )
+                    elif channel.permissions_for(channel.guild.me).send_messages:
+                        await channel.send(t(_p(
+                            'timer|webhook|error:insufficient_permissions',
+                            "I require the `MANAGE_WEBHOOKS` permission to send pomodoro notifications here!"
+                        )))
+                except discord.HTTPException:
+                    logger.warning(
+                        "Unexpected Exception caught while creating timer notification webhook "
+                        f"for timer: {self!r}",
+                        exc_info=True
+                    )
             if hook:
-                return hook.as_webhook(client=self.bot)
+                self._hook_channelid = channel.id
+            return hook
 
     @property
     def members(self) -> list[discord.Member]:
@@ -612,13 +596,8 @@ class Timer:
 
         if render:
             try:
-                card = await get_timer_card(self.bot, self, stage)
-                data = await card.render()
-                import io
-                with io.BytesIO(data) as buffer:
-                    with open(f"pomodoro_{self.data.channelid}.png", "wb") as f:
-                        f.write(buffer.getbuffer())
-                rawargs['file'] = card.as_file(f"pomodoro_{self.data.channelid}.png")
+                data = await render_timer_card(self.bot, self, stage)
+                rawargs['file'] = discord.File(io.BytesIO(data), f"pomodoro_{self.data.channelid}.png")
             except RenderingException:
                 pass
         args = MessageArgs(**rawargs)
@@ -664,12 +643,15 @@ class Timer:
             last_message_id = message.id
             self.last_status_message = message
         except discord.NotFound:
-            if self._hook is not None:
-                await self._hook.delete()
-                self._hook = None
-                # To avoid killing the client on an infinite loop (which should be impossible)
-                await asyncio.sleep(1)
-                await self.send_status(delete_last, **kwargs)
+            if self._hook_channelid is not None:
+                if await self.bot.core.webhooks.invalidate(self._hook_channelid, notify_hook.id):
+                    self._hook_channelid = None
+                    # To avoid killing the client on an infinite loop (which should be impossible)
+                    await asyncio.sleep(1)
+                    await self.send_status(delete_last, **kwargs)
+                    if old_status is not None:
+                        old_status.stop()
+                    return
         except discord.HTTPException:
             pass
 
@@ -680,6 +662,27 @@ class Timer:
         if old_status is not None:
             old_status.stop()
 
+    @property
+    def refresh_key(self):
+        """
+        Key identifying the timer status card with the shared message refresher.
+        """
+        return ('timer_status', self.data.channelid)
+
+    def update_status_card_soon(self, **kwargs):
+        """
+        Request a status card update through the shared message refresher.
+
+        Used for event driven updates (e.g. members joining or leaving),
+        so that a burst of events results in a single edit.
+        """
+        channel = self.notification_channel
+        self.bot.core.refresher.schedule(
+            self.refresh_key,
+            channel.id if channel else 0,
+            lambda: self.update_status_card(**kwargs),
+        )
+
     @log_wrap(action='Update Timer Status')
     async def update_status_card(self, **kwargs):
         """
@@ -692,22 +695,23 @@ class Timer:
             )
 
             last_message = self.last_status_message
+            repost = last_message is None
             if last_message is None and self.data.last_messageid is not None:
-                # Attempt to retrieve previous message
+                # Edit the previous message through the webhook, without fetching it first
                 notify_hook = await self.get_notification_webhook()
                 try:
                     if notify_hook:
-                        last_message = await notify_hook.fetch_message(self.data.last_messageid)
+                        self.last_status_message = await self.bot.core.webhooks.edit_message(
+                            notify_hook, self.data.last_messageid, **args.edit_args
+                        )
+                        repost = False
                 except discord.HTTPException:
-                    last_message = None
                     self.last_status_message = None
                 except Exception:
                     logger.exception(
                         f"Unhandled exception while updating timer last status for timer {self!r}"
                     )
-
-            repost = last_message is None
-            if not repost:
+            elif not repost:
                 try:
                     await last_message.edit(**args.edit_args)
                     self.last_status_message = last_message
@@ -779,8 +783,7 @@ class Timer:
         """
         try:
             async with self._lock:
-                if self._run_task and not self._run_task.done():
-                    self._run_task.cancel()
+                self._unschedule()
                 await self.data.update(last_started=None, auto_restart=auto_restart)
             await self.update_status_card()
         except Exception:
@@ -794,8 +797,8 @@ class Timer:
         Deconstructs the timer, stopping all tasks.
         """
         async with self._lock:
-            if self._run_task and not self._run_task.done():
-                self._run_task.cancel()
+            self._unschedule()
+            self.bot.core.refresher.cancel(self.refresh_key)
             channelid = self.data.channelid
             if self.channel:
                 task = asyncio.create_task(
@@ -812,108 +815,93 @@ class Timer:
                 f"Timer <tid: {channelid}> deleted. Reason given: {reason!r}"
             )
 
-    @log_wrap(isolate=True, stack=())
-    async def _runloop(self):
+    @property
+    def stage_ended(self) -> bool:
         """
-        Main loop which controls the
-        regular stage changes and status updates.
+        Whether the currently tracked stage has ended, and the timer is due for a stage change.
         """
-        set_logging_context(
-            action=f"TimerLoop {self.data.channelid}",
-            context=f"tid: {self.data.channelid}",
-        )
-        # Allow updating with 10 seconds of drift to the next stage change
-        drift = 10
+        return self._state is None or self._state.end < utc_now()
 
-        if not self.running:
-            # Nothing to do
-            return
-        if not self.channel:
-            # Underlying Discord objects do not exist, destroy the timer.
-            await self.destroy(reason="Underlying channel no longer exists.")
-            return
+    def next_tick(self, drift: int = 10) -> Optional[int]:
+        """
+        Timestamp of the next scheduled update for this timer, or None if the timer is not running.
 
-        background_tasks = set()
+        Regular updates happen on minute boundaries, so that they are shared between timers,
+        unless the stage changes within `drift` seconds of the update.
+        Stage changes are scheduled one second after the stage ends,
+        so the stage has always changed when the tick fires.
+        """
+        if not self.running or self._state is None:
+            return None
+        stage_end = math.ceil(self._state.end.timestamp()) + 1
+        next_minute = (int(utc_now().timestamp()) // 60 + 1) * 60
+        return stage_end if next_minute > stage_end - drift else next_minute
 
-        self._state = current = self.current_stage
-        while True:
-            if current is None:
-                logger.exception(
-                    f"Closing timer loop because current state is None. Timer {self!r}"
-                )
-                break
-            to_next_stage = (current.end - utc_now()).total_seconds()
+    def _schedule(self):
+        """
+        Schedule the next tick of this timer with the TimerCog stage scheduler.
+        """
+        if (cog := self.bot.get_cog('TimerCog')) is not None:
+            cog.scheduler.schedule_timer(self)
 
-            # TODO: Consider request rate and load
-            if to_next_stage > 1 * 60 - drift:
-                time_to_sleep = 1 * 60
-            else:
-                time_to_sleep = to_next_stage
+    def _unschedule(self):
+        """
+        Remove this timer from the TimerCog stage scheduler.
+        """
+        if (cog := self.bot.get_cog('TimerCog')) is not None:
+            if cog.scheduler._timers.get(self.data.channelid, None) is self:
+                cog.scheduler.unschedule_timer(self.data.channelid)
 
-            self._run_task = asyncio.create_task(asyncio.sleep(time_to_sleep))
-            try:
-                await self._run_task
-            except asyncio.CancelledError:
-                break
+    @log_wrap(action='Timer Tick')
+    async def tick(self):
+        """
+        Run a single scheduled update of the timer.
 
-            if not self.running:
-                # We somehow stopped without cancelling the run task?
-                logger.warning(
-                    f"Closing timer loop because we are no longer running. This should not happen! Timer {self!r}"
-                )
-                break
-            if not self.channel:
-                # Probably left the guild or the channel was deleted
-                await self.destroy(reason="Underlying channel no longer exists")
-                break
+        Called by the TimerCog stage scheduler when the next tick of this timer is due.
+        Changes stage if the current stage has ended,
+        otherwise updates the channel name and status card.
+        The following tick is scheduled before the update is run.
+        """
+        set_logging_context(context=f"tid: {self.data.channelid}")
 
-            if current.end < utc_now():
-                self._state = self.current_stage
-                task = asyncio.create_task(
-                    self.notify_change_stage(current, self._state),
-                    name='notify-change-stage'
-                )
-                background_tasks.add(task)
-                task.add_done_callback(background_tasks.discard)
-                current = self._state
-            elif self.members:
-                task = asyncio.create_task(
-                    self._update_channel_name(),
-                    name='regular-channel-update'
-                )
-                background_tasks.add(task)
-                task.add_done_callback(background_tasks.discard)
-                task = asyncio.create_task(self.update_status_card())
-                background_tasks.add(task)
-                task.add_done_callback(background_tasks.discard)
+        if not self.running:
+            # We somehow stopped without being unscheduled
+            logger.warning(
+                f"Ignoring scheduled tick because we are no longer running. This should not happen! Timer {self!r}"
+            )
+            return
+        if not self.channel:
+            # Probably left the guild or the channel was deleted
+            await self.destroy(reason="Underlying channel no longer exists")
+            return
 
-        if background_tasks:
-            try:
-                await asyncio.gather(*background_tasks)
-            except Exception:
-                logger.warning(
-                    f"Unexpected error while finishing background tasks for timer {self!r}",
-                    exc_info=True
-                )
+        if self.stage_ended:
+            current = self._state
+            self._state = self.current_stage
+            self._schedule()
+            if current is not None:
+                await self.notify_change_stage(current, self._state)
+        else:
+            self._schedule()
+            if self.members:
+                await asyncio.gather(self._update_channel_name(), self.update_status_card())
 
     def launch(self):
         """
-        Launch the update loop, if the timer is running, otherwise do nothing.
+        Schedule the timer updates with the stage scheduler if the timer is running,
+        otherwise do nothing.
         """
-        if self._loop_task and not self._loop_task.done():
-            self._loop_task.cancel()
-
         if self.running:
-            self._loop_task = asyncio.create_task(self._runloop())
+            self._state = self.current_stage
+            self._schedule()
 
     async def unload(self):
         """
         Unload the timer without changing stored state.
 
-        Waits for all background tasks to complete.
+        Removes the timer from the stage scheduler.
+        Waits for any running stage change or status update to complete.
         """
         async with self._lock:
-            if self._loop_task and not self._loop_task.done():
-                if self._run_task and not self._run_task.done():
-                    self._run_task.cancel()
-                await self._loop_task
+            self._unschedule()
+            self.bot.core.refresher.cancel(self.refresh_key)
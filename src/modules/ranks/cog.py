@@ -1,6 +1,5 @@
 from typing import Optional
 import asyncio
-import datetime
 from weakref import WeakValueDictionary
 
 import discord
@@ -11,11 +10,12 @@ from cachetools import LRUCache
 
 from meta import LionBot, LionContext, LionCog
 from meta.logger import log_wrap
+from meta.sharding import THIS_SHARD
 from wards import high_management_ward, high_management_iward
 from core.data import RankType
 from utils.ui import ChoicedEnum, Transformed
 from utils.lib import utc_now, replace_multiple
-from utils.ratelimits import Bucket, limit_concurrency
+from utils.actions import ActionPriority
 from utils.data import TemporaryTable
 from modules.economy.cog import Economy
 from modules.economy.data import TransactionType
@@ -26,6 +26,7 @@ from .data import RankData, AnyRankData
 from .settings import RankSettings
 from .ui import RankOverviewUI, RankConfigUI, RankRefreshUI
 from .utils import rank_model_from_type, format_stat_range
+from .engine import RankLadder, changed_rank_rows
 
 _p = babel._p
 
@@ -132,6 +133,9 @@ class RankCog(LionCog):
         # Weakly referenced Locks for each guild to serialise rank actions
         self._rank_locks: dict[int, asyncio.Lock] = WeakValueDictionary()
 
+        # Guilds with a rank refresh currently running
+        self._refreshing: set[int] = set()
+
     async def cog_load(self):
         await self.data.init()
 
@@ -181,6 +185,13 @@ class RankCog(LionCog):
             RankType.XP: self.bot.get_cog('StatsCog').data.MemberExp,
         }[rank_type]
 
+    def _get_season_column(self, rank_type):
+        return {
+            RankType.MESSAGE: 'message_stats',
+            RankType.VOICE: 'voice_stats',
+            RankType.XP: 'xp_stats',
+        }[rank_type]
+
     def _get_rank_model(self, rank_type):
         return {
             RankType.MESSAGE: self.data.MsgRank,
@@ -206,33 +217,13 @@ class RankCog(LionCog):
             # Fetch season rank anew
             lguild = await self.bot.core.lions.fetch_guild(guildid)
             rank_type = lguild.config.get('rank_type').value
-            # TODO: Benchmark alltime efficiency
-            season_start = lguild.config.get('season_start').value or datetime.datetime(1970, 1, 1)
-            stat_data = self.bot.get_cog('StatsCog').data
-            text_data = self.bot.get_cog('TextTrackerCog').data
+            season_model = self.bot.get_cog('StatsCog').data.SeasonStats
             member_row = await self.data.MemberRank.fetch_or_create(guildid, userid)
-            if rank_type is RankType.VOICE:
-                model = stat_data.VoiceSessionStats
-                # TODO: Should probably only used saved sessions here...
-                stat = (await model.study_times_since(guildid, userid, season_start))[0]
-                if rankid := member_row.current_voice_rankid:
-                    current_rank = await self.data.VoiceRank.fetch(rankid)
-                else:
-                    current_rank = None
-            elif rank_type is RankType.XP:
-                model = stat_data.MemberExp
-                stat = (await model.xp_since(guildid, userid, season_start))[0]
-                if rankid := member_row.current_xp_rankid:
-                    current_rank = await self.data.XPRank.fetch(rankid)
-                else:
-                    current_rank = None
-            elif rank_type is RankType.MESSAGE:
-                model = text_data.TextSessions
-                stat = (await model.member_messages_since(guildid, userid, season_start))[0]
-                if rankid := member_row.current_msg_rankid:
-                    current_rank = await self.data.MsgRank.fetch(rankid)
-                else:
-                    current_rank = None
+            stat = await season_model.member_stat(guildid, userid, self._get_season_column(rank_type))
+            if rankid := getattr(member_row, self._get_rankid_column(rank_type)):
+                current_rank = await self._get_rank_model(rank_type).fetch(rankid)
+            else:
+                current_rank = None
 
             ranks = await self.get_guild_ranks(guildid)
             next_rank = None
@@ -650,13 +641,8 @@ class RankCog(LionCog):
                 async with self.ranklock(guildid):
                     if (_members := self._member_ranks.get(guildid, None)) is not None and userid in _members:
                         session_rank = _members[userid]
-                        # TODO: Temporary measure
-                        season_start = lguild.config.get('season_start').value or datetime.datetime(1970, 1, 1)
-                        stat_data = self.bot.get_cog('StatsCog').data
-                        session_rank.stat = (await stat_data.VoiceSessionStats.study_times_since(
-                            guildid, userid, season_start)
-                        )[0]
-                        # session_rank.stat += duration if (rank_type is RankType.VOICE) else guild_xp
+                        season_model = self.bot.get_cog('StatsCog').data.SeasonStats
+                        session_rank.stat = await season_model.member_stat(guildid, userid, 'voice_stats')
                     else:
                         session_rank = await self.get_member_rank(guildid, userid)
 
@@ -675,15 +661,81 @@ class RankCog(LionCog):
         """
         Interactively update ranks for everyone in the given guild.
         """
-        t = self.bot.translator.t
         if not interaction.response.is_done():
             await interaction.response.defer(thinking=False)
         ui = RankRefreshUI(self.bot, guild, callerid=interaction.user.id, timeout=None)
         await ui.send(interaction.channel)
         ui.start()
 
+        await self.refresh_guild_ranks(guild, ui, actorid=interaction.user.id)
+
+    @LionCog.listener('on_ready')
+    @log_wrap(action='Resume Rank Refreshes')
+    async def resume_rank_refreshes(self):
+        """
+        Resume any rank refreshes in this shard which were interrupted by a restart.
+        """
+        pending = await self.data.RankRefresh.fetch_where(THIS_SHARD)
+        resumed = 0
+        for row in pending:
+            if row.guildid in self._refreshing:
+                continue
+            guild = self.bot.get_guild(row.guildid)
+            if guild is None:
+                # We have left the guild, nothing to resume
+                await row.delete()
+                continue
+            # Reattach the UI to the progress message of the interrupted refresh, if we can still see it
+            ui = RankRefreshUI(self.bot, guild, callerid=row.actorid, timeout=None)
+            channel = guild.get_channel_or_thread(row.channelid) if row.channelid else None
+            if row.messageid and isinstance(channel, discord.abc.Messageable):
+                ui.attach(channel.get_partial_message(row.messageid))
+                ui.start()
+            asyncio.create_task(
+                self.refresh_guild_ranks(guild, ui, actorid=row.actorid),
+                name=f'resume-rank-refresh-{guild.id}'
+            )
+            resumed += 1
+        if resumed:
+            logger.info(f"Resuming {resumed} interrupted rank refreshes.")
+
+    async def refresh_guild_ranks(self, guild: discord.Guild, ui: RankRefreshUI, actorid: Optional[int] = None):
+        """
+        Update ranks for everyone in the given guild, reporting progress through the given UI.
+
+        The refresh is recorded in `rank_refreshes` until it finishes, along with the UI progress message,
+        so that a refresh interrupted by a restart is resumed by `resume_rank_refreshes`.
+        Since the refresh only applies the differences from the current member roles and stored ranks,
+        a resumed refresh only performs the remaining work.
+        """
+        self._refreshing.add(guild.id)
+        message = ui.message
+        try:
+            await self.data.RankRefresh.table.insert(
+                guildid=guild.id, actorid=actorid,
+                channelid=message.channel.id if message else None,
+                messageid=message.id if message else None,
+                started_at=utc_now()
+            ).on_conflict(target=('guildid',), update=('actorid', 'channelid', 'messageid', 'started_at'))
+            await self._refresh_guild_ranks(guild, ui, actorid)
+        except asyncio.CancelledError:
+            # Keep the refresh record so the refresh is resumed on the next startup
+            raise
+        except Exception:
+            await self.data.RankRefresh.table.delete_where(guildid=guild.id)
+            raise
+        else:
+            await self.data.RankRefresh.table.delete_where(guildid=guild.id)
+        finally:
+            self._refreshing.discard(guild.id)
+
+    @log_wrap(action='rank refresh')
+    async def _refresh_guild_ranks(self, guild: discord.Guild, ui: RankRefreshUI, actorid: Optional[int]):
+        t = self.bot.translator.t
+
         # Retrieve fresh rank roles
         ranks = await self.get_guild_ranks(guild.id, refresh=True)
+        ladder = RankLadder(ranks)
         ui.stage_ranks = True
         ui.poke()
 
@@ -728,83 +780,68 @@ class RankCog(LionCog):
         # Now we are certain that all the rank roles exist and are assignable
         # Compute season start and season leaderboard
         lguild = await self.bot.core.lions.fetch_guild(guild.id)
-        season_start = lguild.config.get('season_start').value
         rank_type = lguild.config.get('rank_type').value
-        stats_model = self._get_stats_model(rank_type)
-        if season_start:
-            leaderboard = await stats_model.leaderboard_since(guild.id, season_start)
-        else:
-            leaderboard = await stats_model.leaderboard_all(guild.id)
+        season_model = self.bot.get_cog('StatsCog').data.SeasonStats
+        leaderboard = await season_model.leaderboard(guild.id, self._get_season_column(rank_type))
 
         # Compile map of correct ranks
         # Filtering out members who are untracked or not in server
         unranked_role_setting = await self.bot.get_cog('StatsCog').settings.UnrankedRoles.get(guild.id)
         unranked_roleids = set(unranked_role_setting.data)
-        true_member_ranks: dict[int, RankData.VoiceRank | RankData.XPRank | RankData.MsgRank] = {}
+        true_member_ranks: dict[int, AnyRankData] = {}
         for userid, stat_total in leaderboard:
             # Check member exists
             if member := guild.get_member(userid):
                 # Check member does not have unranked roles
-                if not (member.bot or any(role.id in unranked_roleids for role in member.roles)):
+                if not (member.bot or any(member.get_role(roleid) for roleid in unranked_roleids)):
                     # Compute member rank
-                    rank = next((rank for rank in reversed(ranks) if rank.required <= stat_total), None)
+                    rank = ladder.rank_for(stat_total)
                     if rank is not None:
                         true_member_ranks[userid] = rank
 
-        # Compile maps of member roles that need removal and member roles that need adding
+        # Compile the minimal role changes for each member
         to_remove: list[tuple[discord.Member, list[discord.Role]]] = []
         to_add: list[tuple[discord.Member, discord.Role]] = []
         for member in members:
             if member.bot:
                 continue
-            true_rank = true_member_ranks.get(member.id, None)
-            true_roleid = true_rank.roleid if true_rank is not None else None
-            has_true = (true_roleid is None)
-            invalid = []
-            for role in member.roles:
-                if role.id in roles:
-                    if not has_true and role.id == true_roleid:
-                        has_true = True
-                    else:
-                        invalid.append(role)
-            if invalid:
-                to_remove.append((member, invalid))
-            if not has_true:
-                to_add.append((member, roles[true_roleid]))
+            remove_ids, add_id = ladder.role_diff(member, true_member_ranks.get(member.id, None))
+            if remove_ids:
+                to_remove.append((member, [roles[roleid] for roleid in remove_ids]))
+            if add_id is not None:
+                to_add.append((member, roles[add_id]))
 
         ui.stage_compute = True
         ui.to_remove = len(to_remove)
         ui.to_add = len(to_add)
         ui.poke()
 
-        # Perform operations
+        # Perform operations through the guild action queue
         # Starting with removals
-        coros = []
-        bucket = Bucket(4, 5)
-
+        actions = self.bot.core.actions
+        removals = {}
         for member, roles in to_remove:
-            remove_coro = member.remove_roles(
+            future = actions.remove_roles(
+                member,
                 *roles,
                 reason=t(_p(
                     'rank_refresh|remove_roles|audit',
                     "Removing invalid rank role."
-                ))
+                )),
+                priority=ActionPriority.LOW
             )
-            coros.append(bucket.wrapped(remove_coro))
+            removals[future] = member
 
-        index = 0
-        async for task in limit_concurrency(coros, 5):
-            try:
-                await task
-                index += 1
-                ui.poke()
-            except discord.HTTPException:
+        async for future in actions.completed(removals):
+            if future.exception() is not None:
                 error = t(_p(
                     'rank_refresh|remove_roles|small_error',
                     "*Could not remove ranks from {member}*"
-                )).format(member=to_remove[index][0].mention)
+                )).format(member=removals[future].mention)
                 ui.errors.append(error)
                 if len(ui.errors) > 10:
+                    # Abandon the queued removals
+                    actions.cancel(removals)
                     await ui.set_error(
                         t(_p(
                             'rank_refresh|remove_roles|error:too_many_issues',
@@ -813,33 +850,34 @@ class RankCog(LionCog):
                         ))
                     )
                     return
-            ui.removed += 1
-            ui.poke()
+            else:
+                ui.removed += 1
+                ui.poke()
 
-        coros = []
+        additions = {}
         for member, role in to_add:
-            add_coro = member.add_roles(
+            future = actions.add_roles(
+                member,
                 role,
                 reason=t(_p(
                     'rank_refresh|add_roles|audit',
                     "Adding rank role from refresh"
-                ))
+                )),
+                priority=ActionPriority.LOW
             )
-            coros.append(bucket.wrapped(add_coro))
+            additions[future] = (member, role)
 
-        index = 0
-        async for task in limit_concurrency(coros, 5):
-            try:
-                await task
-                index += 1
-                ui.poke()
-            except discord.HTTPException:
+        async for future in actions.completed(additions):
+            if future.exception() is not None:
+                member, role = additions[future]
                 error = t(_p(
                     'rank_refresh|add_roles|small_error',
                     "*Could not add {role} to {member}*"
-                )).format(member=to_add[index][0].mention, role=to_add[index][1].mention)
+                )).format(member=member.mention, role=role.mention)
                 ui.errors.append(error)
                 if len(ui.errors) > 10:
+                    # Abandon the queued additions
+                    actions.cancel(additions)
                     await ui.set_error(
                         t(_p(
                             'rank_refresh|add_roles|error:too_many_issues',
@@ -848,22 +886,26 @@ class RankCog(LionCog):
                         ))
                     )
                     return
-            ui.added += 1
-            ui.poke()
-
-        # Save correct member ranks and given roles to data
-        # First clear the member rank data entirely
-        await self.data.MemberRank.table.delete_where(guildid=guild.id)
-        if true_member_ranks:
-            column = self._get_rankid_column(rank_type)
-            values = [
-                (guild.id, memberid, rank.rankid, rank.roleid)
-                for memberid, rank in true_member_ranks.items()
-            ]
+            else:
+                ui.added += 1
+                ui.poke()
+
+        # Save the member ranks which have changed
+        column = self._get_rankid_column(rank_type)
+        stored = await self.data.MemberRank.table.select_where(
+            guildid=guild.id
+        ).select('userid', column, 'last_roleid').with_no_adapter()
+        existing = {row['userid']: (row[column], row['last_roleid']) for row in stored}
+        changed = changed_rank_rows(existing, true_member_ranks)
+        if changed:
             await self.data.MemberRank.table.insert_many(
                 ('guildid', 'userid', column, 'last_roleid'),
-                *values
-            )
+                *((guild.id, userid, rankid, roleid) for userid, rankid, roleid in changed)
+            ).on_conflict(target=('guildid', 'userid'), update=(column, 'last_roleid'))
+        logger.info(
+            f"Rank refresh in <gid: {guild.id}> removed {ui.removed} roles, added {ui.added} roles, "
+            f"and updated {len(changed)} of {len(true_member_ranks)} member ranks."
+        )
         self.flush_guild_ranks(guild.id)
         await ui.set_done()
 
@@ -879,7 +921,7 @@ class RankCog(LionCog):
                 "**`{removed}`** invalid rank roles removed.\n"
                 "**`{added}`** new rank roles added."
             )).format(
-                actor=interaction.user.mention,
+                actor=f"<@{actorid}>" if actorid else self.bot.user.mention,
                 removed=ui.removed,
                 added=ui.added,
             )
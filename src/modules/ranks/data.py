@@ -105,5 +105,27 @@ class RankData(Registry):
         current_msg_rankid = Integer()
         last_roleid = Integer()
 
+    class RankRefresh(RowModel):
+        """
+        Rank refreshes which have been started and not completed.
+
+        Schema
+        ------
+        CREATE TABLE rank_refreshes(
+          guildid BIGINT PRIMARY KEY REFERENCES guild_config ON DELETE CASCADE,
+          actorid BIGINT,
+          channelid BIGINT,
+          messageid BIGINT,
+          started_at TIMESTAMPTZ NOT NULL DEFAULT now()
+        );
+        """
+        _tablename_ = 'rank_refreshes'
+
+        guildid = Integer(primary=True)
+        actorid = Integer()
+        channelid = Integer()
+        messageid = Integer()
+        started_at = Timestamp()
+
 
 AnyRankData: TypeAlias = Union[RankData.XPRank, RankData.VoiceRank, RankData.MsgRank]
@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+from bisect import bisect_right
+
+import discord
+
+from .data import AnyRankData
+
+
+class RankLadder:
+    """
+    Sorted threshold lookup for the ranks of a single guild.
+
+    Resolves the rank for a stat total with a binary search over the rank requirements,
+    and computes the minimal role changes needed to give a member their correct rank role.
+    """
+    __slots__ = ('ranks', 'thresholds', 'roleids', '_by_roleid')
+
+    def __init__(self, ranks: Iterable[AnyRankData]):
+        self.ranks: list[AnyRankData] = sorted(ranks, key=lambda rank: rank.required)
+        self.thresholds: list[int] = [rank.required for rank in self.ranks]
+        self._by_roleid: dict[int, AnyRankData] = {rank.roleid: rank for rank in self.ranks}
+        self.roleids = frozenset(self._by_roleid)
+
+    def __len__(self):
+        return len(self.ranks)
+
+    def rank_for(self, stat: int) -> Optional[AnyRankData]:
+        """
+        The highest rank with requirement at most `stat`, or None if no rank is reached.
+        """
+        index = bisect_right(self.thresholds, stat)
+        return self.ranks[index - 1] if index else None
+
+    def held_roleids(self, member: discord.Member) -> set[int]:
+        """
+        The rank roles the member currently holds.
+        """
+        return {roleid for roleid in self.roleids if member.get_role(roleid) is not None}
+
+    def role_diff(self, member: discord.Member,
+                  rank: Optional[AnyRankData]) -> tuple[list[int], Optional[int]]:
+        """
+        Compute the rank role changes required for the member to hold exactly the role of `rank`.
+
+        Returns the list of rank roleids to remove, and the roleid to add (if any).
+        """
+        held = self.held_roleids(member)
+        true_roleid = rank.roleid if rank is not None else None
+        to_remove = [roleid for roleid in held if roleid != true_roleid]
+        to_add = true_roleid if (true_roleid is not None and true_roleid not in held) else None
+        return to_remove, to_add
+
+
+def changed_rank_rows(existing: dict[int, tuple[Optional[int], Optional[int]]],
+                      true_ranks: dict[int, AnyRankData]) -> list[tuple[int, Optional[int], Optional[int]]]:
+    """
+    Compute the member rank rows which need to be written.
+
+    `existing` maps userids to the stored `(rankid, last_roleid)` for the active rank type,
+    and `true_ranks` maps userids to their correct rank.
+    Members who no longer have a rank have their stored rank cleared.
+
+    Returns a list of `(userid, rankid, roleid)` rows which differ from the stored data.
+    """
+    rows = []
+    for userid, rank in true_ranks.items():
+        if existing.get(userid, None) != (rank.rankid, rank.roleid):
+            rows.append((userid, rank.rankid, rank.roleid))
+    for userid, stored in existing.items():
+        if userid not in true_ranks and stored != (None, None):
+            rows.append((userid, None, None))
+    return rows
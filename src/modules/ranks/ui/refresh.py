@@ -51,6 +51,16 @@ class RankRefreshUI(MessageUI):
         self._wakeup = asyncio.Event()
 
     # ----- API -----
+    @property
+    def message(self) -> Optional[discord.Message]:
+        return self._message
+
+    def attach(self, message: discord.PartialMessage):
+        """
+        Attach the UI to an existing progress message, e.g. from an interrupted refresh.
+        """
+        self._message = message
+
     async def set_error(self, error: str):
         """
         Set the given error, refresh, and stop.
@@ -11,6 +11,7 @@ Max 25 reminders (propagating Discord restriction)
 /remindme in <days: int> <hours: int> <minutes: int> <repeat every: acmpl str> <reminder: str>
 """
 from typing import Optional
+import asyncio
 import datetime as dt
 from cachetools import TTLCache
 
@@ -21,10 +22,12 @@ from discord.app_commands import Transform
 from dateutil.parser import parse, ParserError
 
 from data.queries import ORDER
+from data.conditions import NULL
 
 from meta import LionBot, LionCog, LionContext
 from meta.errors import UserInputError
-from meta.app import shard_talk, appname_from_shard
+from meta import sharding
+from meta.app import shard_talk, appname_from_shard, shardname
 from meta.logger import log_wrap, set_logging_context
 
 from babel import ctx_translator, ctx_locale
@@ -47,21 +50,31 @@ class ReminderMonitor(TaskMonitor[int]):
 
 
 class Reminders(LionCog):
+    # Only reminders due within this window are loaded into the ReminderMonitor
+    window = dt.timedelta(hours=6)
+    # How often the loaded window is extended
+    refill_interval = dt.timedelta(hours=1)
+    # How long a shard's claim on a reminder lasts while executing it
+    claim_lease = dt.timedelta(minutes=10)
+    # Tolerance for reminders claimed slightly before they are due, e.g. from clock skew
+    claim_slack = dt.timedelta(minutes=1)
+
     def __init__(self, bot: LionBot):
         self.bot = bot
         self.data = bot.db.load_registry(ReminderData())
 
-        # Whether this process should handle reminder execution
-        self.executor = (self.bot.shard_id == 0)
-        self.executor_name = appname_from_shard(0)
+        # Reminders are partitioned by userid across the live shards
+        # Each shard loads the reminders of the users in its own partition
+        # Partitions are computed from each shard's own peer view, so they may briefly overlap,
+        # and reminders are only sent after being claimed in the database by `_claim_reminders`
+        # Sorted list of the shardids currently sharing reminder execution
+        self.partitions: list[int] = [sharding.shard_number]
+        self.monitor: ReminderMonitor = self._make_monitor()
+        self._rebalance_lock = asyncio.Lock()
 
-        if self.executor:
-            self.monitor: Optional[ReminderMonitor] = ReminderMonitor(
-                executor=self.execute_reminder,
-                bucket=Bucket(5, 10)
-            )
-        else:
-            self.monitor = None
+        # End of the window of reminders currently loaded in the monitor
+        self._window_end: Optional[dt.datetime] = None
+        self._refill_task: Optional[asyncio.Task] = None
 
         self.talk_reload = shard_talk.register_route('reload_reminders')(self.reload_reminders)
         self.talk_schedule = shard_talk.register_route('schedule_reminders')(self.schedule_reminders)
@@ -73,22 +86,85 @@ class Reminders(LionCog):
 
     async def cog_load(self):
         await self.data.init()
+        shard_talk.add_peer_callback(self.rebalance)
 
-        if self.executor and self.bot.is_ready():
+        if self.bot.is_ready():
             await self.on_ready()
 
+    async def cog_unload(self):
+        shard_talk.remove_peer_callback(self.rebalance)
+        if self._refill_task:
+            self._refill_task.cancel()
+        if self.monitor._monitor_task:
+            self.monitor._monitor_task.cancel()
+
     @LionCog.listener()
     async def on_ready(self):
-        if self.executor:
-            if self.monitor and self.monitor._monitor_task:
-                self.monitor._monitor_task.cancel()
-
-            # Attach and populate the reminder monitor
-            self.monitor = ReminderMonitor(executor=self.execute_reminder, bucket=Bucket(5, 10))
+        if self._refill_task:
+            self._refill_task.cancel()
+        if self.monitor._monitor_task:
+            self.monitor._monitor_task.cancel()
+
+        # Attach and populate the reminder monitor
+        self.monitor = self._make_monitor()
+        async with self._rebalance_lock:
+            self.partitions = self._live_partitions()
             await self.reload_reminders()
 
-            # Start firing reminders
-            self.monitor.start()
+        # Start firing reminders
+        self.monitor.start()
+        self._refill_task = asyncio.create_task(self._refill_loop(), name='reminder-refill')
+
+    def _live_partitions(self) -> list[int]:
+        """
+        Compute the sorted list of shards currently connected to ShardTalk, including this one.
+        """
+        shardids = {
+            shardid for shardid in range(max(sharding.shard_count, 1))
+            if appname_from_shard(shardid) in shard_talk.peers
+        }
+        shardids.add(sharding.shard_number)
+        return sorted(shardids)
+
+    async def rebalance(self):
+        """
+        Peer list callback.
+        Recompute the reminder partitions, and reload our reminders if our partition changed.
+
+        Shards joining or leaving ShardTalk thus take on or hand off their share of reminders.
+        """
+        async with self._rebalance_lock:
+            partitions = self._live_partitions()
+            if partitions != self.partitions:
+                logger.info(
+                    f"Rebalancing reminder partitions from {self.partitions} to {partitions}."
+                )
+                self.partitions = partitions
+                if self.monitor._monitor_task:
+                    await self.reload_reminders()
+
+    def owner_of(self, userid: int) -> int:
+        """
+        The shardid currently responsible for executing reminders for the given user.
+        """
+        return self.partitions[userid % len(self.partitions)]
+
+    def owner_name(self, userid: int) -> str:
+        """
+        The ShardTalk appname of the shard executing reminders for the given user.
+        """
+        return appname_from_shard(self.owner_of(userid))
+
+    def owns(self, userid: int) -> bool:
+        return self.owner_of(userid) == sharding.shard_number
+
+    def _make_monitor(self) -> ReminderMonitor:
+        return ReminderMonitor(
+            batch_executor=self.execute_reminders,
+            bucket=Bucket(5, 10),
+            batch_size=50,
+            max_concurrency=2,
+        )
 
     # ----- Cog API -----
 
@@ -162,8 +238,11 @@ class Reminders(LionCog):
             created_at=created_at,
         )
 
-        # Schedule from executor
-        await self.talk_schedule(reminder.reminderid).send(self.executor_name, wait_for_reply=False)
+        # Schedule from the executing shard
+        if self.owns(userid):
+            await self.schedule_reminders(reminder.reminderid)
+        else:
+            await self.talk_schedule(reminder.reminderid).send(self.owner_name(userid), wait_for_reply=False)
 
         # Dispatch reminder update
         await self.dispatch_update_for(userid)
@@ -211,31 +290,72 @@ class Reminders(LionCog):
         if userid in self._active_reminderlists:
             await self._active_reminderlists[userid].refresh()
 
+    async def _load_window(self, start: dt.datetime, end: dt.datetime) -> list[tuple[int, int]]:
+        """
+        Load the reminder tasks in our partition due in the window `(start, end]`.
+        """
+        partition = self.partitions.index(sharding.shard_number)
+        Reminder = self.data.Reminder
+        rows = await Reminder.select_partition_where(
+            partition, len(self.partitions),
+            Reminder.remind_at > start,
+            Reminder.remind_at <= end,
+            failed=None
+        ).select('reminderid', 'remind_at')
+        return [(row['reminderid'], int(row['remind_at'].timestamp())) for row in rows]
+
     async def reload_reminders(self):
         """
         Refresh reminder data and reminder tasks.
+
+        Only reminders due within the next `window` are loaded,
+        later reminders are loaded by the refill loop as the window advances.
         """
-        if not self.executor:
-            raise ValueError("Only the executor shard can reload reminders!")
-        # Load all reminder tasks
-        reminders = await self.data.Reminder.fetch_where(
-            self.data.Reminder.remind_at > utc_now(),
-            failed=None
-        )
-        tasks = [(r.reminderid, r.timestamp) for r in reminders]
+        now = utc_now()
+        self._window_end = now + self.window
+        tasks = await self._load_window(now, self._window_end)
         self.monitor.set_tasks(*tasks)
         logger.info(
-            f"Reloaded ReminderMonitor with {len(tasks)} active reminders."
+            f"Reloaded ReminderMonitor with {len(tasks)} active reminders "
+            f"due before {self._window_end} "
+            f"in partition {self.partitions.index(sharding.shard_number)} of {len(self.partitions)}."
         )
 
+    async def refill_reminders(self):
+        """
+        Advance the loaded reminder window, scheduling any newly covered reminders.
+        """
+        async with self._rebalance_lock:
+            if self._window_end is None:
+                return
+            start = self._window_end
+            # Advance the window first, so reminders created during the load are scheduled directly
+            self._window_end = utc_now() + self.window
+            tasks = await self._load_window(start, self._window_end)
+            if tasks:
+                self.monitor.schedule_tasks(*tasks)
+            logger.debug(
+                f"Refilled ReminderMonitor with {len(tasks)} reminders due before {self._window_end}."
+            )
+
+    async def _refill_loop(self):
+        while True:
+            await asyncio.sleep(self.refill_interval.total_seconds())
+            try:
+                await self.refill_reminders()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Unexpected exception while refilling reminder window.")
+
+    def _in_window(self, reminder: ReminderData.Reminder) -> bool:
+        return self._window_end is not None and reminder.remind_at <= self._window_end
+
     async def cancel_reminders(self, *reminderids):
         """
         ShardTalk Route.
         Cancel the given reminderids in the ReminderMonitor.
         """
-        if not self.executor:
-            raise ValueError("Only the executor shard can cancel scheduled reminders!")
-        # If we are the executor shard, we know the monitor is loaded
         # If reminders have not yet been loaded, cancelling is a no-op
         # Since reminder loading is synchronous, we cannot get in a race state with loading
         self.monitor.cancel_tasks(*reminderids)
@@ -248,31 +368,81 @@ class Reminders(LionCog):
         ShardTalk Route.
         Schedule the given new reminderids in the ReminderMonitor.
         """
-        if not self.executor:
-            raise ValueError("Only the executor shard can schedule reminders!")
         # We refetch here to make sure the reminders actually exist
-        reminders = await self.data.Reminder.fetch_where(reminderid=reminderids)
+        # Reminders outside the current window will be loaded by the refill loop
+        reminders = [
+            reminder for reminder in await self.data.Reminder.fetch_where(reminderid=reminderids)
+            if self._in_window(reminder)
+        ]
+        if disowned := [reminder.reminderid for reminder in reminders if not self.owns(reminder.userid)]:
+            # The sending shard disagrees with us about the partitions, e.g. during a rebalance
+            # Schedule them anyway, the execution claim prevents sending them twice
+            logger.info(
+                f"Scheduling reminders {disowned} outside our partition {self.partitions}."
+            )
         self.monitor.schedule_tasks(*((reminder.reminderid, reminder.timestamp) for reminder in reminders))
         logger.debug(
             f"Scheduled new reminders: {tuple(reminder.reminderid for reminder in reminders)}",
         )
 
-    @log_wrap(action="Send Reminder")
     async def execute_reminder(self, reminderid):
         """
         Send the reminder with the given reminderid.
 
-        This should in general only be executed from the executor shard,
+        This should in general only be executed from the shard owning the reminder,
         through a ReminderMonitor instance.
         """
-        set_logging_context(context=f"rid: {reminderid}")
+        await self.execute_reminders([reminderid])
+
+    @log_wrap(action="Send Reminders")
+    async def execute_reminders(self, reminderids: list[int]):
+        """
+        Send the reminders with the given reminderids.
 
-        reminder = await self.data.Reminder.fetch(reminderid)
-        if reminder is None:
-            logger.warning(
-                f"Attempted to execute a reminder <rid: {reminderid}> that no longer exists!"
+        Claims and loads the reminder data for the whole batch in a single query,
+        then sends the reminders in order.
+        """
+        reminders = await self._claim_reminders(reminderids)
+        if len(reminders) < len(reminderids):
+            missing = set(reminderids).difference(reminder.reminderid for reminder in reminders)
+            logger.info(
+                f"Skipping reminders {missing} which no longer exist, are not due, or are claimed by another shard."
             )
-            return
+        reminders.sort(key=lambda reminder: reminder.remind_at)
+
+        # Warm the locale cache for the whole batch
+        await self.bot.get_cog('BabelCog').resolve_locales(*{reminder.userid for reminder in reminders})
+
+        for reminder in reminders:
+            await self._send_reminder(reminder)
+
+    async def _claim_reminders(self, reminderids: list[int]) -> list[ReminderData.Reminder]:
+        """
+        Claim the given due reminders for execution on this shard.
+
+        Claiming is a single atomic update, so when several shards have loaded the same reminder
+        (e.g. while their peer views disagree), exactly one of them sends it.
+        A claim expires after `claim_lease`, and is released when a repeating reminder is rescheduled.
+        Returns the claimed reminders.
+        """
+        now = utc_now()
+        Reminder = self.data.Reminder
+        return await Reminder.table.update_where(
+            (Reminder.claimed_until == NULL) | (Reminder.claimed_until < now) | (Reminder.claimed_by == shardname),
+            Reminder.remind_at <= now + self.claim_slack,
+            reminderid=reminderids,
+            failed=None,
+        ).set(
+            claimed_by=shardname,
+            claimed_until=now + self.claim_lease,
+        ).with_adapter(Reminder._make_rows)
+
+    @log_wrap(action="Send Reminder")
+    async def _send_reminder(self, reminder: ReminderData.Reminder):
+        """
+        Send the given reminder to its user, and reschedule or remove it.
+        """
+        set_logging_context(context=f"rid: {reminder.reminderid}")
 
         try:
             # Try and find the user
@@ -301,8 +471,9 @@ class Reminders(LionCog):
                 # TODO: Is this actually dst safe?
                 while next_time.timestamp() <= now.timestamp():
                     next_time = next_time + dt.timedelta(seconds=reminder.interval)
-                await reminder.update(remind_at=next_time)
-                self.monitor.schedule_task(reminder.reminderid, reminder.timestamp)
+                await reminder.update(remind_at=next_time, claimed_by=None, claimed_until=None)
+                if self._in_window(reminder):
+                    self.monitor.schedule_task(reminder.reminderid, reminder.timestamp)
                 logger.debug(
                     f"Executed reminder <rid: {reminder.reminderid}> and scheduled repeat at {next_time}."
                 )
@@ -423,7 +594,7 @@ class Reminders(LionCog):
 
         # At this point we have a valid reminder to cancel
         await rem.delete()
-        await self.talk_cancel(rem.reminderid).send(self.executor_name, wait_for_reply=False)
+        await self.talk_cancel(rem.reminderid).send(self.owner_name(rem.userid), wait_for_reply=False)
         await ctx.reply(
             embed=discord.Embed(
                 description=t(_p(
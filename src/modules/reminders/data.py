@@ -1,6 +1,8 @@
 import discord
+from psycopg import sql
 
 from data import RowModel, Registry
+from data.conditions import Condition, Joiner
 from data.columns import Integer, String, Timestamp, Bool
 
 from babel import ctx_translator
@@ -29,7 +31,9 @@ class ReminderData(Registry, name='reminders'):
             interval INTEGER,
             created_at TIMESTAMP DEFAULT (now() at time zone 'utc'),
             title TEXT,
-            footer TEXT
+            footer TEXT,
+            claimed_by TEXT,
+            claimed_until TIMESTAMPTZ
         );
         CREATE INDEX reminder_users ON reminders (userid);
         """
@@ -46,6 +50,26 @@ class ReminderData(Registry, name='reminders'):
         title = String()  # Title of the final reminder embed, only set in automated reminders
         footer = String()  # Footer of the final reminder embed, only set in automated reminders
         failed = Bool()  # Whether the reminder was already attempted and failed
+        claimed_by = String()  # Name of the shard currently executing the reminder
+        claimed_until = Timestamp()  # Expiry of the execution claim
+
+        @classmethod
+        def select_partition_where(cls, partition: int, partitions: int, *args, **kwargs):
+            """
+            Select raw reminder data belonging to the given userid partition.
+
+            This returns an awaitable and chainable Select Query.
+            """
+            condition = Condition(
+                sql.SQL("({userid} %% {partitions})").format(
+                    userid=sql.Identifier('userid'),
+                    partitions=sql.Literal(partitions)
+                ),
+                Joiner.EQUALS,
+                sql.Placeholder(),
+                (partition,)
+            )
+            return cls.table.select_where(condition, *args, **kwargs)
 
         @property
         def timestamp(self) -> int:
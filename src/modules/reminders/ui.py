@@ -59,7 +59,7 @@ class ReminderList(MessageUI):
             await interaction.response.defer()
             reminders = await self.cog.data.Reminder.table.delete_where(userid=self.userid)
             await self.cog.talk_cancel(*(r['reminderid'] for r in reminders)).send(
-                self.cog.executor_name, wait_for_reply=False
+                self.cog.owner_name(self.userid), wait_for_reply=False
             )
             await press.edit_original_response(
                 embed=discord.Embed(
@@ -196,7 +196,7 @@ class ReminderList(MessageUI):
             await self.cog.data.Reminder.table.delete_where(reminderid=values)
 
             # Send cancellation
-            await self.cog.talk_cancel(*values).send(self.cog.executor_name, wait_for_reply=False)
+            await self.cog.talk_cancel(*values).send(self.cog.owner_name(self.userid), wait_for_reply=False)
 
             self.cog._user_reminder_cache.pop(self.userid, None)
             await self.refresh()
@@ -276,7 +276,7 @@ class ReminderList(MessageUI):
                     'ui:reminderlist|embed:no_reminders|title',
                     "You have no reminders set!"
                 )).format(
-                    remindme=self.bot.core.cmd_name_cache['remindme'].mention,
+                    remindme=self.bot.core.mention_cache['remindme'],
                 ),
                 colour=discord.Colour.dark_orange(),
             )
@@ -152,7 +152,7 @@ class RoleMenuCog(LionCog):
         self.live_menus = RoleMenu.attached_menus  # guildid -> messageid -> menuid
 
         # Expiry manage
-        self.expiry_monitor = ExpiryMonitor(executor=self._expire)
+        self.expiry_monitor = ExpiryMonitor(batch_executor=self._expire_batch, max_concurrency=4)
 
     async def _monitor(self):
         state = (
@@ -214,7 +214,7 @@ class RoleMenuCog(LionCog):
             self.expiry_monitor._monitor_task.cancel()
 
         # Start monitor
-        self.expiry_monitor = ExpiryMonitor(executor=self._expire)
+        self.expiry_monitor = ExpiryMonitor(batch_executor=self._expire_batch, max_concurrency=4)
         self.expiry_monitor.start()
 
         # Load guilds
@@ -301,101 +301,117 @@ class RoleMenuCog(LionCog):
             f"Cancelled rolemenu expiry tasks: {equipids}"
         )
 
-    async def _expire(self, equipid: int):
+    async def _expire_batch(self, equipids: list[int]):
         """
-        Attempt to expire the given equipid.
+        Attempt to expire the given equipids.
 
-        The equipid may no longer be valid, or may be unexpirable.
+        The equipids may no longer be valid, or may be unexpirable.
         If the bot is no longer in the server, ignores the expiry.
         If the member is no longer in the server, removes the role from persisted roles, if applicable.
+        Loads the equip and menu data for the whole batch in two queries.
         """
-        logger.debug(f"Expiring RoleMenu equipped role {equipid}")
-        rows = await self.data.RoleMenuHistory.fetch_expiring_where(equipid=equipid)
+        logger.debug(f"Expiring RoleMenu equipped roles {equipids}")
+        rows = await self.data.RoleMenuHistory.fetch_expiring_where(equipid=equipids)
+        valid = {row.equipid for row in rows}
+        for equipid in equipids:
+            if equipid not in valid:
+                # equipid is no longer valid or is not expiring
+                logger.info(f"RoleMenu equipped role {equipid} is no longer valid or is not expiring.")
+
         if rows:
-            equip_row = rows[0]
-            menu = await self.data.RoleMenu.fetch(equip_row.menuid)
-            guild = self.bot.get_guild(menu.guildid)
-            if guild is not None:
-                log_errors = []
-                lguild = await self.bot.core.lions.fetch_guild(menu.guildid)
-                t = self.bot.translator.t
-                ctx_locale.set(lguild.locale)
-
-                role = guild.get_role(equip_row.roleid)
-                if role is not None:
-                    lion = await self.bot.core.lions.fetch_member(guild.id, equip_row.userid)
-                    await lion.remove_role(role)
-                    if (member := lion.member):
-                        if role in member.roles:
-                            logger.error(f"Expired {equipid}, but the member still has the role!")
-                            log_errors.append(t(_p(
-                                'eventlog|event:rolemenu_role_expire|error:remove_failed',
-                                "Removed the role, but the member still has the role!!"
-                            )))
-                        else:
-                            logger.info(f"Expired {equipid}, and successfully removed the role from the member!")
-                    else:
-                        logger.info(
-                            f"Expired {equipid} for non-existent member {equip_row.userid}. "
-                            "Removed from persistent roles."
-                        )
+            menus = await self.data.RoleMenu.fetch_where(menuid=list({row.menuid for row in rows}))
+            menumap = {menu.menuid: menu for menu in menus}
+            for equip_row in rows:
+                try:
+                    await self._expire_row(equip_row, menumap[equip_row.menuid])
+                except Exception:
+                    logger.exception(
+                        f"Unexpected exception while expiring RoleMenu equipped role {equip_row.equipid}"
+                    )
+
+    async def _expire_row(self, equip_row: RoleMenuData.RoleMenuHistory, menu: RoleMenuData.RoleMenu):
+        """
+        Expire the given (valid and expiring) equip row from the given menu.
+        """
+        equipid = equip_row.equipid
+        guild = self.bot.get_guild(menu.guildid)
+        if guild is not None:
+            log_errors = []
+            lguild = await self.bot.core.lions.fetch_guild(menu.guildid)
+            t = self.bot.translator.t
+            ctx_locale.set(lguild.locale)
+
+            role = guild.get_role(equip_row.roleid)
+            if role is not None:
+                lion = await self.bot.core.lions.fetch_member(guild.id, equip_row.userid)
+                await lion.remove_role(role)
+                if (member := lion.member):
+                    if role in member.roles:
+                        logger.error(f"Expired {equipid}, but the member still has the role!")
                         log_errors.append(t(_p(
-                            'eventlog|event:rolemenu_role_expire|error:member_gone',
-                            "Member could not be found.. role has been removed from saved roles."
+                            'eventlog|event:rolemenu_role_expire|error:remove_failed',
+                            "Removed the role, but the member still has the role!!"
                         )))
+                    else:
+                        logger.info(f"Expired {equipid}, and successfully removed the role from the member!")
                 else:
-                    logger.info(f"Could not expire {equipid} because the role was not found.")
+                    logger.info(
+                        f"Expired {equipid} for non-existent member {equip_row.userid}. "
+                        "Removed from persistent roles."
+                    )
                     log_errors.append(t(_p(
-                        'eventlog|event:rolemenu_role_expire|error:no_role',
-                        "Role {role} no longer exists."
-                    )).format(role=f"`{equip_row.roleid}`"))
-                now = utc_now()
-                lguild.log_event(
-                    title=t(_p(
-                        'eventlog|event:rolemenu_role_expire|title',
-                        "Equipped role has expired"
-                    )),
-                    description=t(_p(
-                        'eventlog|event:rolemenu_role_expire|desc',
-                        "{member}'s role {role} has now expired."
-                    )).format(
-                        member=f"<@{equip_row.userid}>",
-                        role=f"<@&{equip_row.roleid}>",
-                    ),
-                    fields={
-                        t(_p(
-                            'eventlog|event:rolemenu_role_expire|field:menu',
-                            "Obtained From"
-                        )): (
-                            jumpto(
-                                menu.guildid, menu.channelid, menu.messageid
-                            ) if menu and menu.messageid else f"**{menu.name}**",
-                            True
-                        ),
-                        t(_p(
-                            'eventlog|event:rolemenu_role_expire|field:menu',
-                            "Obtained At"
-                        )): (
-                            discord.utils.format_dt(equip_row.obtained_at),
-                            True
-                        ),
-                        t(_p(
-                            'eventlog|event:rolemenu_role_expire|field:expiry',
-                            "Expiry"
-                        )): (
-                            discord.utils.format_dt(equip_row.expires_at),
-                            True
-                        ),
-                    },
-                    errors=log_errors
-                )
-                await equip_row.update(removed_at=now)
+                        'eventlog|event:rolemenu_role_expire|error:member_gone',
+                        "Member could not be found.. role has been removed from saved roles."
+                    )))
             else:
-                logger.info(f"Could not expire {equipid} because the guild was not found.")
+                logger.info(f"Could not expire {equipid} because the role was not found.")
+                log_errors.append(t(_p(
+                    'eventlog|event:rolemenu_role_expire|error:no_role',
+                    "Role {role} no longer exists."
+                )).format(role=f"`{equip_row.roleid}`"))
+            now = utc_now()
+            lguild.log_event(
+                title=t(_p(
+                    'eventlog|event:rolemenu_role_expire|title',
+                    "Equipped role has expired"
+                )),
+                description=t(_p(
+                    'eventlog|event:rolemenu_role_expire|desc',
+                    "{member}'s role {role} has now expired."
+                )).format(
+                    member=f"<@{equip_row.userid}>",
+                    role=f"<@&{equip_row.roleid}>",
+                ),
+                fields={
+                    t(_p(
+                        'eventlog|event:rolemenu_role_expire|field:menu',
+                        "Obtained From"
+                    )): (
+                        jumpto(
+                            menu.guildid, menu.channelid, menu.messageid
+                        ) if menu and menu.messageid else f"**{menu.name}**",
+                        True
+                    ),
+                    t(_p(
+                        'eventlog|event:rolemenu_role_expire|field:menu',
+                        "Obtained At"
+                    )): (
+                        discord.utils.format_dt(equip_row.obtained_at),
+                        True
+                    ),
+                    t(_p(
+                        'eventlog|event:rolemenu_role_expire|field:expiry',
+                        "Expiry"
+                    )): (
+                        discord.utils.format_dt(equip_row.expires_at),
+                        True
+                    ),
+                },
+                errors=log_errors
+            )
+            await equip_row.update(removed_at=now)
         else:
-            # equipid is no longer valid or is not expiring
-            logger.info(f"RoleMenu equipped role {equipid} is no longer valid or is not expiring.")
-            pass
+            logger.info(f"Could not expire {equipid} because the guild was not found.")
 
     # ----- Private Utils -----
     async def _parse_msg(self, guild: discord.Guild, msgstr: str) -> discord.Message:
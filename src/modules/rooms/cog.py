@@ -12,6 +12,7 @@ from meta.logger import log_wrap
 from meta.errors import ResponseTimedOut
 from meta.sharding import THIS_SHARD
 from utils.lib import utc_now, error_embed
+from utils.monitor import TaskMonitor
 from utils.ui import Confirm
 from constants import MAX_COINS
 from core.data import CoreData
@@ -29,6 +30,10 @@ from .lib import parse_members, owner_overwrite, member_overwrite, bot_overwrite
 _p, _np = babel._p, babel._np
 
 
+class RentMonitor(TaskMonitor[int]):
+    ...
+
+
 class RoomCog(LionCog):
     def __init__(self, bot: LionBot):
         self.bot = bot
@@ -38,7 +43,10 @@ class RoomCog(LionCog):
         self.ready = False
         self.event_lock = asyncio.Lock()
         self._room_cache = defaultdict(dict)  # Map guildid -> channelid -> Room
-        self._ticker_tasks = {}  # Map channelid -> room run task
+        self._rooms: dict[int, Room] = {}  # Map channelid -> running Room
+
+        # Rent ticks for all running rooms, keyed by channelid
+        self.rent_monitor = RentMonitor(batch_executor=self._tick_rooms, batch_size=500)
 
     async def cog_load(self):
         await self.data.init()
@@ -53,9 +61,9 @@ class RoomCog(LionCog):
             await self.initialise()
 
     async def cog_unload(self):
-        # Cancel room tick loops
-        for task in self._ticker_tasks.values():
-            task.cancel()
+        # Stop room rent ticks
+        if self.rent_monitor._monitor_task:
+            self.rent_monitor._monitor_task.cancel()
 
     def get_rooms(self, guildid: int, userid: Optional[int] = None):
         """
@@ -109,28 +117,88 @@ class RoomCog(LionCog):
                 self._start(room)
 
         logger.info(
-            f"Launched ticker tasks for {len(to_launch)} private rooms."
+            f"Scheduled rent ticks for {len(to_launch)} private rooms."
         )
 
     def _start(self, room: Room):
-        task = asyncio.create_task(self._ticker(room))
+        """
+        Add the given room to the running rooms, and schedule its next rent tick.
+        """
         key = room.data.channelid
-        self._ticker_tasks[key] = task
-        task.add_done_callback(lambda fut: self._ticker_tasks.pop(key, None))
+        self._room_cache[room.data.guildid][key] = room
+        self._rooms[key] = room
+        self.rent_monitor.schedule_task(key, room.next_tick.timestamp())
 
-    async def _ticker(self, room: Room):
-        cache = self._room_cache
-        cache[room.data.guildid][room.data.channelid] = room
-        try:
-            await room.run()
-        except asyncio.CancelledError:
-            pass
-        except Exception:
-            logger.exception(
-                f"Unhandled exception during room run task. This should not happen! {room.data!r}"
+    def _stop(self, room: Room):
+        """
+        Remove the given room from the running rooms, and cancel its rent tick.
+        """
+        key = room.data.channelid
+        self.rent_monitor.cancel_tasks(key)
+        self._rooms.pop(key, None)
+        self._room_cache[room.data.guildid].pop(key, None)
+
+    @log_wrap(action='Room Rent Tick')
+    async def _tick_rooms(self, channelids: list[int]):
+        """
+        Execute the once-per day rent tick for a batch of due rooms.
+
+        Deducts the rent from every room balance in a single statement,
+        then expires all the rooms with insufficient balance together.
+        Rooms with a missing channel are destroyed without charging rent.
+        """
+        rooms = [
+            room for cid in channelids
+            if (room := self._rooms.get(cid, None)) is not None and not room.deleted
+        ]
+        missing = [room for room in rooms if room.channel is None]
+        present = [room for room in rooms if room.channel is not None]
+
+        now = utc_now()
+        ticked = []
+        expired = []
+        if present:
+            # Updates the cached room data in place
+            await self.data.Room.deduct_rent(now, *((room.data.channelid, room.rent) for room in present))
+            for room in present:
+                if room.deleted:
+                    continue
+                if room.data.coin_balance < 0:
+                    expired.append(room)
+                else:
+                    ticked.append(room)
+
+        if expired:
+            await self.data.Room.table.update_where(
+                channelid=[room.data.channelid for room in expired]
+            ).set(deleted_at=now).with_adapter(self.data.Room._make_rows)
+            logger.info(
+                f"Expired {len(expired)} private rooms with insufficient balance: "
+                f"{', '.join(str(room.data.channelid) for room in expired)}"
+            )
+
+        if ticked:
+            self.rent_monitor.schedule_tasks(
+                *((room.data.channelid, room.next_tick.timestamp()) for room in ticked)
             )
-        finally:
-            cache[room.data.guildid].pop(room.data.channelid)
+
+        logger.debug(
+            f"Ran rent tick for {len(rooms)} private rooms. "
+            f"Charged: {len(present)}, Expired: {len(expired)}, Missing: {len(missing)}"
+        )
+
+        results = await asyncio.gather(
+            *(room.expire() for room in expired),
+            *(room.expire_missing() for room in missing),
+            *(room.notify_rent() for room in ticked),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(
+                    "Unhandled exception while completing private room tick.",
+                    exc_info=result
+                )
 
     # ----- Event Handlers -----
     @LionCog.listener('on_ready')
@@ -140,15 +208,19 @@ class RoomCog(LionCog):
         Restore rented channels.
         """
         async with self.event_lock:
-            # Cancel any running tickers, we will recreate them
-            for task in self._ticker_tasks.values():
-                task.cancel()
+            # Stop any running rent ticks, we will recreate them
+            if self.rent_monitor._monitor_task:
+                self.rent_monitor._monitor_task.cancel()
+            self._rooms.clear()
+            self._room_cache.clear()
+            self.rent_monitor = RentMonitor(batch_executor=self._tick_rooms, batch_size=500)
 
             room_data = await self.data.Room.fetch_where(THIS_SHARD, deleted_at=None)
             await self._prepare_rooms(room_data)
+            self.rent_monitor.start()
 
             logger.info(
-                f"Private Room system initialised with {len(self._ticker_tasks)} running rooms."
+                f"Private Room system initialised with {len(self._rooms)} running rooms."
             )
 
     @LionCog.listener('on_guild_remove')
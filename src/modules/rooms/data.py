@@ -1,3 +1,8 @@
+from itertools import chain
+
+from psycopg import sql
+
+from meta.logger import log_wrap
 from data import Registry, RowModel
 from data.columns import Integer, Timestamp, String
 
@@ -29,6 +34,40 @@ class RoomData(Registry):
         last_tick = Timestamp()
         deleted_at = Timestamp()
 
+        @classmethod
+        @log_wrap(action='deduct_rent')
+        async def deduct_rent(cls, now, *rents: tuple[int, int]) -> list['RoomData.Room']:
+            """
+            Deduct the given `(channelid, rent)` amounts from each (undeleted) room balance,
+            and set the last tick time, in a single statement.
+
+            Returns the updated rooms.
+            """
+            query = sql.SQL(
+                """
+                UPDATE rented_rooms AS room
+                SET
+                    coin_balance = room.coin_balance - rents.rent,
+                    last_tick = %s
+                FROM
+                    (VALUES {})
+                    AS
+                    rents (channelid, rent)
+                WHERE
+                    room.channelid = rents.channelid
+                    AND room.deleted_at IS NULL
+                RETURNING room.*
+                """
+            ).format(
+                sql.SQL(', ').join(
+                    sql.SQL("(%s::BIGINT, %s::INTEGER)") for _ in rents
+                )
+            )
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, (now, *chain(*rents)))
+                    return cls._make_rows(*await cursor.fetchall())
+
     class RoomMember(RowModel):
         """
         Schema
@@ -1,5 +1,4 @@
 from typing import Optional
-import asyncio
 from datetime import timedelta, datetime
 
 import discord
@@ -22,7 +21,7 @@ _p = babel._p
 
 
 class Room:
-    __slots__ = ('bot', 'data', 'lguild', 'members', '_tick_wait')
+    __slots__ = ('bot', 'data', 'lguild', 'members')
 
     tick_length = timedelta(days=1)
     # tick_length = timedelta(hours=1)
@@ -35,9 +34,6 @@ class Room:
 
         log_context.set(f"cid: {self.data.channelid}")
 
-        # State
-        self._tick_wait: Optional[asyncio.Task] = None
-
     @property
     def channel(self) -> Optional[discord.VoiceChannel]:
         """
@@ -259,119 +255,89 @@ class Room:
             except discord.HTTPException:
                 pass
 
-    @log_wrap(action="Room Runloop")
-    async def run(self):
+    @log_wrap(action="Room Expiry")
+    async def expire(self):
         """
-        Tick loop.
+        Notify the owner and the guild event log that the room has expired from lack of rent,
+        and destroy the room.
 
-        Keeps scheduling ticks until expired or cancelled.
-        May be safely cancelled.
+        Rent ticks are run in batches by the RoomCog rent monitor, see `RoomCog._tick_rooms`.
         """
-        if self._tick_wait and not self._tick_wait.done():
-            self._tick_wait.cancel()
-
-        while not self.deleted:
-            now = utc_now()
-            diff = (self.next_tick - now).total_seconds()
-            self._tick_wait = asyncio.create_task(asyncio.sleep(diff))
+        t = self.bot.translator.t
+        ctx_locale.set(self.lguild.config.get('guild_locale').value)
+        if owner := self.bot.get_user(self.data.ownerid):
+            embed = discord.Embed(
+                colour=discord.Colour.red(),
+                title=t(_p(
+                    'room|embed:expiry|title',
+                    "Private Room Expired!"
+                )),
+                description=t(_p(
+                    'room|embed:expiry|description',
+                    "Your private room in **{guild}** has expired!"
+                )).format(guild=self.bot.get_guild(self.data.guildid))
+            )
             try:
-                await self._tick_wait
-                await asyncio.shield(self._tick())
-            except asyncio.CancelledError:
-                break
-            except Exception:
-                logger.exception(
-                    f"Unhandled exception while ticking for room: {self.data!r}"
-                )
+                await owner.send(embed=embed)
+            except discord.HTTPException:
+                pass
+        self.lguild.log_event(
+            title=t(_p(
+                'room|eventlog|event:expired|title',
+                "Private Room Expired"
+            )),
+            description=t(_p(
+                'room|eventlog|event:expired|desc',
+                "{owner}'s private room has expired."
+            )).format(
+                owner="<@{mid}>".format(mid=self.data.ownerid),
+            ),
+            fields=self.eventlog_fields()
+        )
+        await self.destroy(reason='Room Expired')
 
-    @log_wrap(action="Room Tick")
-    async def _tick(self):
+    @log_wrap(action="Room Rent Notify")
+    async def notify_rent(self):
         """
-        Execute the once-per day room tick.
-
-        This deducts the rent amount from the room balance,
-        if the balance is insufficient, expires the room.
-        Posts a status message in the room channel when it does so.
+        Notify the room channel that the daily rent was deducted.
         """
-        t = self.bot.translator.t
         ctx_locale.set(self.lguild.config.get('guild_locale').value)
-        if self.deleted:
-            # Already deleted, nothing to do
-            pass
-        else:
-            # Run tick
-            logger.debug(f"Tick running for room: {self.data!r}")
-
-            # Deduct balance
-            await self.data.update(
-                coin_balance=RoomData.Room.coin_balance - self.rent,
-                last_tick=utc_now()
+        if self.channel:
+            embed = discord.Embed(
+                colour=discord.Colour.orange(),
+                description=self.bot.translator.t(_p(
+                        'room|tick|rent_deducted',
+                        "Daily rent deducted from room balance. New balance: {coin}**{amount}**"
+                    )).format(
+                        coin=self.bot.config.emojis.coin, amount=self.data.coin_balance
+                    )
             )
+            try:
+                await self.channel.send(embed=embed)
+            except discord.HTTPException:
+                pass
 
-            # If balance is negative, expire room, otherwise notify channel
-            if self.data.coin_balance < 0:
-                if owner := self.bot.get_user(self.data.ownerid):
-                    embed = discord.Embed(
-                        colour=discord.Colour.red(),
-                        title=t(_p(
-                            'room|embed:expiry|title',
-                            "Private Room Expired!"
-                        )),
-                        description=t(_p(
-                            'room|embed:expiry|description',
-                            "Your private room in **{guild}** has expired!"
-                        )).format(guild=self.bot.get_guild(self.data.guildid))
-                    )
-                    try:
-                        await owner.send(embed=embed)
-                    except discord.HTTPException:
-                        pass
-                self.lguild.log_event(
-                    title=t(_p(
-                        'room|eventlog|event:expired|title',
-                        "Private Room Expired"
-                    )),
-                    description=t(_p(
-                        'room|eventlog|event:expired|desc',
-                        "{owner}'s private room has expired."
-                    )).format(
-                        owner="<@{mid}>".format(mid=self.data.ownerid),
-                    ),
-                    fields=self.eventlog_fields()
-                )
-                await self.destroy(reason='Room Expired')
-            elif self.channel:
-                # Notify channel
-                embed = discord.Embed(
-                    colour=discord.Colour.orange(),
-                    description=self.bot.translator.t(_p(
-                            'room|tick|rent_deducted',
-                            "Daily rent deducted from room balance. New balance: {coin}**{amount}**"
-                        )).format(
-                            coin=self.bot.config.emojis.coin, amount=self.data.coin_balance
-                        )
-                )
-                try:
-                    await self.channel.send(embed=embed)
-                except discord.HTTPException:
-                    pass
-            else:
-                # No channel means room was deleted
-                # Just cleanup quietly
-                self.lguild.log_event(
-                    title=t(_p(
-                        'room|eventlog|event:room_deleted|title',
-                        "Private Room Deleted"
-                    )),
-                    description=t(_p(
-                        'room|eventlog|event:room_deleted|desc',
-                        "{owner}'s private room was deleted."
-                    )).format(
-                        owner="<@{mid}>".format(mid=self.data.ownerid),
-                    ),
-                    fields=self.eventlog_fields()
-                )
-                await self.destroy(reason='Channel Missing')
+    @log_wrap(action="Room Channel Missing")
+    async def expire_missing(self):
+        """
+        Quietly clean up a room whose channel no longer exists.
+        """
+        t = self.bot.translator.t
+        ctx_locale.set(self.lguild.config.get('guild_locale').value)
+        self.lguild.log_event(
+            title=t(_p(
+                'room|eventlog|event:room_deleted|title',
+                "Private Room Deleted"
+            )),
+            description=t(_p(
+                'room|eventlog|event:room_deleted|desc',
+                "{owner}'s private room was deleted."
+            )).format(
+                owner="<@{mid}>".format(mid=self.data.ownerid),
+            ),
+            fields=self.eventlog_fields()
+        )
+        await self.destroy(reason='Channel Missing')
 
     @log_wrap(action="Destroy Room")
     async def destroy(self, reason: Optional[str] = None):
@@ -381,8 +347,9 @@ class Room:
         Attempts to delete the voice channel and log destruction.
         This is idempotent, so multiple events may trigger destroy.
         """
-        if self._tick_wait:
-            self._tick_wait.cancel()
+        if (cog := self.bot.get_cog('RoomCog')) is not None:
+            # Stop ticking and remove from the running rooms
+            cog._stop(self)
 
         if self.channel:
             try:
@@ -28,8 +28,8 @@ from .data import ScheduleData
 from .settings import ScheduleSettings, ScheduleConfig
 from .ui.scheduleui import ScheduleUI
 from .ui.settingui import ScheduleSettingUI
-from .core import TimeSlot, ScheduledSession, SessionMember
-from .lib import slotid_to_utc, time_to_slotid, format_until
+from .core import TimeSlot, ScheduledSession, SessionMember, AttendanceTracker
+from .lib import slotid_to_utc, time_to_slotid, format_until, WorkQueue
 
 _p, _np = babel._p, babel._np
 
@@ -62,6 +62,12 @@ class ScheduleCog(LionCog):
 
         self.session_channels = self.settings.SessionChannels._cache
 
+        # Recent member attendance, for no-show handling
+        self.attendance = AttendanceTracker(self.data)
+
+        # Shared ratelimited queue for the Discord work of every running slot
+        self.work_queue = WorkQueue(rate=5, per=1, concurrency=5)
+
     async def _monitor(self):
         nowid = self.nowid
         now = None
@@ -95,7 +101,9 @@ class ScheduleCog(LionCog):
                 "Now lock is {now_lock}. "
                 "Active slots {active}."
             )
+        info += " Work queue {queue}."
         data = {
+            'queue': self.work_queue,
             'spawn': self.spawn_task,
             'spawn_lock': self.spawn_lock,
             'active': self.active_slots,
@@ -114,8 +122,8 @@ class ScheduleCog(LionCog):
         self.bot.system_monitor.add_component(self.monitor)
         await self.data.init()
 
-        # Update the session channel cache
-        await self.settings.SessionChannels.setup(self.bot)
+        # Preload the session channel cache on startup
+        await self.bot.core.register_preload_settings(self.settings.SessionChannels)
 
         configcog = self.bot.get_cog('ConfigCog')
         self.crossload_group(self.configure_group, configcog.admin_config_group)
@@ -137,8 +145,7 @@ class ScheduleCog(LionCog):
             for session in slot.sessions.values():
                 if session._updater and not session._updater.done():
                     session._updater.cancel()
-                if session._status_task and not session._status_task.done():
-                    session._status_task.cancel()
+                session.cancel_status_updates()
 
     @LionCog.listener('on_ready')
     @log_wrap(action='Init Schedule')
@@ -160,6 +167,9 @@ class ScheduleCog(LionCog):
         spawn_start += dt.timedelta(seconds=self.bot.shard_id * 10)
         self.spawn_task = asyncio.create_task(self._spawn_loop(start_at=spawn_start))
 
+        # Load recent attendance before any slots can close
+        await self.attendance.load(nowid)
+
         # Cleanup after missed or delayed timeslots
         model = self.data.ScheduleSession
         missed_session_data = await model.fetch_where(
@@ -226,6 +236,7 @@ class ScheduleCog(LionCog):
                 slot_data = await self.data.ScheduleSlot.fetch_or_create(slotid)
                 slot = TimeSlot(self, slot_data)
                 await slot.fetch()
+                await slot.stage()
                 self.active_slots[slotid] = slot
                 self._launch(slot)
                 logger.info(f"Spawned Schedule TimeSlot <slotid: {slotid}>")
@@ -396,8 +407,7 @@ class ScheduleCog(LionCog):
 
         to_blacklist = {}
         if autoblacklisting:
-            # Count number of missed sessions in the last 24h for each member in memberids
-            # who is also in an autoblacklisting guild
+            # Collect the members in memberids who are also in an autoblacklisting guild
             members = {}
             for gid, uid in memberids:
                 if gid in autoblacklisting:
@@ -406,36 +416,33 @@ class ScheduleCog(LionCog):
                     if member:
                         members[(gid, uid)] = member
 
-            if members:
-                missed = await member_model.table.select_where(
-                    member_model.slotid < nowid,
-                    member_model.slotid >= nowid - 24 * 3600,
-                    MEMBERS(*members.keys()),
-                    attended=False,
-                ).select(
-                    guildid=member_model.guildid,
-                    userid=member_model.userid,
-                    missed="COUNT(slotid)"
-                ).group_by(member_model.guildid, member_model.userid).with_no_adapter()
-                for row in missed:
-                    if row['missed'] >= autoblacklisting[row['guildid']][0]:
-                        key = (row['guildid'], row['userid'])
-                        to_blacklist[key] = members[key]
+            # Count number of missed sessions in the last 24h from the attendance record
+            since = nowid - 24 * 3600
+            for key, member in members.items():
+                if self.attendance.missed_since(*key, since) >= autoblacklisting[key[0]][0]:
+                    to_blacklist[key] = member
 
         if to_blacklist:
             # Actually apply blacklist
-            tasks = []
-            for (gid, uid), member in to_blacklist.items():
-                role = autoblacklisting[gid][1]
-                task = asyncio.create_task(member.add_roles(
-                    role,
+            actions = self.bot.core.actions
+            futures = [
+                actions.add_roles(
+                    member,
+                    autoblacklisting[gid][1],
                     reason="Automatic scheduled session blacklist"
-                ))
-                tasks.append(task)
-            # TODO: Logging and some error handling
-            await asyncio.gather(*tasks, return_exceptions=True)
+                )
+                for (gid, uid), member in to_blacklist.items()
+            ]
+            failed = 0
+            async for future in actions.completed(futures):
+                if future.exception() is not None:
+                    failed += 1
+            if failed:
+                logger.warning(
+                    f"Could not apply scheduled session blacklist to {failed} of {len(futures)} missing members."
+                )
             logger.info(
-                f"Applied scheduled session blacklist to {len(to_blacklist)} missing members."
+                f"Applied scheduled session blacklist to {len(futures) - failed} missing members."
             )
 
         # Now cancel future sessions for members who were not blacklisted and are not currently clocked on
@@ -1,3 +1,4 @@
 from .session_member import SessionMember
 from .session import ScheduledSession
 from .timeslot import TimeSlot
+from .attendance import AttendanceTracker
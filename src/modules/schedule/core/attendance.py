@@ -0,0 +1,97 @@
+from collections import defaultdict
+
+from meta.sharding import THIS_SHARD
+from meta.logger import log_wrap
+
+from .. import logger
+from ..data import ScheduleData as Data
+
+
+class AttendanceTracker:
+    """
+    In-memory record of the scheduled sessions recently missed by members on this shard.
+
+    Seeded from data once on initialisation,
+    and thereafter updated incrementally from the attendance computed by each closing TimeSlot.
+    Allows no-show handling (e.g. automatic blacklisting) to count recent misses
+    without querying the session member history on every close.
+    """
+    # Misses older than this (in seconds) are not tracked
+    window = 24 * 3600
+
+    def __init__(self, data: Data):
+        self.data = data
+
+        # (guildid, userid) -> set of missed slotids within the window
+        self._missed: defaultdict[tuple[int, int], set[int]] = defaultdict(set)
+        self._oldest = None
+        self.loaded = False
+
+    def __repr__(self):
+        return (
+            "<AttendanceTracker "
+            f"members={len(self._missed)} "
+            f"loaded={self.loaded}"
+            ">"
+        )
+
+    @log_wrap(action='Load Attendance')
+    async def load(self, nowid: int):
+        """
+        Seed the tracker with the sessions missed in the window before the given slotid.
+        """
+        model = self.data.ScheduleSessionMember
+        rows = await model.table.select_where(
+            model.slotid < nowid,
+            model.slotid >= nowid - self.window,
+            THIS_SHARD,
+            attended=False,
+        ).select('guildid', 'userid', 'slotid').with_no_adapter()
+
+        self._missed.clear()
+        for row in rows:
+            self._missed[(row['guildid'], row['userid'])].add(row['slotid'])
+        self._oldest = nowid - self.window
+        self.loaded = True
+        logger.info(
+            f"Loaded {len(rows)} recently missed scheduled sessions for {len(self._missed)} members."
+        )
+
+    def record(self, slotid: int, attendance):
+        """
+        Record the attendance of a closed slot.
+
+        Takes an iterable of (guildid, userid, attended) tuples.
+        """
+        for guildid, userid, attended in attendance:
+            key = (guildid, userid)
+            if attended:
+                if (missed := self._missed.get(key, None)) is not None:
+                    missed.discard(slotid)
+                    if not missed:
+                        self._missed.pop(key, None)
+            else:
+                self._missed[key].add(slotid)
+        self.prune(slotid - self.window)
+
+    def prune(self, before: int):
+        """
+        Forget misses from slots before the given slotid.
+        """
+        if self._oldest is not None and before <= self._oldest:
+            return
+        self._oldest = before
+        for key in list(self._missed.keys()):
+            missed = self._missed[key]
+            missed.difference_update([slotid for slotid in missed if slotid < before])
+            if not missed:
+                self._missed.pop(key)
+
+    def missed_since(self, guildid: int, userid: int, since: int) -> int:
+        """
+        Count the sessions the given member has missed from the slot `since` onwards.
+        """
+        missed = self._missed.get((guildid, userid), None)
+        if not missed:
+            return 0
+        return sum(1 for slotid in missed if slotid >= since)
@@ -9,6 +9,8 @@ from meta import LionBot
 from meta.logger import log_wrap
 from utils.lib import utc_now
 from utils.lib import MessageArgs
+from utils.actions import ActionPriority
+from babel.translator import ctx_locale
 
 from .. import babel, logger
 from ..data import ScheduleData as Data
@@ -75,12 +77,11 @@ class ScheduledSession:
         self.lock = asyncio.Lock()
 
         self.status_message = None
-        self._hook = None  # Lobby webhook data
+        self._hook_channelid = None  # Channel of the last lobby webhook used
         self._warned_hook = False
 
         self._last_update = None
         self._updater = None
-        self._status_task = None
         self._notify_task = None
 
     def __repr__(self):
@@ -97,7 +98,7 @@ class ScheduledSession:
             f"cancelled={self.cancelled}",
             f"locked={self.lock.locked()}",
             f"status_message={msg.id if (msg := self.status_message) else None}",
-            f"lobby_hook={hook.webhookid if (hook := self._hook) else None}",
+            f"lobby_hook={self._hook_channelid}",
             f"last_update={self._last_update}",
             f"updater_running={True if (self._updater and not self._updater.done()) else False}",
             ">"
@@ -167,44 +168,35 @@ class ScheduledSession:
         """
         channel = self.lobby_channel
         if channel:
-            cid = channel.id
-            if self._hook and self._hook.channelid == cid:
-                hook = self._hook
-            else:
-                hook = self._hook = await self.bot.core.data.LionHook.fetch(cid)
-                if not hook:
-                    # Attempt to create
-                    try:
-                        if channel.permissions_for(channel.guild.me).manage_webhooks:
-                            avatar = self.bot.user.avatar
-                            avatar_data = (await avatar.to_file()).fp.read() if avatar else None
-                            webhook = await channel.create_webhook(
-                                avatar=avatar_data,
-                                name=f"{self.bot.user.name} Scheduled Sessions",
-                                reason="Scheduled Session Lobby"
-                            )
-                            hook = await self.bot.core.data.LionHook.create(
-                                channelid=cid,
-                                token=webhook.token,
-                                webhookid=webhook.id
-                            )
-                        elif channel.permissions_for(channel.guild.me).send_messages and not self._warned_hook:
-                            t = self.bot.translator.t
-                            self._warned_hook = True
-                            await channel.send(
-                                t(_p(
-                                    'session|error:lobby_webhook_perms',
-                                    "Insufficient permissions to create a webhook in this channel. "
-                                    "I require the `MANAGE_WEBHOOKS` permission."
-                                ))
-                            )
-                    except discord.HTTPException:
-                        logger.warning(
-                            "Unexpected Exception occurred while creating scheduled session lobby webhook.",
-                            exc_info=True
+            webhooks = self.bot.core.webhooks
+            hook = await webhooks.get_webhook(channel.id)
+            if not hook:
+                # Attempt to create
+                try:
+                    if channel.permissions_for(channel.guild.me).manage_webhooks:
+                        hook = await webhooks.create_webhook(
+                            channel,
+                            name=f"{self.bot.user.name} Scheduled Sessions",
+                            reason="Scheduled Session Lobby"
                         )
+                    elif channel.permissions_for(channel.guild.me).send_messages and not self._warned_hook:
+                        t = self.bot.translator.t
+                        self._warned_hook = True
+                        await channel.send(
+                            t(_p(
+                                'session|error:lobby_webhook_perms',
+                                "Insufficient permissions to create a webhook in this channel. "
+                                "I require the `MANAGE_WEBHOOKS` permission."
+                            ))
+                        )
+                except discord.HTTPException:
+                    logger.warning(
+                        "Unexpected Exception occurred while creating scheduled session lobby webhook.",
+                        exc_info=True
+                    )
             if hook:
-                return hook.as_webhook(client=self.bot)
+                self._hook_channelid = channel.id
+            return hook
 
     @log_wrap(action='Lobby Send')
     async def send(self, *args, wait=True, **kwargs):
@@ -217,9 +209,9 @@ class ScheduledSession:
                 return await lobby_hook.send(*args, wait=wait, **kwargs)
             except discord.NotFound:
                 # Webhook was deleted under us
-                if self._hook is not None:
-                    await self._hook.delete()
-                    self._hook = None
+                if self._hook_channelid is not None:
+                    await self.bot.core.webhooks.invalidate(self._hook_channelid, lobby_hook.id)
+                    self._hook_channelid = None
             except discord.HTTPException:
                 logger.warning(
                     f"Exception occurred sending to webhooks for scheduled session {self!r}",
@@ -263,7 +255,7 @@ class ScheduledSession:
                     if mobj:
                         overwrites[mobj] = discord.PermissionOverwrite(connect=True, view_channel=True)
                 try:
-                    await room.edit(overwrites=overwrites)
+                    await self.bot.core.actions.edit_channel(room, overwrites=overwrites)
                 except discord.HTTPException:
                     logger.warning(
                         f"Unexpected discord exception received while preparing schedule session room {self!r}",
@@ -318,12 +310,14 @@ class ScheduledSession:
                     if mobj:
                         overwrites[mobj] = discord.PermissionOverwrite(connect=True, view_channel=True)
                 try:
-                    await room.edit(
+                    await self.bot.core.actions.edit_channel(
+                        room,
                         overwrites=overwrites,
                         reason=t(_p(
                             'session|open|update_perms|audit_reason',
                             "Opening configured scheduled session room."
-                        ))
+                        )),
+                        priority=ActionPriority.HIGH
                     )
                 except discord.HTTPException:
                     logger.exception(
@@ -345,7 +339,8 @@ class ScheduledSession:
                         reason=t(_p(
                             'session|open|clean_room|audit_reason',
                             "Removing extra member from scheduled session room."
-                        ))
+                        )),
+                        actions=self.bot.core.actions
                     )
             else:
                 await self.send(
@@ -388,9 +383,11 @@ class ScheduledSession:
 
         # DM alert for _still_ missing members
         missing = [mid for mid, m in self.members.items() if m.total_clock == 0 and m.clock_start is None]
+        locales = await self.bot.get_cog('BabelCog').resolver.resolve_member_locales(self.guildid, *missing)
         for mid in missing:
             member = self.guild.get_member(mid)
             if member:
+                ctx_locale.set(locales[mid])
                 args = await self._notify_dm(member)
                 try:
                     await member.send(**args.send_args)
@@ -637,16 +634,25 @@ class ScheduledSession:
         args = await self.current_status()
 
         message = self.status_message
+        repost = message is None
         if message is None and self.data.messageid is not None:
+            # Edit the previous lobby message through the webhook, without fetching it first
             lobby_hook = await self.get_lobby_hook()
             if lobby_hook:
                 try:
-                    message = await lobby_hook.fetch_message(self.data.messageid)
+                    self.status_message = await self.bot.core.webhooks.edit_message(
+                        lobby_hook, self.data.messageid, **args.edit_args
+                    )
+                    repost = False
+                except discord.NotFound:
+                    pass
                 except discord.HTTPException:
-                    message = None
-
-        repost = message is None
-        if not repost:
+                    # Unexpected issue updating the message
+                    repost = False
+                    logger.exception(
+                        f"Exception occurred updating status for scheduled session {self!r}"
+                    )
+        elif not repost:
             try:
                 await message.edit(**args.edit_args)
                 self.status_message = message
@@ -665,25 +671,42 @@ class ScheduledSession:
             if save:
                 await self.data.update(messageid=message.id if message else None)
 
-    async def _update_status_soon(self, **kwargs):
-        try:
-            if self._last_update is not None:
-                next_update = self._last_update + dt.timedelta(seconds=self.max_update_interval)
-                await discord.utils.sleep_until(next_update)
-            task = asyncio.create_task(self._update_status(**kwargs))
-            await asyncio.shield(task)
-        except asyncio.CancelledError:
-            pass
+    @property
+    def refresh_key(self):
+        """
+        Key identifying the lobby status message with the shared message refresher.
+        """
+        return ('schedule_lobby', self.slotid, self.guildid)
 
     def update_status_soon(self, **kwargs):
-        if self._status_task and not self._status_task.done():
-            self._status_task.cancel()
-        self._status_task = asyncio.create_task(self._update_status_soon(**kwargs))
+        """
+        Request a lobby message update through the shared message refresher.
+
+        Bursts of requests (e.g. from members joining) are coalesced into a single update,
+        made no sooner than `max_update_interval` seconds after the last update.
+        """
+        delay = 0
+        if self._last_update is not None:
+            next_update = self._last_update + dt.timedelta(seconds=self.max_update_interval)
+            delay = max((next_update - utc_now()).total_seconds(), 0)
+        channel = self.lobby_channel
+        self.bot.core.refresher.schedule(
+            self.refresh_key,
+            channel.id if channel else 0,
+            lambda: self._update_status(**kwargs),
+            delay=delay
+        )
+
+    def cancel_status_updates(self):
+        self.bot.core.refresher.cancel(self.refresh_key)
 
     async def update_status(self, **kwargs):
-        if self._status_task and not self._status_task.done():
-            self._status_task.cancel()
-        await self._update_status(**kwargs)
+        channel = self.lobby_channel
+        await self.bot.core.refresher.refresh(
+            self.refresh_key,
+            channel.id if channel else 0,
+            lambda: self._update_status(**kwargs),
+        )
 
     @log_wrap(action='Status Loop')
     async def update_loop(self):
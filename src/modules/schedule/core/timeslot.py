@@ -13,13 +13,12 @@ from core.lion_member import LionMember
 from core.lion_guild import LionGuild
 from tracking.voice.session import SessionState
 from utils.data import as_duration, MEMBERS, TemporaryTable
-from utils.ratelimits import Bucket
 from modules.economy.cog import Economy
 from modules.economy.data import EconomyData, TransactionType
 
 from .. import babel, logger
 from ..data import ScheduleData as Data
-from ..lib import slotid_to_utc, batchrun_per_second, limit_concurrency, vacuum_channel
+from ..lib import slotid_to_utc, vacuum_channel
 from ..settings import ScheduleSettings
 
 from .session import ScheduledSession
@@ -120,6 +119,43 @@ class TimeSlot:
             f"Timeslot {self!r}> finished preloading {len(self.sessions)} guilds. Ready to open."
         )
 
+    @log_wrap(action="Stage sessions")
+    async def stage(self):
+        """
+        Pre-stage the Discord and data state needed to prepare and open the loaded sessions.
+
+        Run well ahead of the slot boundary (typically directly after `fetch`),
+        so that the prepare and open stages do not need to make per-session data requests.
+        Bulk loads the lobby webhooks, and requests member chunking for session guilds
+        which are not chunked, so that room preparation does not need to fetch members individually.
+        """
+        sessions = [session for session in self.sessions.values() if session.can_run]
+        if not sessions:
+            return
+
+        # Bulk load lobby webhooks
+        lobbyids = {
+            channel.id: session for session in sessions
+            if (channel := session.lobby_channel) is not None
+        }
+        if lobbyids:
+            try:
+                await self.bot.core.webhooks.preload(list(lobbyids.keys()))
+            except Exception:
+                # Not fatal, the sessions will fetch their hooks individually
+                logger.exception(
+                    f"Unhandled exception while staging lobby webhooks for timeslot {self!r}"
+                )
+
+        # Request chunking for guilds with members to prepare
+        for session in sessions:
+            if session.members and (guild := session.guild) is not None and not guild.chunked:
+                self.bot.request_chunking_for(guild)
+
+        logger.debug(
+            f"Timeslot {self!r} staged {len(sessions)} sessions with {len(lobbyids)} lobbies."
+        )
+
     @log_wrap(action="Load sessions")
     async def load_sessions(self, session_data) -> dict[int, ScheduledSession]:
         """
@@ -217,7 +253,7 @@ class TimeSlot:
                 # Now write clocks
                 for sg in sessions:
                     for sm in sg.members.values():
-                        sm.clock = clocks[(sm.guildid, sm.userid)]
+                        sm.clocked = clocks[(sm.guildid, sm.userid)]
 
             # Mark current attendance using current voice session
             for session in sessions:
@@ -243,10 +279,9 @@ class TimeSlot:
         """
         logger.debug(f"Running prepare for time slot: {self!r}")
         try:
-            bucket = Bucket(5, 1)
-            coros = [bucket.wrapped(session.prepare(save=False)) for session in sessions if session.can_run]
-            async for task in limit_concurrency(coros, 5):
-                await task
+            await self.cog.work_queue.run(
+                session.prepare(save=False) for session in sessions if session.can_run
+            )
 
             # Save messageids
             tmptable = TemporaryTable(
@@ -292,11 +327,11 @@ class TimeSlot:
             await self._reset_clocks(sessions)
 
             # Bulk update lobby messages
-            message_tasks = [
-                asyncio.create_task(session.update_status(save=False))
+            message_task = asyncio.create_task(self.cog.work_queue.run(
+                session.update_status(save=False)
                 for session in sessions
                 if session.lobby_channel is not None
-            ]
+            ))
             # Trigger notify tasks
             for session in fresh:
                 if session.lobby_channel is not None:
@@ -307,15 +342,12 @@ class TimeSlot:
                 session.start_updating()
 
             # Bulk run guild open to open session rooms
-            bucket = Bucket(5, 1)
-            voice_coros = [
-                bucket.wrapped(session.open_room())
+            await self.cog.work_queue.run(
+                session.open_room()
                 for session in fresh
                 if session.room_channel is not None and session.data.opened_at is None
-            ]
-            async for task in limit_concurrency(voice_coros, 5):
-                await task
-            await asyncio.gather(*message_tasks)
+            )
+            await message_task
 
             # Write opened
             if fresh:
@@ -393,12 +425,11 @@ class TimeSlot:
             }
 
             # Update lobby messages
-            message_tasks = [
-                asyncio.create_task(session.update_status(save=False))
+            await self.cog.work_queue.run(
+                session.update_status(save=False)
                 for session in sessions
                 if session.lobby_channel is not None
-            ]
-            await asyncio.gather(*message_tasks)
+            )
 
             # Save attendance
             if attendance:
@@ -420,6 +451,12 @@ class TimeSlot:
                     reward_transactionid=att_table['_reward']
                 ).from_expr(att_table)
 
+            # Update the in-memory attendance record used for no-show handling
+            self.cog.attendance.record(
+                self.slotid,
+                ((gid, uid, att) for _, gid, uid, att, _ in attendance)
+            )
+
             # Mark guild sessions as closed
             if sessions:
                 await self.data.ScheduleSession.table.update_where(
@@ -452,14 +489,13 @@ class TimeSlot:
         and hence are never cleared unless there is a next session.
         Limitations include not clearing after a manual close.
         """
-        t = self.bot.translator.t
-
+        to_tidy = []
         for session in sessions:
             if not session.guild:
                 # Can no longer access the session guild, nothing to clean up
                 logger.debug(f"Not tidying {session!r} because guild gone.")
                 continue
-            if not (room := session.room_channel):
+            if not session.room_channel:
                 # Session did not have a room to clean up
                 logger.debug(f"Not tidying {session!r} because room channel gone.")
                 continue
@@ -471,42 +507,51 @@ class TimeSlot:
                 # Rely on the active session to set permissions and vacuum channel
                 logger.debug(f"Not tidying {session!r} because guild has active session {active!r}.")
                 continue
-            logger.debug(f"Tidying {session!r}.")
-
-            me = session.guild.me
-            if room.permissions_for(me).manage_roles:
-                overwrites = {
-                    target: overwrite for target, overwrite in room.overwrites.items()
-                    if not isinstance(target, discord.Member)
-                }
-                try:
-                    await room.edit(
-                        overwrites=overwrites,
-                        reason=t(_p(
-                            "session|closing|audit_reason",
-                            "Removing previous scheduled session member permissions."
-                        ))
-                    )
-                except discord.HTTPException:
-                    logger.warning(
-                        f"Unexpected exception occurred while tidying after sessions {session!r}",
-                        exc_info=True
-                    )
-                else:
-                    logger.debug(f"Updated room permissions while tidying {session!r}.")
-            if room.type is discord.enums.ChannelType.category:
-                channels = room.voice_channels
-            else:
-                channels = [room]
-            for channel in channels:
-                await vacuum_channel(
-                    channel,
+            to_tidy.append(session)
+
+        await self.cog.work_queue.run(self._tidy_room(session) for session in to_tidy)
+
+    async def _tidy_room(self, session: ScheduledSession):
+        t = self.bot.translator.t
+        room = session.room_channel
+        logger.debug(f"Tidying {session!r}.")
+
+        me = session.guild.me
+        if room.permissions_for(me).manage_roles:
+            overwrites = {
+                target: overwrite for target, overwrite in room.overwrites.items()
+                if not isinstance(target, discord.Member)
+            }
+            try:
+                await self.bot.core.actions.edit_channel(
+                    room,
+                    overwrites=overwrites,
                     reason=t(_p(
-                        "session|closing|disconnecting|audit_reason",
-                        "Disconnecting previous scheduled session members."
+                        "session|closing|audit_reason",
+                        "Removing previous scheduled session member permissions."
                     ))
                 )
-            logger.debug(f"Finished tidying {session!r}.")
+            except discord.HTTPException:
+                logger.warning(
+                    f"Unexpected exception occurred while tidying after sessions {session!r}",
+                    exc_info=True
+                )
+            else:
+                logger.debug(f"Updated room permissions while tidying {session!r}.")
+        if room.type is discord.enums.ChannelType.category:
+            channels = room.voice_channels
+        else:
+            channels = [room]
+        for channel in channels:
+            await vacuum_channel(
+                channel,
+                reason=t(_p(
+                    "session|closing|disconnecting|audit_reason",
+                    "Disconnecting previous scheduled session members."
+                )),
+                actions=self.bot.core.actions
+            )
+        logger.debug(f"Finished tidying {session!r}.")
 
     def launch(self) -> asyncio.Task:
         self.run_task = asyncio.create_task(self.run(), name=f"TimeSlot {self.slotid}")
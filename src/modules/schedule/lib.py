@@ -7,6 +7,7 @@ import discord
 
 from meta.logger import log_wrap
 from utils.ratelimits import Bucket
+from utils.actions import ActionExecutor
 from . import logger, babel
 
 _p, _np = babel._p, babel._np
@@ -79,6 +80,95 @@ async def limit_concurrency(aws, limit):
     logger.debug(f"Completed {count} tasks")
 
 
+class WorkQueue:
+    """
+    Shared ratelimited executor for Discord API work.
+
+    Unlike `batchrun_per_second` and `limit_concurrency`, which limit a single batch,
+    the WorkQueue limits are shared across every batch submitted to it.
+    So overlapping slot stages (e.g. tidying the previous slot while opening the next)
+    are spread over the same request budget instead of stacking their bursts.
+
+    The room and member operations within each item (permission edits, vacuums, blacklist roles)
+    are queued individually through the core `ActionExecutor`,
+    so they share the guild request budget with the other guild actions.
+    """
+    def __init__(self, rate: int = 5, per: int = 1, concurrency: int = 5):
+        self.bucket = Bucket(rate, per)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.queued = 0
+        self.running = 0
+
+    def __repr__(self):
+        return (
+            "<WorkQueue "
+            f"queued={self.queued} "
+            f"running={self.running} "
+            f"bucket={self.bucket}"
+            ">"
+        )
+
+    async def _execute(self, awaitable):
+        try:
+            return await awaitable
+        finally:
+            self.running -= 1
+            self.semaphore.release()
+
+    @staticmethod
+    def _describe(awaitable) -> str:
+        """
+        Describe a queued awaitable for logging, including its bound object (e.g. the session) if available.
+        """
+        name = getattr(awaitable, '__qualname__', None) or repr(awaitable)
+        frame = getattr(awaitable, 'cr_frame', None)
+        if frame is not None and (obj := frame.f_locals.get('self', None)) is not None:
+            return f"{name} of {obj!r}"
+        return name
+
+    async def run(self, awaitables) -> list:
+        """
+        Run the provided awaitables through the queue, in the order given.
+
+        Exceptions raised by the awaitables are logged here, so that batch failures are not lost.
+        Returns list of returned results or exceptions.
+        """
+        awaitables = list(awaitables)
+        self.queued += len(awaitables)
+        tasks = []
+        descriptions = []
+        try:
+            for awaitable in awaitables:
+                await self.semaphore.acquire()
+                try:
+                    await self.bucket.wait()
+                    self.bucket.request()
+                except BaseException:
+                    self.semaphore.release()
+                    raise
+                self.queued -= 1
+                self.running += 1
+                descriptions.append(self._describe(awaitable))
+                tasks.append(asyncio.create_task(self._execute(awaitable)))
+        except BaseException:
+            # Close any awaitables we did not get to, and abandon the remaining queue slots
+            for awaitable in awaitables[len(tasks):]:
+                if asyncio.iscoroutine(awaitable):
+                    awaitable.close()
+            self.queued -= len(awaitables) - len(tasks)
+            for task in tasks:
+                task.cancel()
+            raise
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        for description, result in zip(descriptions, results):
+            if isinstance(result, Exception):
+                logger.error(
+                    f"Unhandled exception in queued work: {description}",
+                    exc_info=result
+                )
+        return results
+
+
 def format_until(t, distance):
     if distance:
         return t(_np(
@@ -95,9 +185,14 @@ def format_until(t, distance):
 
 
 @log_wrap(action='Vacuum Channel')
-async def vacuum_channel(channel: discord.VoiceChannel, reason: Optional[str] = None):
+async def vacuum_channel(channel: discord.VoiceChannel, reason: Optional[str] = None,
+                         actions: Optional[ActionExecutor] = None):
     """
     Launch disconnect tasks for each voice channel member who does not have permission to connect.
+
+    If an `ActionExecutor` is provided, the disconnections are queued through it instead,
+    and the action futures are returned without waiting for them.
+    This allows vacuuming from within an action on the same guild queue.
     """
     me = channel.guild.me
     if not channel.permissions_for(me).move_members:
@@ -105,6 +200,12 @@ async def vacuum_channel(channel: discord.VoiceChannel, reason: Optional[str] =
         return
 
     to_remove = [member for member in channel.members if not channel.permissions_for(member).connect]
+    if actions is not None:
+        return [
+            actions.move_member(member, None, reason=reason, only_from=channel)
+            for member in to_remove
+        ]
+
     for member in to_remove:
         # Disconnect member from voice
         # Extra check here since members may come and go while we are trying to remove
@@ -1,7 +1,6 @@
-from collections import defaultdict
 import discord
 
-from settings import ModelData, ListData
+from settings import ModelData, ListData, SettingCache
 from settings.groups import SettingGroup, ModelConfig, SettingDotDict
 from settings.setting_types import (
     ChannelSetting, IntegerSetting, ChannelListSetting, RoleSetting
@@ -9,13 +8,11 @@ from settings.setting_types import (
 from core.setting_types import CoinSetting
 from meta import conf
 from meta.errors import UserInputError
-from meta.sharding import THIS_SHARD
-from meta.logger import log_wrap
 from wards import low_management_iward, high_management_iward
 
 from babel.translator import ctx_translator
 
-from . import babel, logger
+from . import babel
 from .data import ScheduleData
 
 _p = babel._p
@@ -191,7 +188,7 @@ class ScheduleSettings(SettingGroup):
         _data_column = 'channelid'
         _order_column = 'channelid'
 
-        _cache = {}
+        _cache = SettingCache()
 
         @property
         def update_message(self):
@@ -220,25 +217,6 @@ class ScheduleSettings(SettingGroup):
                 formatted = super()._format_data(parent_id, data, **kwargs)
             return formatted
 
-        @classmethod
-        @log_wrap(action='Cache Schedule Channels')
-        async def setup(cls, bot):
-            """
-            Pre-load schedule channels for every guild on the current shard.
-            This includes guilds which the client cannot see.
-            """
-            data = bot.db.registries['ScheduleData']
-
-            rows = await data.schedule_channels.select_where(THIS_SHARD)
-            new_cache = defaultdict(list)
-            count = 0
-            for row in rows:
-                new_cache[row['guildid']].append(row['channelid'])
-                count += 1
-            cls._cache.clear()
-            cls._cache.update(new_cache)
-            logger.info(f"Loaded {count} schedule session channels on this shard.")
-
     @ScheduleConfig.register_model_setting
     class ScheduleCost(ModelData, CoinSetting):
         setting_id = 'schedule_cost'
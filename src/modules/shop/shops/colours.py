@@ -13,6 +13,7 @@ from meta import LionCog, LionContext, LionBot
 from meta.errors import SafeCancellation
 from meta.logger import log_wrap
 from utils.lib import error_embed, MessageArgs
+from utils.actions import ActionPriority
 from constants import MAX_COINS
 from wards import equippable_role
 
@@ -877,13 +878,20 @@ class ColourShopping(ShopCog):
         refunded = []
 
         async def delete_roles():
-            for role in roles:
-                try:
-                    await role.delete(reason="Clearing colour role shop")
-                    deleted.append(role)
-                except discord.HTTPException:
-                    delete_failed.append(role)
-                await asyncio.sleep(0.2)
+            actions = self.bot.core.actions
+            futures = {
+                actions.submit(
+                    ctx.guild.id, ('delete_role', role.id),
+                    lambda role=role: role.delete(reason="Clearing colour role shop"),
+                    priority=ActionPriority.LOW
+                ): role
+                for role in roles
+            }
+            async for future in actions.completed(futures):
+                if future.exception() is None:
+                    deleted.append(futures[future])
+                else:
+                    delete_failed.append(futures[future])
 
         async def refund_members():
             """
@@ -1,9 +1,11 @@
 from typing import Optional, TYPE_CHECKING
 import asyncio
+import bisect
 import datetime as dt
 
 import pytz
 import discord
+from cachetools import TTLCache
 
 from data import ORDER, NULL
 from meta import conf, LionBot
@@ -61,6 +63,106 @@ def progress_bar(value, minimum, maximum, width=10) -> str:
     return ''.join(bar)
 
 
+class AchievementSnapshot:
+    """
+    Snapshot of the member data required to compute all achievements.
+
+    Loaded in a handful of concurrent queries,
+    so that every achievement may be evaluated against the same data.
+    """
+    __slots__ = (
+        'guildid', 'userid',
+        'today', 'now', 'month_start', 'utcoffset',
+        'periods',
+        'workouts', 'votes', 'tasks_completed', 'sessions_attended',
+    )
+
+    def __init__(self, guildid: int, userid: int):
+        self.guildid = guildid
+        self.userid = userid
+
+        # Member time data
+        self.today: dt.datetime
+        self.now: dt.datetime
+        self.month_start: dt.datetime
+        self.utcoffset: int
+
+        # Voice history as a list of (start_time, end_time, duration), ordered by start_time descending
+        self.periods: list[tuple[dt.datetime, dt.datetime, int]] = []
+
+        # Record counts, None if the count is unavailable
+        self.workouts: int = 0
+        self.votes: int = 0
+        self.tasks_completed: Optional[int] = None
+        self.sessions_attended: Optional[int] = None
+
+    @classmethod
+    @log_wrap(action='Load Achievement Snapshot')
+    async def load(cls, bot: LionBot, guildid: int, userid: int) -> 'AchievementSnapshot':
+        self = cls(guildid, userid)
+        stats: 'StatsCog' = bot.get_cog('StatsCog')
+
+        queries = {}
+        queries['lion'] = bot.core.lions.fetch_member(guildid, userid)
+        queries['history'] = stats.data.VoiceSessionStats.table.select_where(
+            guildid=guildid, userid=userid
+        ).select(
+            'start_time', 'end_time', 'duration'
+        ).order_by('start_time', ORDER.DESC).with_no_adapter()
+        queries['workouts'] = bot.core.data.workouts.select_one_where(
+            guildid=guildid, userid=userid
+        ).select(total='COUNT(*)')
+        queries['votes'] = bot.core.data.topgg.select_one_where(
+            userid=userid
+        ).select(total='COUNT(*)')
+        if (tasklist := bot.get_cog('TasklistCog')) is not None:
+            queries['tasks'] = tasklist.data.Task.table.select_one_where(
+                tasklist.data.Task.completed_at != NULL,
+                userid=userid,
+            ).select(total='COUNT(*)')
+        if (schedule := bot.get_cog('ScheduleCog')) is not None:
+            queries['scheduled'] = schedule.data.ScheduleSessionMember.table.select_one_where(
+                userid=userid, guildid=guildid, attended=True
+            ).select(total='COUNT(*)')
+
+        results = dict(zip(queries.keys(), await asyncio.gather(*queries.values())))
+
+        lion = results['lion']
+        self.today = lion.today
+        self.now = lion.now
+        self.month_start = lion.month_start
+        self.utcoffset = int(lion.today.utcoffset().total_seconds())
+
+        self.periods = [
+            (row['start_time'], row['end_time'], row['duration'] or 0) for row in results['history']
+        ]
+        self.workouts = int(results['workouts']['total'] or 0)
+        self.votes = int(results['votes']['total'] or 0)
+        if 'tasks' in results:
+            self.tasks_completed = int(results['tasks']['total'] or 0)
+        if 'scheduled' in results:
+            self.sessions_attended = int(results['scheduled']['total'] or 0)
+        return self
+
+    def voice_between(self, *points: dt.datetime) -> list[int]:
+        """
+        Compute the voice time in seconds between each of the given (increasing) points.
+
+        Equivalent to `VoiceSessionStats.study_times_between`, computed on the snapshot.
+        """
+        starts = [point.timestamp() for point in points]
+        times = [0] * (len(points) - 1)
+        for start_time, end_time, _ in self.periods:
+            start, end = start_time.timestamp(), end_time.timestamp()
+            i = max(bisect.bisect_right(starts, start) - 1, 0)
+            while i < len(times) and starts[i] < end:
+                overlap = min(end, starts[i + 1]) - max(start, starts[i])
+                if overlap > 0:
+                    times[i] += overlap
+                i += 1
+        return [int(time) for time in times]
+
+
 class Achievement:
     """
     ABC for a member achievement.
@@ -133,10 +235,12 @@ class Achievement:
         )
         return (name, value)
 
-    async def update(self):
-        self.value = await self._calculate()
+    async def update(self, snapshot: Optional[AchievementSnapshot] = None):
+        if snapshot is None:
+            snapshot = await AchievementSnapshot.load(self.bot, self.guildid, self.userid)
+        self.value = self._calculate(snapshot)
 
-    async def _calculate(self) -> int:
+    def _calculate(self, snapshot: AchievementSnapshot) -> int:
         raise NotImplementedError
 
 
@@ -153,15 +257,11 @@ class Workout(Achievement):
     threshold = 50
     emoji_index = 3
 
-    @log_wrap(action='Calc Workout')
-    async def _calculate(self):
+    def _calculate(self, snapshot: AchievementSnapshot):
         """
         Count the number of completed workout sessions this user has.
         """
-        record = await self.bot.core.data.workouts.select_one_where(
-            guildid=self.guildid, userid=self.userid
-        ).select(total='COUNT(*)')
-        return int(record['total'] or 0)
+        return snapshot.workouts
 
 
 class VoiceHours(Achievement):
@@ -177,17 +277,11 @@ class VoiceHours(Achievement):
     threshold = 1000
     emoji_index = 0
 
-    @log_wrap(action='Calc VoiceHours')
-    async def _calculate(self):
+    def _calculate(self, snapshot: AchievementSnapshot):
         """
         Returns the total number of hours this member has spent in voice.
         """
-        stats: 'StatsCog' = self.bot.get_cog('StatsCog')
-        records = await stats.data.VoiceSessionStats.table.select_where(
-            guildid=self.guildid, userid=self.userid
-        ).select(total='SUM(duration) / 3600').with_no_adapter()
-        hours = records[0]['total'] if records else 0
-        return int(hours or 0)
+        return int(sum(duration for _, _, duration in snapshot.periods) // 3600)
 
 
 class VoiceStreak(Achievement):
@@ -203,29 +297,17 @@ class VoiceStreak(Achievement):
     threshold = 100
     emoji_index = 1
 
-    @log_wrap(action='Calc VoiceStreak')
-    async def _calculate(self):
-        stats: 'StatsCog' = self.bot.get_cog('StatsCog')
-
-        # TODO: make this more efficient by calc in database..
-        history = await stats.data.VoiceSessionStats.table.select_where(
-            guildid=self.guildid, userid=self.userid
-        ).select(
-            'start_time', 'end_time'
-        ).order_by('start_time', ORDER.DESC).with_no_adapter()
-
-        lion = await self.bot.core.lions.fetch_member(self.guildid, self.userid)
-
+    def _calculate(self, snapshot: AchievementSnapshot):
         # Streak statistics
         streak = 0
         max_streak = 0
         current_streak = None
 
         day_attended = None
-        date = lion.today
+        date = snapshot.today
         daydiff = dt.timedelta(days=1)
 
-        periods = [(row['start_time'], row['end_time']) for row in history]
+        periods = [(start_time, end_time) for start_time, end_time, _ in snapshot.periods]
 
         i = 0
         while i < len(periods):
@@ -290,12 +372,8 @@ class Voting(Achievement):
     threshold = 100
     emoji_index = 6
 
-    @log_wrap(action='Calc Voting')
-    async def _calculate(self):
-        record = await self.bot.core.data.topgg.select_one_where(
-            userid=self.userid
-        ).select(total='COUNT(*)')
-        return int(record['total'] or 0)
+    def _calculate(self, snapshot: AchievementSnapshot):
+        return snapshot.votes
 
 
 class VoiceDays(Achievement):
@@ -311,20 +389,12 @@ class VoiceDays(Achievement):
     threshold = 90
     emoji_index = 2
 
-    @log_wrap(action='Calc VoiceDays')
-    async def _calculate(self):
-        stats: 'StatsCog' = self.bot.get_cog('StatsCog')
-
-        lion = await self.bot.core.lions.fetch_member(self.guildid, self.userid)
-        offset = int(lion.today.utcoffset().total_seconds())
-
-        records = await stats.data.VoiceSessionStats.table.select_where(
-            guildid=self.guildid, userid=self.userid
-        ).select(
-            total="COUNT(DISTINCT(date_trunc('day', (start_time AT TIME ZONE 'utc') + interval '{} seconds')))".format(offset)
-        ).with_no_adapter()
-        days = records[0]['total'] if records else 0
-        return int(days or 0)
+    def _calculate(self, snapshot: AchievementSnapshot):
+        offset = snapshot.utcoffset
+        days = {
+            int(start_time.timestamp() + offset) // 86400 for start_time, _, _ in snapshot.periods
+        }
+        return len(days)
 
 
 class TasksComplete(Achievement):
@@ -340,21 +410,10 @@ class TasksComplete(Achievement):
     threshold = 1000
     emoji_index = 7
 
-    @log_wrap(action='Calc TasksComplete')
-    async def _calculate(self):
-        cog = self.bot.get_cog('TasklistCog')
-        if cog is None:
+    def _calculate(self, snapshot: AchievementSnapshot):
+        if snapshot.tasks_completed is None:
             raise ValueError("Cannot calc TasksComplete without Tasklist Cog")
-
-        records = await cog.data.Task.table.select_where(
-            cog.data.Task.completed_at != NULL,
-            userid=self.userid,
-        ).select(
-            total="COUNT(*)"
-        ).with_no_adapter()
-
-        completed = records[0]['total'] if records else 0
-        return int(completed or 0)
+        return snapshot.tasks_completed
 
 
 class ScheduledSessions(Achievement):
@@ -370,20 +429,10 @@ class ScheduledSessions(Achievement):
     threshold = 500
     emoji_index = 4
 
-    @log_wrap(action='Calc ScheduledSessions')
-    async def _calculate(self):
-        cog = self.bot.get_cog('ScheduleCog')
-        if not cog:
+    def _calculate(self, snapshot: AchievementSnapshot):
+        if snapshot.sessions_attended is None:
             raise ValueError("Cannot calc scheduled sessions without ScheduleCog.")
-
-        model = cog.data.ScheduleSessionMember
-        records = await model.table.select_where(
-            userid=self.userid, guildid=self.guildid, attended=True
-        ).select(
-            total='COUNT(*)'
-        ).with_no_adapter()
-
-        return int((records[0]['total'] or 0) if records else 0)
+        return snapshot.sessions_attended
 
 
 class MonthlyHours(Achievement):
@@ -399,24 +448,13 @@ class MonthlyHours(Achievement):
     threshold = 100
     emoji_index = 5
 
-    @log_wrap(action='Calc MonthlyHours')
-    async def _calculate(self):
-        stats: 'StatsCog' = self.bot.get_cog('StatsCog')
-
-        lion = await self.bot.core.lions.fetch_member(self.guildid, self.userid)
-
-        records = await stats.data.VoiceSessionStats.table.select_where(
-            userid=self.userid,
-            guildid=self.guildid,
-        ).select(
-            _first='MIN(start_time)'
-        ).with_no_adapter()
-        first_session = records[0]['_first'] if records else None
-        if not first_session:
+    def _calculate(self, snapshot: AchievementSnapshot):
+        if not snapshot.periods:
             return 0
+        first_session = snapshot.periods[-1][0]
 
         # Build the list of month start timestamps
-        month_start = lion.month_start
+        month_start = snapshot.month_start
         months = [month_start.astimezone(pytz.utc)]
 
         while month_start >= first_session:
@@ -424,10 +462,8 @@ class MonthlyHours(Achievement):
             month_start = month_start.replace(day=1)
             months.append(month_start.astimezone(pytz.utc))
 
-        # Query the study times
-        times = await stats.data.VoiceSessionStats.study_times_between(
-            self.guildid, self.userid, *reversed(months), lion.now
-        )
+        # Compute the study times
+        times = snapshot.voice_between(*reversed(months), snapshot.now)
         max_time = max(times) // 3600
         return max_time if max_time >= self.threshold else times[-1] // 3600
 
@@ -445,16 +481,65 @@ achievements = [
 achievements.sort(key=lambda cls: cls.emoji_index)
 
 
+class AchievementEngine:
+    """
+    Computes member achievements from a shared data snapshot.
+
+    Computed achievements are cached per member,
+    and invalidated when the underlying data changes (e.g. on session completion).
+    The cache entries also expire, since ongoing sessions continuously change the voice statistics.
+    """
+    def __init__(self, bot: LionBot):
+        self.bot = bot
+
+        # (guildid, userid) -> computed achievements
+        self._cache: TTLCache[tuple[int, int], list[Achievement]] = TTLCache(1000, ttl=60*5)
+
+    @log_wrap(action='Compute Achievements')
+    async def compute(self, guildid: int, userid: int) -> list[Achievement]:
+        """
+        Compute achievements for the given member, bypassing the cache.
+        """
+        snapshot = await AchievementSnapshot.load(self.bot, guildid, userid)
+        member_achieved = [
+            ach(self.bot, guildid, userid) for ach in achievements
+        ]
+        for ach in member_achieved:
+            await ach.update(snapshot)
+        return member_achieved
+
+    async def fetch(self, guildid: int, userid: int) -> list[Achievement]:
+        """
+        Fetch achievements for the given member, using the cache where possible.
+        """
+        key = (guildid, userid)
+        if (cached := self._cache.get(key, None)) is None:
+            cached = self._cache[key] = await self.compute(guildid, userid)
+        return cached
+
+    def invalidate(self, guildid: int, userid: int):
+        """
+        Invalidate the cached achievements of the given member.
+        """
+        self._cache.pop((guildid, userid), None)
+
+    def invalidate_user(self, userid: int):
+        """
+        Invalidate the cached achievements of the given user in every guild.
+        """
+        for key in [key for key in self._cache.keys() if key[1] == userid]:
+            self._cache.pop(key, None)
+
+
 @log_wrap(action='Get Achievements')
 async def get_achievements_for(bot: LionBot, guildid: int, userid: int):
     """
     Asynchronously fetch achievements for the given member.
+
+    Uses the StatsCog achievement engine cache where possible.
     """
-    member_achieved = [
-        ach(bot, guildid, userid) for ach in achievements
-    ]
-    update_tasks = [
-        asyncio.create_task(ach.update()) for ach in member_achieved
-    ]
-    await asyncio.gather(*update_tasks)
-    return member_achieved
+    cog: Optional['StatsCog'] = bot.get_cog('StatsCog')
+    if cog is not None:
+        return await cog.achievements.fetch(guildid, userid)
+    else:
+        return await AchievementEngine(bot).compute(guildid, userid)
@@ -19,7 +19,7 @@ from .data import StatsData
 from .ui import ProfileUI, WeeklyMonthlyUI, LeaderboardUI
 from .settings import StatisticsSettings, StatisticsConfigUI
 from .graphics.profilestats import get_full_profile
-from .achievements import get_achievements_for
+from .achievements import get_achievements_for, AchievementEngine
 
 _p = babel._p
 
@@ -32,6 +32,7 @@ class StatsCog(LionCog):
         self.bot = bot
         self.data = bot.db.load_registry(StatsData())
         self.settings = StatisticsSettings()
+        self.achievements = AchievementEngine(bot)
 
     async def cog_load(self):
         await self.data.init()
@@ -39,10 +40,23 @@ class StatsCog(LionCog):
         self.bot.core.user_config.register_model_setting(self.settings.UserGlobalStats)
         self.bot.core.guild_config.register_model_setting(self.settings.SeasonStart)
         self.bot.core.guild_config.register_setting(self.settings.UnrankedRoles)
+        await self.bot.core.register_preload_settings(
+            self.settings.UnrankedRoles,
+            self.settings.VisibleStats,
+        )
 
         configcog = self.bot.get_cog('ConfigCog')
         self.crossload_group(self.configure_group, configcog.admin_config_group)
 
+    # ----- Event Handlers -----
+    @LionCog.listener('on_voice_session_end')
+    async def _invalidate_session_achievements(self, session_data, ended_at):
+        self.achievements.invalidate(session_data.guildid, session_data.userid)
+
+    @LionCog.listener('on_tasks_completed')
+    async def _invalidate_task_achievements(self, member: discord.Member, *taskids: int):
+        self.achievements.invalidate_user(member.id)
+
     @cmds.hybrid_command(
         name=_p('cmd:me', "me"),
         description=_p(
@@ -153,6 +153,70 @@ class StatsData(Registry):
                     )
                     return [r['stime'] or 0 for r in await cursor.fetchall()]
 
+        @classmethod
+        @log_wrap(action='period_stats')
+        async def period_stats(cls, guildid: Optional[int], userid: int, *points, sessions_since=None):
+            """
+            Fetch the study time between each of the given points,
+            along with the (start, end) timestamps of each session starting after `sessions_since`,
+            by default the first point.
+
+            Both are computed in a single round trip.
+            If `guildid` is None, computes statistics across all guilds.
+            """
+            if len(points) < 2:
+                raise ValueError('Not enough block points given!')
+
+            blocks = zip(points, points[1:])
+            query = sql.SQL(
+                """
+                SELECT
+                    periods.stimes,
+                    sessions.starts,
+                    sessions.durations
+                FROM
+                    (
+                        SELECT
+                            array_agg(study_time_between(%s, %s, t._start, t._end) ORDER BY t._start) AS stimes
+                        FROM
+                            (VALUES {})
+                            AS
+                            t (_start, _end)
+                    ) AS periods,
+                    (
+                        SELECT
+                            array_agg(s.start_time ORDER BY s.start_time) AS starts,
+                            array_agg(s.duration ORDER BY s.start_time) AS durations
+                        FROM voice_sessions_combined s
+                        WHERE
+                            s.userid = %s
+                            AND (%s::BIGINT IS NULL OR s.guildid = %s)
+                            AND s.start_time >= %s
+                    ) AS sessions
+                """
+            ).format(
+                sql.SQL(', ').join(
+                    sql.SQL("({}, {})").format(sql.Placeholder(), sql.Placeholder()) for _ in points[1:]
+                )
+            )
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        query,
+                        tuple(chain(
+                            (guildid, userid),
+                            *blocks,
+                            (userid, guildid, guildid, sessions_since or points[0])
+                        ))
+                    )
+                    row = await cursor.fetchone()
+            stats = [stime or 0 for stime in row['stimes']]
+            sessions = [
+                (int(start.timestamp()), int(start.timestamp() + int(duration)))
+                for start, duration in zip(row['starts'] or (), row['durations'] or ())
+            ]
+            return stats, sessions
+
         @classmethod
         @log_wrap(action='study_time_since')
         async def study_time_since(cls, guildid: int, userid: int, _start) -> int:
@@ -516,6 +580,149 @@ class StatsData(Registry):
                     )
                     return [r['period_xp'] or 0 for r in await cursor.fetchall()]
 
+    class SeasonStats(RowModel):
+        """
+        Materialised per-member statistic totals for the current guild season.
+
+        Rows are maintained incrementally by database triggers on completed voice sessions,
+        member experience, and text sessions, counting activity since the guild `season_start`
+        (or all-time activity if no season is set).
+        Must be rebuilt with `reset_guild` whenever the guild `season_start` changes.
+
+        Note that `voice_stats` does not include ongoing sessions,
+        these are added by `leaderboard` and `member_stat`.
+
+        Schema
+        ------
+        CREATE TABLE season_stats(
+          guildid BIGINT NOT NULL,
+          userid BIGINT NOT NULL,
+          voice_stats INTEGER NOT NULL DEFAULT 0,
+          xp_stats INTEGER NOT NULL DEFAULT 0,
+          message_stats INTEGER NOT NULL DEFAULT 0,
+          season_start TIMESTAMPTZ,
+          updated_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+          PRIMARY KEY (guildid, userid),
+          FOREIGN KEY (guildid, userid) REFERENCES members (guildid, userid) ON DELETE CASCADE
+        );
+        """
+        _tablename_ = 'season_stats'
+
+        guildid = Integer(primary=True)
+        userid = Integer(primary=True)
+        voice_stats = Integer()
+        xp_stats = Integer()
+        message_stats = Integer()
+        season_start = Timestamp()
+        updated_at = Timestamp()
+
+        _stat_columns = ('voice_stats', 'xp_stats', 'message_stats')
+
+        # Ongoing voice time in the current season, per member in the given guild
+        _ongoing_query = sql.SQL(
+            """
+            SELECT
+                o.userid,
+                EXTRACT(EPOCH FROM (NOW() - GREATEST(o.start_time, COALESCE(g.season_start, o.start_time))))
+                    AS stat
+            FROM voice_sessions_ongoing o
+            JOIN guild_config g USING (guildid)
+            WHERE o.guildid = %s
+            """
+        )
+
+        @classmethod
+        @log_wrap(action='season_leaderboard')
+        async def leaderboard(cls, guildid: int, stat: str) -> list[tuple[int, int]]:
+            """
+            Return the season totals of the given stat column for each member in the guild.
+
+            Voice totals include ongoing sessions.
+            """
+            if stat not in cls._stat_columns:
+                raise ValueError(f"Unknown season statistic {stat!r}")
+
+            if stat == 'voice_stats':
+                query = sql.SQL(
+                    """
+                    SELECT userid, SUM(stat) AS total_stat
+                    FROM (
+                        SELECT userid, voice_stats AS stat FROM season_stats WHERE guildid = %s
+                        UNION ALL
+                        {}
+                    ) AS season_totals
+                    GROUP BY userid
+                    HAVING SUM(stat) > 0
+                    ORDER BY total_stat DESC
+                    """
+                ).format(cls._ongoing_query)
+                args = (guildid, guildid)
+            else:
+                query = sql.SQL(
+                    """
+                    SELECT userid, {stat} AS total_stat
+                    FROM season_stats
+                    WHERE guildid = %s AND {stat} != 0
+                    ORDER BY total_stat DESC
+                    """
+                ).format(stat=sql.Identifier(stat))
+                args = (guildid,)
+
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, args)
+                    leaderboard = [
+                        (row['userid'], int(row['total_stat']))
+                        for row in await cursor.fetchall()
+                    ]
+            return leaderboard
+
+        @classmethod
+        @log_wrap(action='season_member_stat')
+        async def member_stat(cls, guildid: int, userid: int, stat: str) -> int:
+            """
+            Return the season total of the given stat column for a single member.
+
+            Voice totals include the ongoing session, if any.
+            """
+            if stat not in cls._stat_columns:
+                raise ValueError(f"Unknown season statistic {stat!r}")
+
+            query = sql.SQL(
+                "SELECT {stat} AS stat FROM season_stats WHERE guildid = %s AND userid = %s"
+            ).format(stat=sql.Identifier(stat))
+            args = (guildid, userid)
+            if stat == 'voice_stats':
+                query = sql.SQL(
+                    """
+                    SELECT SUM(stat) AS stat FROM (
+                        SELECT userid, voice_stats AS stat FROM season_stats WHERE guildid = %s AND userid = %s
+                        UNION ALL
+                        SELECT * FROM ({}) AS ongoing WHERE userid = %s
+                    ) AS season_totals
+                    """
+                ).format(cls._ongoing_query)
+                args = (guildid, userid, guildid, userid)
+
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(query, args)
+                    row = await cursor.fetchone()
+            return int(row['stat'] or 0) if row else 0
+
+        @classmethod
+        @log_wrap(action='reset_season_stats')
+        async def reset_guild(cls, guildid: int):
+            """
+            Recompute the season totals for the given guild from the current `season_start`.
+            """
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        sql.SQL("SELECT rebuild_season_stats(%s)"),
+                        (guildid,)
+                    )
+
     class ProfileTag(RowModel):
         """
         Schema
@@ -1,6 +1,7 @@
 from typing import Optional
 from datetime import timedelta
 import calendar
+import asyncio
 
 from data import ORDER
 from meta import LionBot
@@ -9,7 +10,7 @@ from gui.base import CardMode
 from tracking.text.data import TextTrackerData
 
 from ..data import StatsData
-from ..lib import apply_month_offset
+from ..lib import apply_month_offset, fetch_card_user
 from .. import logger
 
 
@@ -18,10 +19,8 @@ async def get_monthly_card(bot: LionBot, userid: int, guildid: int, offset: int,
 
     if guildid:
         lion = await bot.core.lions.fetch_member(guildid, userid)
-        user = await lion.fetch_member()
     else:
         lion = await bot.core.lions.fetch_user(userid)
-        user = await bot.fetch_user(userid)
     today = lion.today
     month_start = today.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
     target = apply_month_offset(month_start, offset)
@@ -36,23 +35,11 @@ async def get_monthly_card(bot: LionBot, userid: int, guildid: int, offset: int,
         [0]*(calendar.monthrange(month.year, month.month)[1]) for month in months
     ]
 
-    if mode is CardMode.VOICE:
-        model = data.VoiceSessionStats
-        req = model.study_times_between
-        reqkey = (guildid or None, userid,)
-    elif mode is CardMode.TEXT:
+    if mode is CardMode.TEXT:
         model = TextTrackerData.TextSessions
-        if guildid:
-            req = model.member_messages_between
-            reqkey = (guildid, userid,)
-        else:
-            req = model.user_messages_between
-            reqkey = (userid,)
     else:
         # TODO: ANKI
         model = data.VoiceSessionStats
-        req = model.study_times_between
-        reqkey = (guildid or None, userid,)
 
     # Get first session
     query = model.table.select_where().order_by('start_time', ORDER.ASC).limit(1)
@@ -60,7 +47,15 @@ async def get_monthly_card(bot: LionBot, userid: int, guildid: int, offset: int,
         query = query.where(userid=userid, guildid=guildid)
     else:
         query = query.where(userid=userid)
-    results = await query
+
+    # Fetch the first session, user, and skin concurrently
+    results, user, skin = await asyncio.gather(
+        query,
+        fetch_card_user(bot, lion, guildid, userid),
+        bot.get_cog('CustomSkinCog').get_skinargs_for(
+            guildid, userid, MonthlyStatsCard.card_id
+        )
+    )
     first_session = results[0]['start_time'] if results else None
     if not first_session:
         current_streak = 0
@@ -79,8 +74,12 @@ async def get_monthly_card(bot: LionBot, userid: int, guildid: int, offset: int,
             requests.append(day)
 
         # Request times between requested days
+        # The days depend on the first session, so this cannot join the gather above
         if len(requests) > 1:
-            day_stats = await req(*reqkey, *requests)
+            # Only the day totals are used, so skip the session intervals
+            day_stats, _ = await model.period_stats(
+                guildid or None, userid, *requests, sessions_since=requests[-1]
+            )
         else:
             day_stats = []
             logger.warning(
@@ -121,9 +120,6 @@ async def get_monthly_card(bot: LionBot, userid: int, guildid: int, offset: int,
         username = (lion.data.display_name, '#????')
 
     # Request card
-    skin = await bot.get_cog('CustomSkinCog').get_skinargs_for(
-        guildid, userid, MonthlyStatsCard.card_id
-    )
     card = MonthlyStatsCard(
         user=username,
         timezone=str(lion.timezone),
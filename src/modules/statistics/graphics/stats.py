@@ -86,14 +86,9 @@ async def get_stats_card(bot: LionBot, userid: int, guildid: int, mode: CardMode
         raise ValueError(f"Mode {mode} not supported")
 
     # Get leaderboard position
-    # TODO: Efficiency
     if guildid:
-        lguild = await bot.core.lions.fetch_guild(guildid)
-        season_start = lguild.data.season_start
-        if season_start is not None:
-            data = await model.leaderboard_since(guildid, season_start)
-        else:
-            data = await model.leaderboard_all(guildid)
+        stat = 'xp_stats' if mode is CardMode.TEXT else 'voice_stats'
+        data = await data.SeasonStats.leaderboard(guildid, stat)
         position = next((i + 1 for i, (uid, _) in enumerate(data) if uid == userid), None)
     else:
         position = None
@@ -44,3 +44,16 @@ def week_difference(ts_1, ts_2):
 
 def month_difference(ts_1, ts_2):
     return (ts_2.month - ts_1.month) + (ts_2.year - ts_1.year) * 12
+
+
+async def fetch_card_user(bot, lion, guildid, userid):
+    """
+    Resolve the Discord member (or user, if `guildid` is not given) to display on a statistics card.
+
+    Uses the gateway cache where possible, and only falls back to the API on a cache miss.
+    """
+    if guildid:
+        user = await lion.fetch_member()
+    elif (user := bot.get_user(userid)) is None:
+        user = await bot.fetch_user(userid)
+    return user
@@ -8,7 +8,7 @@ from discord.ui.select import select, Select, SelectOption, RoleSelect
 from discord.ui.button import button, Button, ButtonStyle
 from discord.ui.text_input import TextInput, TextStyle
 
-from settings import ListData, ModelData, InteractiveSetting
+from settings import ListData, ModelData, InteractiveSetting, SettingCache
 from settings.setting_types import RoleListSetting, EnumSetting, ListSetting, BoolSetting, TimestampSetting
 from settings.groups import SettingGroup
 
@@ -111,6 +111,12 @@ class StatisticsSettings(SettingGroup):
         _model = CoreData.Guild
         _column = CoreData.Guild.season_start.name
 
+        @classmethod
+        async def _writer(cls, parent_id, data, **kwargs):
+            await super()._writer(parent_id, data, **kwargs)
+            # Recompute the materialised season totals before the update is dispatched
+            await StatsData.SeasonStats.reset_guild(parent_id)
+
         @classmethod
         async def _timezone_from_id(cls, guildid, **kwargs):
             bot = ctx_bot.get()
@@ -179,7 +185,7 @@ class StatisticsSettings(SettingGroup):
         _data_column = 'roleid'
         _order_column = 'roleid'
 
-        _cache = {}
+        _cache = SettingCache()
 
         @property
         def set_str(self):
@@ -243,7 +249,7 @@ class StatisticsSettings(SettingGroup):
         _data_column = 'stat_type'
         _order_column = 'stat_type'
 
-        _cache = {}
+        _cache = SettingCache()
 
         @property
         def set_str(self):
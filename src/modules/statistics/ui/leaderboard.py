@@ -115,7 +115,14 @@ class LeaderboardUI(StatsUI):
         """
         Worker for `fetch_lb_data`.
         """
-        if stat_type is StatType.VOICE:
+        if period is LBPeriod.SEASON or (period is LBPeriod.ALLTIME and not self.show_season):
+            # Current season totals are materialised in the database
+            stat = 'voice_stats' if stat_type is StatType.VOICE else 'xp_stats'
+            if stat_type in (StatType.VOICE, StatType.TEXT):
+                data = await self.data.SeasonStats.leaderboard(self.guildid, stat)
+            else:
+                data = []
+        elif stat_type is StatType.VOICE:
             if period is LBPeriod.ALLTIME:
                 data = await self.data.VoiceSessionStats.leaderboard_all(self.guildid)
             elif (period_start := self.period_starts.get(period, None)) is None:
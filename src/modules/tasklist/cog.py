@@ -136,6 +136,7 @@ class TasklistCog(LionCog):
         await self.data.init()
         self.bot.core.guild_config.register_model_setting(self.settings.task_reward)
         self.bot.core.guild_config.register_model_setting(self.settings.task_reward_limit)
+        await self.bot.core.register_preload_settings(self.settings.tasklist_channels)
         self.bot.add_view(TasklistCaller(self.bot))
 
         configcog = self.bot.get_cog('ConfigCog')
@@ -4,7 +4,7 @@ from discord.ui.select import select, Select, SelectOption, ChannelSelect
 from discord.ui.button import button, Button, ButtonStyle
 from discord.ui.text_input import TextInput, TextStyle
 
-from settings import ListData, ModelData
+from settings import ListData, ModelData, SettingCache
 from settings.setting_types import StringSetting, BoolSetting, ChannelListSetting, IntegerSetting
 from settings.groups import SettingGroup
 
@@ -137,7 +137,7 @@ class TasklistSettings(SettingGroup):
         _data_column = 'channelid'
         _order_column = 'channelid'
 
-        _cache = {}
+        _cache = SettingCache()
 
         @property
         def update_message(self):
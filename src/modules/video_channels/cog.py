@@ -14,6 +14,7 @@ from meta.logger import log_wrap
 from meta.sharding import THIS_SHARD
 from core.data import CoreData
 from utils.lib import utc_now
+from utils.actions import ActionPriority
 from wards import high_management_ward, low_management_ward, equippable_role
 from modules.moderation.cog import ModerationCog
 
@@ -48,8 +49,11 @@ class VideoCog(LionCog):
         self.bot.core.guild_config.register_model_setting(self.settings.VideoBlacklist)
         self.bot.core.guild_config.register_model_setting(self.settings.VideoGracePeriod)
 
-        await self.settings.VideoChannels.setup(self.bot)
-        await self.settings.VideoExempt.setup(self.bot)
+        await self.bot.core.register_preload_settings(
+            self.settings.VideoChannels,
+            self.settings.VideoExempt,
+            self.settings.VideoBlacklistDurations,
+        )
 
         configcog = self.bot.get_cog('ConfigCog')
         if configcog is None:
@@ -76,10 +80,6 @@ class VideoCog(LionCog):
         However, members who were already present and didn't fire an event
         may still need to be handled.
         """
-        # Re-cache, now using the actual client guilds
-        await self.settings.VideoChannels.setup(self.bot)
-        await self.settings.VideoExempt.setup(self.bot)
-
         # Collect members that need handling
         active = [channel for guild in self.bot.guilds for channel in guild.voice_channels if channel.members]
         tasks = []
@@ -222,12 +222,14 @@ class VideoCog(LionCog):
         try:
             # Kick the member from the channel
             await asyncio.shield(
-                member.edit(
-                    voice_channel=None,
+                self.bot.core.actions.move_member(
+                    member, None,
                     reason=t(_p(
                         'video_watchdog|kick_blacklisted_member|audit_reason',
                         "Removing video blacklisted member from a video channel."
-                    ))
+                    )),
+                    priority=ActionPriority.HIGH,
+                    only_from=channel
                 )
             )
         except discord.HTTPException:
@@ -360,12 +362,14 @@ class VideoCog(LionCog):
 
             # Disconnect user
             try:
-                await member.edit(
-                    voice_channel=None,
+                await self.bot.core.actions.move_member(
+                    member, None,
                     reason=t(_p(
                         'video_watchdog|join_task|kick_after_grace|audit_reason',
                         "Member never enabled their video in video channel."
-                    ))
+                    )),
+                    priority=ActionPriority.HIGH,
+                    only_from=channel
                 )
             except discord.HTTPException:
                 # TODO: Event log
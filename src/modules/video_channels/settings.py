@@ -1,7 +1,4 @@
-from cachetools import LRUCache
-from collections import defaultdict
-
-from settings import ModelData, ListData
+from settings import ModelData, ListData, SettingCache
 from settings.groups import SettingGroup
 from settings.ui import InteractiveSetting
 from settings.setting_types import (
@@ -10,13 +7,11 @@ from settings.setting_types import (
 )
 
 from meta import conf
-from meta.sharding import THIS_SHARD
-from meta.logger import log_wrap
 from core.data import CoreData
 from babel.translator import ctx_translator
 from wards import low_management_iward, high_management_iward
 
-from . import babel, logger
+from . import babel
 from .data import VideoData
 
 _p = babel._p
@@ -52,7 +47,7 @@ class VideoSettings(SettingGroup):
             "Comma separated channel ids or names."
         )
 
-        _cache = LRUCache(maxsize=2500)
+        _cache = SettingCache(2500)
         
         _table_interface = VideoData.video_channels
         _id_column = 'guildid'
@@ -75,31 +70,6 @@ class VideoSettings(SettingGroup):
                 ))
             return resp
 
-        @classmethod
-        @log_wrap(action="Cache video_channels")
-        async def setup(cls, bot):
-            """
-            Preload video channels for every guild on the current shard.
-            """
-            data: VideoData = bot.db.registries[VideoData._name]
-            if bot.is_ready():
-                rows = await data.video_channels.select_where(
-                    guildid=[guild.id for guild in bot.guilds]
-                )
-            else:
-                rows = await data.video_channels.select_where(THIS_SHARD)
-            new_cache = defaultdict(list)
-            count = 0
-            for row in rows:
-                new_cache[row['guildid']].append(row['channelid'])
-                count += 1
-            if cls._cache is None:
-                cls._cache = LRUCache(2500)
-            cls._cache.clear()
-            cls._cache.update(new_cache)
-            logger.info(f"Loaded {count} video channels on this shard.")
-
-
     class VideoBlacklist(ModelData, RoleSetting):
         setting_id = "video_blacklist"
         _event = 'guildset_video_blacklist'
@@ -195,7 +165,7 @@ class VideoSettings(SettingGroup):
         ]
 
         # No need to expire
-        _cache = {}
+        _cache = SettingCache()
 
         _table_interface = VideoData.video_blacklist_durations
         _id_column = 'guildid'
@@ -243,7 +213,7 @@ class VideoSettings(SettingGroup):
         
         _model = CoreData.Guild
         _column = CoreData.Guild.video_grace_period.name
-        _cache = LRUCache(2500)
+        _cache = SettingCache(2500)
         
         @property
         def update_message(self) -> str:
@@ -279,6 +249,8 @@ class VideoSettings(SettingGroup):
         _id_column = 'guildid'
         _data_column = 'roleid'
         _order_column = 'roleid'
+
+        _cache = SettingCache(2500)
         
         @property
         def update_message(self) -> str:
@@ -295,27 +267,3 @@ class VideoSettings(SettingGroup):
                     "No members will be exempt from video channel requirements."
                 ))
             return resp
-
-        @classmethod
-        @log_wrap(action="Cache video_exempt")
-        async def setup(cls, bot):
-            """
-            Preload video exempt roles for every guild on the current shard.
-            """
-            data: VideoData = bot.db.registries[VideoData._name]
-            if bot.is_ready():
-                rows = await data.video_exempt_roles.select_where(
-                    guildid=[guild.id for guild in bot.guilds]
-                )
-            else:
-                rows = await data.video_exempt_roles.select_where(THIS_SHARD)
-            new_cache = defaultdict(list)
-            count = 0
-            for row in rows:
-                new_cache[row['guildid']].append(row['roleid'])
-                count += 1
-            if cls._cache is None:
-                cls._cache = LRUCache(2500)
-            cls._cache.clear()
-            cls._cache.update(new_cache)
-            logger.info(f"Loaded {count} video exempt roles on this shard.")
@@ -2,6 +2,7 @@ from babel.translator import LocalBabel
 babel = LocalBabel('settings_base')
 
 from .data import ModelData, ListData
+from .cache import SettingCache
 from .base import BaseSetting
 from .ui import SettingWidget, InteractiveSetting
 from .groups import SettingDotDict, SettingGroup, ModelSettings, ModelSetting
@@ -0,0 +1,160 @@
+from typing import Any, Callable, Hashable, Iterator, Optional
+from collections.abc import MutableMapping
+import logging
+
+from cachetools import LRUCache, TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class SettingCache(MutableMapping):
+    """
+    Cache of setting data keyed by parent id, for use as the `_cache` of `ModelData` and `ListData` settings.
+
+    Entries are evicted least-recently-used beyond `maxsize` (if set),
+    and expire `ttl` seconds after they were written (if set).
+    This bounds memory on long-running shards and staleness from writes on other shards.
+
+    Caches which consumers read directly as a complete map of the shard's guilds
+    (e.g. untracked channels, preloaded on startup) must be created with `complete=True`,
+    which requires `maxsize` and `ttl` to be unset.
+    Remote invalidations re-read the entry instead of dropping it from a complete cache.
+
+    Each cache is registered by the name of the setting class it is defined on.
+    Every `ModelData` and `ListData` setting class is also registered in `settings`, cached or not,
+    so that writes on one shard can invalidate the same setting on other shards.
+    The client registers `invalidation_hook` to broadcast these (see `CoreCog`),
+    and calls `invalidate_named` when it receives one.
+    """
+    # Setting cache name -> cache
+    registry: dict[str, 'SettingCache'] = {}
+
+    # Setting class name -> setting class, for every setting broadcasting its writes
+    settings: dict[str, type] = {}
+
+    # Callable taking (setting name, parent_id), called after a local write
+    invalidation_hook: Optional[Callable[[str, Hashable], Any]] = None
+
+    def __init__(self, maxsize: Optional[int] = 2500, ttl: Optional[float] = None, complete: bool = False):
+        if complete and (maxsize is not None or ttl is not None):
+            raise ValueError("Complete setting caches cannot be bounded.")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.complete = complete
+
+        if ttl is not None:
+            self._data = TTLCache(maxsize or float('inf'), ttl)
+        elif maxsize is not None:
+            self._data = LRUCache(maxsize)
+        else:
+            self._data = {}
+
+        self.name: Optional[str] = None
+        self.setting = None
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def __set_name__(self, owner, name):
+        self.name = self.setting_name(owner)
+        self.setting = owner
+        self.registry[self.name] = self
+
+    def __repr__(self):
+        return (
+            "<SettingCache "
+            f"name={self.name!r} "
+            f"size={len(self)} "
+            f"maxsize={self.maxsize} "
+            f"ttl={self.ttl} "
+            f"hits={self.hits} "
+            f"misses={self.misses}"
+            ">"
+        )
+
+    # Mapping interface
+    def __getitem__(self, key):
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._data[key] = value
+
+    def __delitem__(self, key):
+        del self._data[key]
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def __iter__(self) -> Iterator:
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def clear(self):
+        self._data.clear()
+
+    # Invalidation
+    @staticmethod
+    def setting_name(setting: type) -> str:
+        return f"{setting.__module__}.{setting.__qualname__}"
+
+    @classmethod
+    def register_setting(cls, setting: type):
+        cls.settings[cls.setting_name(setting)] = setting
+
+    @classmethod
+    def written(cls, setting: type, parent_id: Hashable):
+        """
+        Notify other shards that the data of `setting` for `parent_id` was written on this shard.
+        """
+        hook = cls.invalidation_hook
+        if hook is not None:
+            name = cls.setting_name(setting)
+            try:
+                hook(name, parent_id)
+            except Exception:
+                logger.exception(
+                    f"Unhandled exception in setting invalidation hook for {name!r}"
+                )
+
+    async def invalidate(self, parent_id: Hashable):
+        """
+        Invalidate the cached data for `parent_id`, e.g. after a write on another shard.
+
+        Complete caches re-read the entry if it was cached, so they remain complete.
+        """
+        self.invalidations += 1
+        if self.complete and self.setting is not None:
+            if parent_id in self._data:
+                await self.setting._reader(parent_id, use_cache=False)
+        else:
+            self._data.pop(parent_id, None)
+
+    @classmethod
+    async def invalidate_named(cls, name: str, parent_id: Hashable):
+        """
+        Invalidate the local data of the named setting for `parent_id`, after a write on another shard.
+        """
+        if (setting := cls.settings.get(name, None)) is not None:
+            await setting._invalidate(parent_id)
+        elif (cache := cls.registry.get(name, None)) is not None:
+            await cache.invalidate(parent_id)
+
+    # Metrics
+    def stats(self) -> dict[str, Any]:
+        return {
+            'size': len(self),
+            'maxsize': self.maxsize,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations,
+        }
@@ -1,9 +1,14 @@
-from typing import Type
+from typing import Iterable, Optional, Type
+from collections import defaultdict
 import json
 
 from data import RowModel, Table, ORDER
 from meta.logger import log_wrap, set_logging_context
 
+from .cache import SettingCache
+
+_missing = object()
+
 
 class ModelData:
     """
@@ -22,7 +27,30 @@ class ModelData:
     _create_row = False
 
     # High level data cache to use, leave as None to disable cache.
-    _cache = None  # Map[id -> value]
+    _cache: Optional[SettingCache] = None  # Map[id -> value]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        SettingCache.register_setting(cls)
+
+    @classmethod
+    async def _invalidate(cls, parent_id):
+        """
+        Discard the local copies of the data for `parent_id`, after a write on another shard.
+
+        The reader reads through the cached model row, so the row is refreshed as well as the setting cache.
+        """
+        rowid = parent_id if isinstance(parent_id, tuple) else (parent_id, )
+        model_cache = cls._model._cache_
+        row = model_cache.get(rowid, None) if model_cache is not None else None
+        if row is not None:
+            if row.data is None:
+                # Cached as missing, the row may have been created remotely
+                model_cache.pop(rowid, None)
+            else:
+                await row.refresh()
+        if cls._cache is not None:
+            await cls._cache.invalidate(parent_id)
 
     @classmethod
     def _read_from_row(cls, parent_id, row, **kwargs):
@@ -38,8 +66,9 @@ class ModelData:
         """
         Read in the requested column associated to the parent id.
         """
-        if cls._cache is not None and parent_id in cls._cache and use_cache:
-            return cls._cache[parent_id]
+        if cls._cache is not None and use_cache:
+            if (data := cls._cache.get(parent_id, _missing)) is not _missing:
+                return data
 
         model = cls._model
         if cls._create_row:
@@ -62,20 +91,21 @@ class ModelData:
         """
         # TODO: Better way of getting the key?
         # TODO: Transaction
-        if not isinstance(parent_id, tuple):
-            parent_id = (parent_id, )
+        rowid = parent_id if isinstance(parent_id, tuple) else (parent_id, )
         model = cls._model
         rows = await model.table.update_where(
-            **model._dict_from_id(parent_id)
+            **model._dict_from_id(rowid)
         ).set(
             **{cls._column: data}
         )
         # If we didn't update any rows, create a new row
         if not rows:
-            await model.fetch_or_create(**model._dict_from_id(parent_id), **{cls._column: data})
+            await model.fetch_or_create(**model._dict_from_id(rowid), **{cls._column: data})
 
         if cls._cache is not None:
+            # Cache under the parent_id as given, matching the reader
             cls._cache[parent_id] = data
+        SettingCache.written(cls, parent_id)
 
 
 class ListData:
@@ -101,7 +131,19 @@ class ListData:
     _order_type: ORDER = ORDER.ASC
 
     # High level data cache to use, set to None to disable cache.
-    _cache = None  # Map[id -> value]
+    _cache: Optional[SettingCache] = None  # Map[id -> value]
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        SettingCache.register_setting(cls)
+
+    @classmethod
+    async def _invalidate(cls, parent_id):
+        """
+        Discard the cached entries for `parent_id`, after a write on another shard.
+        """
+        if cls._cache is not None:
+            await cls._cache.invalidate(parent_id)
 
     @classmethod
     @log_wrap(isolate=True)
@@ -110,8 +152,9 @@ class ListData:
         Read in all entries associated to the given id.
         """
         set_logging_context(action="Read cls.setting_id")
-        if cls._cache is not None and parent_id in cls._cache and use_cache:
-            return cls._cache[parent_id]
+        if cls._cache is not None and use_cache:
+            if (data := cls._cache.get(parent_id, _missing)) is not _missing:
+                return data
 
         table = cls._table_interface  # type: Table
         query = table.select_where(**{cls._id_column: parent_id}).select(cls._data_column)
@@ -126,6 +169,39 @@ class ListData:
 
         return data
 
+    @classmethod
+    async def preload(cls, *conditions, parent_ids: Optional[Iterable] = None) -> int:
+        """
+        Bulk load the entries matching the given conditions into the cache, in a single query.
+
+        Each parent in `parent_ids` is also cached as having no entries
+        if it does not appear in the results, while there is room in the cache.
+        Returns the number of entries loaded.
+        """
+        if cls._cache is None:
+            return 0
+
+        table = cls._table_interface
+        query = table.select_where(*conditions).select(cls._id_column, cls._data_column).with_no_adapter()
+        if cls._order_column:
+            query.order_by(cls._order_column, direction=cls._order_type)
+        rows = await query
+
+        new_cache = defaultdict(list)
+        for row in rows:
+            new_cache[row[cls._id_column]].append(row[cls._data_column])
+
+        cls._cache.clear()
+        cls._cache.update(new_cache)
+        if parent_ids is not None:
+            maxsize = getattr(cls._cache, 'maxsize', None)
+            for parent_id in parent_ids:
+                if maxsize is not None and len(cls._cache) >= maxsize:
+                    break
+                if parent_id not in cls._cache:
+                    cls._cache[parent_id] = []
+        return len(rows)
+
     @classmethod
     @log_wrap(isolate=True)
     async def _writer(cls, id, data, add_only=False, remove_only=False, **kwargs):
@@ -178,6 +254,8 @@ class ListData:
                     if cls._cache is not None:
                         cls._cache[id] = data
 
+        SettingCache.written(cls, id)
+
 
 class KeyValueData:
     """
@@ -1,5 +1,6 @@
 from typing import Optional
 import asyncio
+import logging
 import time
 import datetime as dt
 from collections import defaultdict
@@ -107,8 +108,8 @@ class TextTrackerCog(LionCog):
         leo_setting_cog.bot_setting_groups.append(self.global_settings)
         self.crossload_group(self.leo_configure_group, leo_setting_cog.leo_configure_group)
 
-        # Update the untracked text channel cache
-        await self.settings.UntrackedTextChannels.setup(self.bot)
+        # Preload the untracked text channel cache on startup
+        await self.bot.core.register_preload_settings(self.settings.UntrackedTextChannels)
 
         configcog = self.bot.get_cog('ConfigCog')
         if configcog is None:
@@ -254,7 +255,7 @@ class TextTrackerCog(LionCog):
         logger.info("Launched text session consumer.")
 
     @LionCog.listener('on_message')
-    @log_wrap(stack=['Text Sessions', 'Message Event'])
+    @log_wrap(stack=('Text Sessions', 'Message Event'), fast=True)
     async def text_message_handler(self, message: discord.Message):
         """
         Message event handler for the text session tracker.
@@ -289,11 +290,12 @@ class TextTrackerCog(LionCog):
                 session = TextSession.from_message(message)
                 session.on_finish(self.session_handler)
                 guild_sessions[message.author.id] = session
-                logger.debug(
-                    "Launched new text session: {session!r}".format(
-                        session=session
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(
+                        "Launched new text session: {session!r}".format(
+                            session=session
+                        )
                     )
-                )
         session.process(message)
 
     # -------- Configuration Commands --------
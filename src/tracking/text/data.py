@@ -1,3 +1,4 @@
+from typing import Optional
 from itertools import chain
 from psycopg import sql
 
@@ -252,6 +253,79 @@ class TextTrackerData(Registry):
                     )
                     return [r['period_m'] or 0 for r in await cursor.fetchall()]
 
+        @classmethod
+        @log_wrap(action='messages_period_stats')
+        async def period_stats(cls, guildid: Optional[int], userid: int, *points, sessions_since=None):
+            """
+            Fetch the messages written between each of the given points,
+            along with the (start, end) timestamps of each session starting after `sessions_since`,
+            by default the first point.
+
+            Both are computed in a single round trip.
+            If `guildid` is None, computes statistics across all guilds.
+            """
+            blocks = zip(points, points[1:])
+            query = sql.SQL(
+                """
+                SELECT
+                    periods.period_ms,
+                    sessions.starts,
+                    sessions.durations
+                FROM
+                    (
+                        SELECT
+                            array_agg(
+                                (
+                                    SELECT
+                                        SUM(messages)
+                                    FROM text_sessions s
+                                    WHERE
+                                        s.userid = %s
+                                        AND (%s::BIGINT IS NULL OR s.guildid = %s)
+                                        AND s.start_time >= periods._start
+                                        AND s.start_time < periods._end
+                                )
+                                ORDER BY periods._start
+                            ) AS period_ms
+                        FROM
+                            (VALUES {})
+                            AS
+                            periods (_start, _end)
+                    ) AS periods,
+                    (
+                        SELECT
+                            array_agg(s.start_time ORDER BY s.start_time) AS starts,
+                            array_agg(s.duration ORDER BY s.start_time) AS durations
+                        FROM text_sessions s
+                        WHERE
+                            s.userid = %s
+                            AND (%s::BIGINT IS NULL OR s.guildid = %s)
+                            AND s.start_time >= %s
+                    ) AS sessions
+                """
+            ).format(
+                sql.SQL(', ').join(
+                    sql.SQL("({}, {})").format(sql.Placeholder(), sql.Placeholder()) for _ in points[1:]
+                )
+            )
+            async with cls._connector.connection() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute(
+                        query,
+                        tuple(chain(
+                            (userid, guildid, guildid),
+                            *blocks,
+                            (userid, guildid, guildid, sessions_since or points[0])
+                        ))
+                    )
+                    row = await cursor.fetchone()
+            stats = [messages or 0 for messages in row['period_ms']]
+            sessions = [
+                (int(start.timestamp()), int(start.timestamp() + int(duration)))
+                for start, duration in zip(row['starts'] or (), row['durations'] or ())
+            ]
+            return stats, sessions
+
         @classmethod
         @log_wrap(action='member_messages_since')
         async def member_messages_since(cls, guildid: int, userid: int, *points):
@@ -1,19 +1,17 @@
 from typing import Optional
 import asyncio
-from collections import defaultdict
 
 from settings.groups import SettingGroup
 from settings.data import ModelData, ListData
+from settings.cache import SettingCache
 from settings.setting_types import ChannelListSetting, IntegerSetting
 
 from meta.config import conf
-from meta.sharding import THIS_SHARD
-from meta.logger import log_wrap
 from core.data import CoreData
 from babel.translator import ctx_translator
 from wards import low_management_iward
 
-from . import babel, logger
+from . import babel
 from .data import TextTrackerData
 
 _p = babel._p
@@ -121,7 +119,8 @@ class TextTrackerSettings(SettingGroup):
         _data_column = 'channelid'
         _order_column = 'channelid'
 
-        _cache = {}
+        # Read directly by the tracker as a complete map of guilds on this shard
+        _cache = SettingCache(maxsize=None, complete=True)
 
         @property
         def update_message(self):
@@ -146,25 +145,6 @@ class TextTrackerSettings(SettingGroup):
                 "Channel selector below"
             ))
 
-        @classmethod
-        @log_wrap(action='Cache Untracked Text Channels')
-        async def setup(cls, bot):
-            """
-            Pre-load untracked text channels for every guild on the current shard.
-            """
-            data: TextTrackerData = bot.db.registries['TextTrackerData']
-            # TODO: Filter by joining on guild_config with last_left = NULL
-            # Otherwise we are also caching all the guilds we left
-            rows = await data.untracked_channels.select_where(THIS_SHARD)
-            new_cache = defaultdict(list)
-            count = 0
-            for row in rows:
-                new_cache[row['guildid']].append(row['channelid'])
-                count += 1
-            cls._cache.clear()
-            cls._cache.update(new_cache)
-            logger.info(f"Loaded {count} untracked text channels on this shard.")
-
 
 class TextTrackerGlobalSettings(SettingGroup):
     """
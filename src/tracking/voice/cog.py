@@ -1,5 +1,6 @@
 from typing import Optional
 import asyncio
+import logging
 import itertools
 import datetime as dt
 
@@ -124,8 +125,8 @@ class VoiceTrackerCog(LionCog):
         self.bot.core.guild_config.register_model_setting(self.settings.DailyVoiceCap)
         self.bot.core.guild_config.register_setting(self.settings.UntrackedChannels)
 
-        # Update the tracked voice channel cache
-        await self.settings.UntrackedChannels.setup(self.bot)
+        # Preload the untracked voice channel cache on startup
+        await self.bot.core.register_preload_settings(self.settings.UntrackedChannels)
 
         configcog = self.bot.get_cog('ConfigCog')
         if configcog is None:
@@ -388,7 +389,7 @@ class VoiceTrackerCog(LionCog):
             VoiceSession._sessions_.clear()
 
             # Refresh untracked information for all guilds we are in
-            await self.settings.UntrackedChannels.setup(self.bot)
+            await self.bot.core.preload_guild_settings(self.settings.UntrackedChannels)
 
             # Read and save the tracked voice states of all visible voice channels
             states = {}
@@ -416,7 +417,7 @@ class VoiceTrackerCog(LionCog):
             self.initialised.set()
 
     @LionCog.listener("on_voice_state_update")
-    @log_wrap(action='Voice Track')
+    @log_wrap(action='Voice Track', fast=True)
     async def session_voice_tracker(self, member, before, after):
         """
         Spawns the correct tasks from members joining, leaving, and changing live state.
@@ -502,12 +503,13 @@ class VoiceTrackerCog(LionCog):
                         delay, start, expiry = await self._session_boundaries_for(member.guild.id, member.id)
                         hourly_rate = await self._calculate_rate(member.guild.id, member.id, astate)
 
-                        logger.debug(
-                            f"Scheduling voice session for member `{member.name}' <uid:{member.id}> "
-                            f"in guild '{member.guild.name}' <gid: member.guild.id> "
-                            f"in channel '{achannel}' <cid: {achannel.id}>. "
-                            f"Session will start at {start}, expire at {expiry}, and confirm in {delay}."
-                        )
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(
+                                f"Scheduling voice session for member `{member.name}' <uid:{member.id}> "
+                                f"in guild '{member.guild.name}' <gid: member.guild.id> "
+                                f"in channel '{achannel}' <cid: {achannel.id}>. "
+                                f"Session will start at {start}, expire at {expiry}, and confirm in {delay}."
+                            )
                         await session.schedule_start(delay, start, expiry, astate, hourly_rate)
 
                         t = self.bot.translator.t
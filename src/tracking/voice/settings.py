@@ -1,17 +1,15 @@
 from typing import Optional
 import asyncio
-from collections import defaultdict
 import discord
 from discord.ui.select import select, Select, ChannelSelect
 from discord.ui.button import button, Button, ButtonStyle
 
 from settings.groups import SettingGroup
 from settings.data import ModelData, ListData
+from settings.cache import SettingCache
 from settings.setting_types import ChannelListSetting, IntegerSetting, DurationSetting
 
 from meta import conf, LionBot
-from meta.sharding import THIS_SHARD
-from meta.logger import log_wrap
 from utils.lib import MessageArgs
 from utils.ui import LeoUI, ConfigUI, DashboardSection
 from wards import low_management_iward
@@ -20,7 +18,7 @@ from core.data import CoreData
 from core.lion_guild import VoiceMode
 from babel.translator import ctx_translator
 
-from . import babel, logger
+from . import babel
 from .data import VoiceTrackerData
 
 _p = babel._p
@@ -65,7 +63,8 @@ class VoiceTrackerSettings(SettingGroup):
         _data_column = 'channelid'
         _order_column = 'channelid'
 
-        _cache = {}
+        # Read directly by the tracker as a complete map of guilds on this shard
+        _cache = SettingCache(maxsize=None, complete=True)
 
         @property
         def set_str(self):
@@ -92,25 +91,6 @@ class VoiceTrackerSettings(SettingGroup):
                 ))
             return resp
 
-        @classmethod
-        @log_wrap(action='Cache Untracked Channels')
-        async def setup(cls, bot):
-            """
-            Pre-load untracked channels for every guild on the current shard.
-            """
-            data: VoiceTrackerData = bot.db.registries['VoiceTrackerData']
-            # TODO: Filter by joining on guild_config with last_left = NULL
-            # Otherwise we are also caching all the guilds we left
-            rows = await data.untracked_channels.select_where(THIS_SHARD)
-            new_cache = defaultdict(list)
-            count = 0
-            for row in rows:
-                new_cache[row['guildid']].append(row['channelid'])
-                count += 1
-            cls._cache.clear()
-            cls._cache.update(new_cache)
-            logger.info(f"Loaded {count} untracked channels on this shard.")
-
     class HourlyReward(ModelData, IntegerSetting):
         setting_id = 'hourly_reward'
         _event = 'on_guildset_hourly_reward'
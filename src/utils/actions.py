@@ -0,0 +1,308 @@
+from typing import Any, Awaitable, Callable, Hashable, Iterable, Optional
+from enum import IntEnum
+import itertools
+import asyncio
+import heapq
+import logging
+
+import discord
+
+from .ratelimits import Bucket
+
+logger = logging.getLogger(__name__)
+
+
+class ActionPriority(IntEnum):
+    """
+    Execution priority of a queued Discord action. Lower values run first.
+    """
+    HIGH = 0  # Moderation and member-facing actions, e.g. disconnecting a blacklisted member
+    NORMAL = 1  # Interactive actions, e.g. a member equipping a role
+    LOW = 2  # Bulk background jobs, e.g. rank refreshes
+
+
+class _Action:
+    __slots__ = ('key', 'kind', 'target', 'priority', 'futures', 'reasons', 'add', 'remove', 'channel', 'only_from', 'kwargs')
+
+    def __init__(self, key, kind, target, priority):
+        self.key = key
+        self.kind = kind
+        self.target = target
+        self.priority = priority
+        self.futures: list[asyncio.Future] = []
+        self.reasons: list[str] = []
+
+        # Role action state
+        self.add: dict[int, discord.abc.Snowflake] = {}
+        self.remove: dict[int, discord.abc.Snowflake] = {}
+
+        # Move action target, and the channel the member must be in for the move to apply
+        self.channel: Optional[discord.abc.Snowflake] = None
+        self.only_from: Optional[discord.abc.Snowflake] = None
+
+        # Channel edit or custom action arguments
+        self.kwargs: dict[str, Any] = {}
+
+    @property
+    def reason(self) -> Optional[str]:
+        reasons = list(dict.fromkeys(reason for reason in self.reasons if reason))
+        return '; '.join(reasons)[:512] if reasons else None
+
+
+class _GuildQueue:
+    __slots__ = ('guildid', 'bucket', 'semaphore', 'pending', 'heap', 'task', 'running')
+
+    def __init__(self, guildid: int, rate: int, per: float, concurrency: int):
+        self.guildid = guildid
+        self.bucket = Bucket(rate, per)
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.pending: dict[Hashable, _Action] = {}
+        self.heap: list[tuple[int, int, Hashable]] = []
+        self.task: Optional[asyncio.Task] = None
+        self.running = 0
+
+
+class ActionExecutor:
+    """
+    Central per-guild executor for bulk Discord role, voice and channel actions.
+
+    Actions are queued per guild and executed in priority order,
+    through a single ratelimit bucket and concurrency limit for each guild,
+    so that concurrent jobs in the same guild (e.g. a rank refresh and a scheduled session close)
+    share one request budget instead of each tripping Discord's per-route limits.
+
+    Pending actions on the same target are coalesced:
+    role additions and removals on a member are merged into a single pending role update
+    (with an addition and removal of the same role cancelling out),
+    the latest requested voice move for a member wins,
+    and edits of the same channel are merged.
+    A coalesced action runs at the highest priority requested.
+
+    Each submission returns a Future resolving when the (possibly coalesced) action completes,
+    with the exception if the action failed.
+    Use `completed` to iterate over the futures of a batch as they complete, e.g. to `poke()` a UI,
+    and `cancel` to abandon the rest of a batch.
+    """
+    def __init__(self, rate: int = 5, per: float = 5, concurrency: int = 3):
+        self.rate = rate
+        self.per = per
+        self.concurrency = concurrency
+
+        self._queues: dict[int, _GuildQueue] = {}
+        self._counter = itertools.count()
+
+    def __repr__(self):
+        return (
+            "<ActionExecutor "
+            f"guilds={len(self._queues)} "
+            f"pending={sum(len(queue.pending) for queue in self._queues.values())} "
+            f"running={sum(queue.running for queue in self._queues.values())}"
+            ">"
+        )
+
+    def pending_for(self, guildid: int) -> int:
+        queue = self._queues.get(guildid, None)
+        return len(queue.pending) if queue is not None else 0
+
+    # Submission
+    def _submit(self, guildid: int, key: Hashable, kind: str, target, priority: ActionPriority,
+                reason: Optional[str]) -> tuple[_Action, asyncio.Future]:
+        queue = self._queues.get(guildid, None)
+        if queue is None:
+            queue = self._queues[guildid] = _GuildQueue(guildid, self.rate, self.per, self.concurrency)
+
+        action = queue.pending.get(key, None)
+        if action is None:
+            action = queue.pending[key] = _Action(key, kind, target, priority)
+            heapq.heappush(queue.heap, (priority, next(self._counter), key))
+        else:
+            # Coalesce into the pending action, taking the latest target object
+            action.target = target
+            if priority < action.priority:
+                action.priority = priority
+                heapq.heappush(queue.heap, (priority, next(self._counter), key))
+
+        future = asyncio.get_running_loop().create_future()
+        action.futures.append(future)
+        action.reasons.append(reason)
+
+        if queue.task is None or queue.task.done():
+            queue.task = asyncio.create_task(self._run_queue(queue), name=f"guild-actions-{guildid}")
+        return action, future
+
+    def add_roles(self, member: discord.Member, *roles: discord.abc.Snowflake,
+                  reason: Optional[str] = None, priority=ActionPriority.NORMAL) -> asyncio.Future:
+        action, future = self._submit(
+            member.guild.id, ('roles', member.id), 'roles', member, priority, reason
+        )
+        for role in roles:
+            action.remove.pop(role.id, None)
+            action.add[role.id] = role
+        return future
+
+    def remove_roles(self, member: discord.Member, *roles: discord.abc.Snowflake,
+                     reason: Optional[str] = None, priority=ActionPriority.NORMAL) -> asyncio.Future:
+        action, future = self._submit(
+            member.guild.id, ('roles', member.id), 'roles', member, priority, reason
+        )
+        for role in roles:
+            action.add.pop(role.id, None)
+            action.remove[role.id] = role
+        return future
+
+    def move_member(self, member: discord.Member, channel: Optional[discord.abc.Snowflake],
+                    reason: Optional[str] = None, priority=ActionPriority.NORMAL,
+                    only_from: Optional[discord.abc.Snowflake] = None) -> asyncio.Future:
+        """
+        Move the member to the given voice channel, or disconnect them if `channel` is None.
+
+        If `only_from` is given, the move is skipped unless the member is still in that channel
+        when the action runs.
+        """
+        action, future = self._submit(
+            member.guild.id, ('move', member.id), 'move', member, priority, reason
+        )
+        action.channel = channel
+        action.only_from = only_from
+        return future
+
+    def edit_channel(self, channel: discord.abc.GuildChannel,
+                     reason: Optional[str] = None, priority=ActionPriority.NORMAL, **kwargs) -> asyncio.Future:
+        action, future = self._submit(
+            channel.guild.id, ('channel', channel.id), 'channel', channel, priority, reason
+        )
+        action.kwargs.update(kwargs)
+        return future
+
+    def submit(self, guildid: int, key: Hashable, func: Callable[[], Awaitable[Any]],
+               priority=ActionPriority.NORMAL) -> asyncio.Future:
+        """
+        Queue an arbitrary guild action, such as a role deletion.
+
+        Pending submissions with the same key are coalesced, with the latest `func` winning.
+        """
+        action, future = self._submit(guildid, ('custom', key), 'custom', func, priority, None)
+        return future
+
+    def cancel(self, futures: Iterable[asyncio.Future]) -> int:
+        """
+        Cancel the given action futures, e.g. when abandoning a batch.
+
+        Pending actions left without any futures are dropped from their queue.
+        Actions which have already started, or which were coalesced with another submission
+        that is still awaited, are not stopped.
+        Returns the number of dropped actions.
+        """
+        futures = {future for future in futures if not future.done()}
+        dropped = 0
+        if futures:
+            for queue in self._queues.values():
+                for key, action in list(queue.pending.items()):
+                    if not futures.isdisjoint(action.futures):
+                        action.futures = [future for future in action.futures if future not in futures]
+                        if not action.futures:
+                            # The queue runner skips heap entries which are no longer pending
+                            queue.pending.pop(key, None)
+                            dropped += 1
+            for future in futures:
+                future.cancel()
+        return dropped
+
+    # Execution
+    async def _run_queue(self, queue: _GuildQueue):
+        try:
+            while queue.heap:
+                priority, _, key = heapq.heappop(queue.heap)
+                action = queue.pending.get(key, None)
+                if action is None or action.priority != priority:
+                    # Already executed, or superseded by a higher priority entry
+                    continue
+
+                await queue.semaphore.acquire()
+                if queue.pending.get(key, None) is not action:
+                    # Cancelled while waiting for a slot
+                    queue.semaphore.release()
+                    continue
+                await queue.bucket.wait()
+                if queue.pending.get(key, None) is not action:
+                    # Cancelled while waiting for the bucket
+                    queue.semaphore.release()
+                    continue
+                queue.bucket.request()
+
+                # Coalescing stops once the action is removed from pending
+                queue.pending.pop(key, None)
+                queue.running += 1
+                asyncio.create_task(self._execute(queue, action))
+        finally:
+            self._drop_if_idle(queue)
+
+    def _drop_if_idle(self, queue: _GuildQueue):
+        idle = not queue.heap and not queue.pending and not queue.running
+        if idle and self._queues.get(queue.guildid, None) is queue:
+            self._queues.pop(queue.guildid, None)
+
+    async def _execute(self, queue: _GuildQueue, action: _Action):
+        try:
+            result = await self._perform(action)
+        except Exception as e:
+            if not isinstance(e, discord.HTTPException):
+                logger.exception(
+                    f"Unhandled exception while performing guild action {action.kind} <key: {action.key}>"
+                )
+            for future in action.futures:
+                if not future.done():
+                    future.set_exception(e)
+                    # Mark the exception as retrieved, since callers may not await every future
+                    future.exception()
+        else:
+            for future in action.futures:
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            queue.running -= 1
+            queue.semaphore.release()
+            if queue.task is None or queue.task.done():
+                self._drop_if_idle(queue)
+
+    async def _perform(self, action: _Action):
+        reason = action.reason
+        if action.kind == 'roles':
+            member: discord.Member = action.target
+            currentids = {role.id for role in member.roles}
+            # Only touch the pending roles, so concurrent role changes made elsewhere are not overwritten
+            adds = [role for roleid, role in action.add.items() if roleid not in currentids]
+            removes = [role for roleid, role in action.remove.items() if roleid in currentids]
+            if adds:
+                await member.add_roles(*adds, reason=reason)
+            if removes:
+                await member.remove_roles(*removes, reason=reason)
+            return None
+        elif action.kind == 'move':
+            member: discord.Member = action.target
+            voice_channel = member.voice.channel if member.voice else None
+            if action.only_from is not None and (voice_channel is None or voice_channel.id != action.only_from.id):
+                # Member has already left the channel
+                return None
+            if action.channel is None and voice_channel is None:
+                # Already disconnected
+                return None
+            return await member.move_to(action.channel, reason=reason)
+        elif action.kind == 'channel':
+            return await action.target.edit(reason=reason, **action.kwargs)
+        elif action.kind == 'custom':
+            return await action.target()
+        else:
+            raise ValueError(f"Unknown guild action kind {action.kind!r}")
+
+    # Batch helpers
+    @staticmethod
+    async def completed(futures: Iterable[asyncio.Future]):
+        """
+        Yield the given action futures as they complete.
+        """
+        pending = set(futures)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                yield future
@@ -1,5 +1,7 @@
 import asyncio
-import bisect
+import contextlib
+import heapq
+import itertools
 import logging
 from typing import TypeVar, Generic, Optional, Callable, Coroutine, Any
 
@@ -16,27 +18,54 @@ class TaskMonitor(Generic[Taskid]):
     """
     Base class for a task monitor.
 
-    Stores tasks as a time-sorted list of taskids.
+    Stores tasks in a binary heap of `(timestamp, generation, taskid)` entries.
     Subclasses may override `run_task` to implement an executor.
 
-    Adding or removing a single task has O(n) performance.
-    To bulk update tasks, instead use `schedule_tasks`.
+    Rescheduling or cancelling a task does not remove its old heap entry.
+    Instead each scheduled task records the generation of its current entry,
+    and entries with an outdated generation are discarded lazily when they reach the top of the heap.
+    Thus scheduling a single task is O(log n), and cancelling a task is O(1).
+    The heap is compacted once stale entries outnumber the live tasks.
 
     Each taskid must be unique and hashable.
+
+    Batch mode
+    ----------
+    If a `batch_executor` is provided (or a subclass overrides `run_batch`),
+    all tasks due at wakeup are popped together and passed to `run_batch`,
+    in batches of at most `batch_size` taskids.
+    This allows executors to load their data for many tasks in a single query
+    (e.g. after downtime, when many tasks are overdue at once).
+    In batch mode, the ratelimit bucket is waited on once per batch.
+
+    If `max_concurrency` is given, at most this many tasks (or batches) are executed concurrently.
     """
 
-    def __init__(self, executor=None, bucket: Optional[Bucket] = None):
+    def __init__(
+        self,
+        executor=None,
+        bucket: Optional[Bucket] = None,
+        batch_executor=None,
+        batch_size: int = 100,
+        max_concurrency: Optional[int] = None
+    ):
         # Ratelimit bucket to enforce maximum execution rate
         self._bucket = bucket
+        # Semaphore to limit the number of concurrently executing tasks or batches
+        self._semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
 
         self.executor: Optional[Callable[[Taskid], Coroutine[Any, Any, None]]] = executor
+        self.batch_executor: Optional[Callable[[list[Taskid]], Coroutine[Any, Any, None]]] = batch_executor
+        self.batch_size = batch_size
 
         self._wakeup: asyncio.Event = asyncio.Event()
         self._monitor_task: Optional[asyncio.Task] = None
 
         # Task data
-        self._tasklist: list[Taskid] = []
+        self._heap: list[tuple[int, int, Taskid]] = []  # (timestamp, generation, taskid)
         self._taskmap: dict[Taskid, int] = {}  # taskid -> timestamp
+        self._taskgen: dict[Taskid, int] = {}  # taskid -> generation of the live heap entry
+        self._generation = itertools.count()
 
         # Running map ensures we keep a reference to the running task
         # And allows simpler external cancellation if required
@@ -46,50 +75,93 @@ class TaskMonitor(Generic[Taskid]):
         return (
             "<"
                 f"{self.__class__.__name__}"
-                f" tasklist={len(self._tasklist)}"
+                f" heap={len(self._heap)}"
                 f" taskmap={len(self._taskmap)}"
                 f" wakeup={self._wakeup.is_set()}"
                 f" bucket={self._bucket}"
+                f" batched={self.batched}"
                 f" running={len(self._running)}"
                 f" task={self._monitor_task}"
                 f">"
         )
 
+    @property
+    def batched(self) -> bool:
+        """
+        Whether this monitor executes tasks in batches.
+        """
+        return self.batch_executor is not None or type(self).run_batch is not TaskMonitor.run_batch
+
+    def _entry(self, taskid: Taskid, timestamp: int) -> tuple[int, int, Taskid]:
+        """
+        Register a new live heap entry for the given task, superseding any previous entry.
+        """
+        gen = next(self._generation)
+        self._taskmap[taskid] = timestamp
+        self._taskgen[taskid] = gen
+        return (timestamp, gen, taskid)
+
+    def _peek(self) -> Optional[tuple[int, int, Taskid]]:
+        """
+        Return the next live heap entry, discarding any stale entries above it.
+        """
+        heap = self._heap
+        while heap:
+            entry = heap[0]
+            if self._taskgen.get(entry[2], None) == entry[1]:
+                return entry
+            heapq.heappop(heap)
+        return None
+
+    def _compact(self):
+        """
+        Rebuild the heap from the live entries, if it is dominated by stale entries.
+        """
+        if len(self._heap) > 2 * len(self._taskgen) + 64:
+            self._heap = [
+                (self._taskmap[tid], gen, tid) for tid, gen in self._taskgen.items()
+            ]
+            heapq.heapify(self._heap)
+
     def set_tasks(self, *tasks: tuple[Taskid, int]) -> None:
         """
         Similar to `schedule_tasks`, but wipe and reset the tasklist.
         """
-        self._taskmap = {tid: time for tid, time in tasks}
-        self._tasklist = list(sorted(self._taskmap.keys(), key=lambda tid: -1 * self._taskmap[tid]))
+        self._taskmap = {}
+        self._taskgen = {}
+        self._heap = [self._entry(tid, time) for tid, time in dict(tasks).items()]
+        heapq.heapify(self._heap)
         self._wakeup.set()
 
     def schedule_tasks(self, *tasks: tuple[Taskid, int]) -> None:
         """
         Schedule the given tasks.
 
-        Rather than repeatedly inserting tasks,
-        where the O(log n) insort is dominated by the O(n) list insertion,
-        we build an entirely new list, and always wake up the loop.
+        Large batches are appended and the heap rebuilt in O(n),
+        rather than pushing each entry in O(log n).
+        Always wakes up the monitor loop.
         """
-        self._taskmap |= {tid: time for tid, time in tasks}
-        self._tasklist = list(sorted(self._taskmap.keys(), key=lambda tid: -1 * self._taskmap[tid]))
+        entries = [self._entry(tid, time) for tid, time in dict(tasks).items()]
+        if len(entries) > len(self._heap) // 8:
+            self._heap.extend(entries)
+            heapq.heapify(self._heap)
+        else:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+        self._compact()
         self._wakeup.set()
 
     def schedule_task(self, taskid: Taskid, timestamp: int) -> None:
         """
-        Insert the provided task into the tasklist.
+        Insert the provided task into the tasklist, replacing any existing task with this taskid.
         If the new task has a lower timestamp than the next task, wakes up the monitor loop.
         """
-        if self._tasklist:
-            nextid = self._tasklist[-1]
-            wake = self._taskmap[nextid] >= timestamp
-            wake = wake or taskid == nextid
+        if (next_entry := self._peek()) is not None:
+            wake = next_entry[0] >= timestamp or next_entry[2] == taskid
         else:
             wake = True
-        if taskid in self._taskmap:
-            self._tasklist.remove(taskid)
-        self._taskmap[taskid] = timestamp
-        bisect.insort_left(self._tasklist, taskid, key=lambda t: -1 * self._taskmap[t])
+        heapq.heappush(self._heap, self._entry(taskid, timestamp))
+        self._compact()
         if wake:
             self._wakeup.set()
 
@@ -98,11 +170,13 @@ class TaskMonitor(Generic[Taskid]):
         Remove all tasks with the given taskids from the tasklist.
         If the next task has this taskid, wake up the monitor loop.
         """
-        taskids = set(taskids)
-        wake = (self._tasklist and self._tasklist[-1] in taskids)
-        self._tasklist = [tid for tid in self._tasklist if tid not in taskids]
+        next_entry = self._peek()
+        wake = False
         for tid in taskids:
             self._taskmap.pop(tid, None)
+            if self._taskgen.pop(tid, None) is not None:
+                wake = wake or next_entry[2] == tid
+        self._compact()
         if wake:
             self._wakeup.set()
 
@@ -124,21 +198,27 @@ class TaskMonitor(Generic[Taskid]):
         try:
             while True:
                 self._wakeup.clear()
-                if not self._tasklist:
+                if (entry := self._peek()) is None:
                     # No tasks left, just sleep until wakeup
                     await self._wakeup.wait()
                 else:
                     # Get the next task, sleep until wakeup or it is ready to run
-                    nextid = self._tasklist[-1]
-                    nexttime = self._taskmap[nextid]
+                    nexttime, _, nextid = entry
                     sleep_for = nexttime - utc_now().timestamp()
                     try:
                         await asyncio.wait_for(self._wakeup.wait(), timeout=sleep_for)
                     except asyncio.TimeoutError:
-                        # Ready to run the task
-                        self._tasklist.pop()
-                        self._taskmap.pop(nextid, None)
-                        self._running[nextid] = asyncio.ensure_future(self._run(nextid))
+                        if self._peek() is not entry:
+                            # Task was rescheduled or cancelled without waking us up
+                            continue
+                        if self.batched:
+                            self._dispatch_batch()
+                        else:
+                            # Ready to run the task
+                            heapq.heappop(self._heap)
+                            self._taskmap.pop(nextid, None)
+                            self._taskgen.pop(nextid, None)
+                            self._running[nextid] = asyncio.ensure_future(self._run(nextid))
                     else:
                         # Wakeup task fired, loop again
                         continue
@@ -146,12 +226,36 @@ class TaskMonitor(Generic[Taskid]):
             # Log closure and wait for remaining tasks
             # A second cancellation will also cancel the tasks
             logger.debug(
-                f"Task Monitor {self.__class__.__name__} cancelled with {len(self._tasklist)} tasks remaining. "
+                f"Task Monitor {self.__class__.__name__} cancelled with {len(self._taskmap)} tasks remaining. "
                 f"Waiting for {len(self._running)} running tasks to complete."
             )
             await asyncio.gather(*self._running.values(), return_exceptions=True)
 
+    def _dispatch_batch(self) -> None:
+        """
+        Pop the next task, along with any other due tasks up to the batch size,
+        and launch their batch execution.
+        """
+        now = utc_now().timestamp()
+        batch = []
+        while (entry := self._peek()) is not None and len(batch) < self.batch_size:
+            if batch and entry[0] > now:
+                break
+            heapq.heappop(self._heap)
+            taskid = entry[2]
+            self._taskmap.pop(taskid, None)
+            self._taskgen.pop(taskid, None)
+            batch.append(taskid)
+
+        fut = asyncio.ensure_future(self._run_batch(batch))
+        for taskid in batch:
+            self._running[taskid] = fut
+
     async def _run(self, taskid: Taskid) -> None:
+        async with (self._semaphore or contextlib.nullcontext()):
+            await self._run_single(taskid)
+
+    async def _run_single(self, taskid: Taskid) -> None:
         # Execute the task, respecting the ratelimit bucket
         if self._bucket is not None:
             # IMPLEMENTATION NOTE:
@@ -164,6 +268,7 @@ class TaskMonitor(Generic[Taskid]):
             # Furthermore, make sure we do _not_ pass back to the event loop after waiting
             # Or we will lose thread-safety for BucketFull
             await self._bucket.wait()
+            self._bucket.request()
         fut = asyncio.create_task(self.run_task(taskid))
         try:
             await asyncio.shield(fut)
@@ -178,6 +283,41 @@ class TaskMonitor(Generic[Taskid]):
         finally:
             self._running.pop(taskid)
 
+    async def _run_batch(self, taskids: list[Taskid]) -> None:
+        try:
+            async with (self._semaphore or contextlib.nullcontext()):
+                if self._bucket is not None:
+                    await self._bucket.wait()
+                    self._bucket.request()
+                fut = asyncio.create_task(self.run_batch(taskids))
+                await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # Protect the monitor loop from any other exceptions
+            logger.exception(
+                f"Ignoring exception in task monitor {self.__class__.__name__} while "
+                f"executing batch of {len(taskids)} tasks: {taskids}"
+            )
+        finally:
+            this = asyncio.current_task()
+            for taskid in taskids:
+                # Don't drop a later execution of the same taskid
+                if self._running.get(taskid, None) is this:
+                    self._running.pop(taskid)
+
+    async def run_batch(self, taskids: list[Taskid]):
+        """
+        Execute the tasks with the given taskids.
+
+        Default implementation executes `self.batch_executor` if it exists,
+        otherwise raises NotImplementedError.
+        """
+        if self.batch_executor is not None:
+            await self.batch_executor(taskids)
+        else:
+            raise NotImplementedError
+
     async def run_task(self, taskid: Taskid):
         """
         Execute the task with the given taskid.
@@ -4,8 +4,6 @@ import logging
 
 from meta.errors import SafeCancellation
 
-from cachetools import TTLCache
-
 logger = logging.getLogger()
 
 
@@ -56,7 +54,7 @@ class Bucket:
     def delay(self):
         self._leak()
         if self._level + 1 > self.max_level:
-            delay = (self._level + 1 - self.max_level) * self.leak_rate
+            delay = (self._level + 1 - self.max_level) / self.leak_rate
         else:
             delay = 0
         return delay
@@ -109,20 +107,102 @@ class Bucket:
         await coro
 
 
+class RateLimitStore:
+    """
+    Compact per-key ratelimit state, using the Generic Cell Rate Algorithm.
+
+    Each key is stored as a single float, its theoretical arrival time (TAT),
+    which is the time at which the key's equivalent leaky bucket would be empty.
+    The bucket level at time `now` is then `(tat - now) / interval`.
+
+    The store holds at most `maxsize` keys.
+    When full, keys whose TAT has passed (i.e. whose buckets are empty) are evicted.
+    Keys with active limits are never evicted, since that would reset their limit.
+    If the store is full of active keys, new keys are refused until one expires.
+    """
+    __slots__ = ('max_level', 'empty_time', 'interval', 'maxsize', '_tats', '_next_sweep')
+
+    def __init__(self, max_level, empty_time, maxsize=10000):
+        self.max_level = max_level
+        self.empty_time = empty_time
+        self.interval = empty_time / max_level
+        self.maxsize = maxsize
+
+        self._tats: dict = {}
+        # Earliest time at which a sweep could evict a key
+        self._next_sweep = 0
+
+    def __len__(self):
+        return len(self._tats)
+
+    def level(self, key) -> float:
+        """
+        Current bucket level for the given key.
+        """
+        tat = self._tats.get(key, None)
+        if tat is None:
+            return 0
+        return max(0, tat - time.monotonic()) / self.interval
+
+    def _sweep(self, now) -> bool:
+        """
+        Evict every expired key. Returns whether there is room for a new key.
+        """
+        if now < self._next_sweep:
+            return False
+        tats = self._tats
+        expired = [key for key, tat in tats.items() if tat <= now]
+        for key in expired:
+            del tats[key]
+        if len(tats) >= self.maxsize:
+            # Nothing else can expire before the earliest remaining TAT
+            self._next_sweep = min(tats.values())
+            return False
+        return True
+
+    def request(self, key):
+        """
+        Request a single unit for the given key.
+
+        Raises `BucketFull` on the first refused request once the limit is reached,
+        and `BucketOverFull` on further refused requests, matching `Bucket.request`.
+        """
+        now = time.monotonic()
+        tats = self._tats
+        tat = tats.get(key, None)
+        if tat is None:
+            if len(tats) >= self.maxsize and not self._sweep(now):
+                raise BucketOverFull
+            tat = now
+        elif tat < now:
+            tat = now
+
+        new_tat = tat + self.interval
+        if new_tat - now <= self.empty_time:
+            tats[key] = new_tat
+        elif tat - now <= self.empty_time:
+            # First overflow, count it so that repeated requests are treated as overfull
+            tats[key] = new_tat
+            raise BucketFull
+        else:
+            raise BucketOverFull
+
+    def clear(self):
+        self._tats.clear()
+        self._next_sweep = 0
+
+
 class RateLimit:
-    def __init__(self, max_level, empty_time, error=None, cache=TTLCache(1000, 60 * 60)):
+    def __init__(self, max_level, empty_time, error=None, maxsize=10000):
         self.max_level = max_level
         self.empty_time = empty_time
 
         self.error = error or "Too many requests, please slow down!"
-        self.buckets = cache
+        self.store = RateLimitStore(max_level, empty_time, maxsize=maxsize)
 
     def request_for(self, key):
-        if not (bucket := self.buckets.get(key, None)):
-            bucket = self.buckets[key] = Bucket(self.max_level, self.empty_time)
-
         try:
-            bucket.request()
+            self.store.request(key)
         except BucketOverFull:
             raise SafeCancellation(details="Bucket overflow")
         except BucketFull:
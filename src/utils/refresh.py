@@ -0,0 +1,145 @@
+from typing import Any, Awaitable, Callable, Hashable, Optional
+import asyncio
+import logging
+
+from cachetools import TTLCache
+
+from .ratelimits import Bucket
+
+logger = logging.getLogger(__name__)
+
+
+RefreshCallback = Callable[[], Awaitable[Any]]
+
+
+class _Refresh:
+    __slots__ = ('channelid', 'callback', 'due', 'wakeup', 'task')
+
+    def __init__(self, channelid: int, callback: RefreshCallback, due: float):
+        self.channelid = channelid
+        self.callback: Optional[RefreshCallback] = callback
+        self.due: Optional[float] = due
+        self.wakeup = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+
+
+class MessageRefresher:
+    """
+    Shared debounced refresh service for status messages.
+
+    Refreshes are keyed by the message they update (e.g. a lobby or timer status message),
+    and consist of a callback which performs the actual edit or resend.
+    Refresh requests for a message which already has a pending refresh are coalesced into it,
+    with the latest callback winning and the earliest due time kept.
+    Requests made while a refresh is running are served by a single further refresh.
+
+    Every refresh is also charged against a per-channel ratelimit `Bucket` shared between all messages,
+    so bursts of events (e.g. members joining a voice channel) produce
+    at most one edit per message per debounce window, and never exceed the channel budget.
+    """
+    def __init__(self, debounce: float = 5, channel_limit: int = 5, channel_period: float = 5):
+        self.debounce = debounce
+        self.channel_limit = channel_limit
+        self.channel_period = channel_period
+
+        self._refreshes: dict[Hashable, _Refresh] = {}
+        self._buckets: TTLCache[int, Bucket] = TTLCache(maxsize=10000, ttl=channel_period * 10)
+
+    def __repr__(self):
+        return (
+            "<MessageRefresher "
+            f"pending={len(self._refreshes)} "
+            f"channels={len(self._buckets)}"
+            ">"
+        )
+
+    def bucket_for(self, channelid: int) -> Bucket:
+        if (bucket := self._buckets.get(channelid, None)) is None:
+            bucket = self._buckets[channelid] = Bucket(self.channel_limit, self.channel_period)
+        return bucket
+
+    def pending(self, key: Hashable) -> bool:
+        return key in self._refreshes
+
+    def schedule(self, key: Hashable, channelid: int, callback: RefreshCallback,
+                 delay: Optional[float] = None):
+        """
+        Request a refresh of the message with the given key, in `delay` seconds.
+
+        If the message already has a pending refresh, this request is coalesced into it.
+        """
+        loop = asyncio.get_running_loop()
+        due = loop.time() + (self.debounce if delay is None else delay)
+
+        refresh = self._refreshes.get(key, None)
+        if refresh is None:
+            refresh = self._refreshes[key] = _Refresh(channelid, callback, due)
+            refresh.task = asyncio.create_task(self._run(key, refresh), name=f"refresh-{key}")
+        else:
+            refresh.channelid = channelid
+            refresh.callback = callback
+            if refresh.due is None or due < refresh.due:
+                refresh.due = due
+                refresh.wakeup.set()
+
+    def cancel(self, key: Hashable):
+        """
+        Cancel any pending refresh of the message with the given key.
+
+        A refresh which is already running is allowed to complete.
+        """
+        refresh = self._refreshes.pop(key, None)
+        if refresh is not None:
+            refresh.callback = None
+            refresh.wakeup.set()
+
+    async def refresh(self, key: Hashable, channelid: int, callback: RefreshCallback):
+        """
+        Immediately refresh the message with the given key, subject to the channel budget.
+
+        Any pending refresh of the message is dropped, since this refresh supersedes it.
+        """
+        self.cancel(key)
+        bucket = self.bucket_for(channelid)
+        await bucket.wait()
+        bucket.request()
+        return await callback()
+
+    async def _run(self, key: Hashable, refresh: _Refresh):
+        loop = asyncio.get_running_loop()
+        try:
+            while refresh.callback is not None:
+                # Wait until due, waking early if the due time is brought forwards
+                while refresh.callback is not None and (delay := refresh.due - loop.time()) > 0:
+                    refresh.wakeup.clear()
+                    try:
+                        await asyncio.wait_for(refresh.wakeup.wait(), timeout=delay)
+                    except asyncio.TimeoutError:
+                        pass
+                if refresh.callback is None:
+                    break
+
+                bucket = self.bucket_for(refresh.channelid)
+                await bucket.wait()
+                if refresh.callback is None:
+                    # Cancelled while waiting for the channel budget
+                    break
+                bucket.request()
+
+                # Requests arriving from here will schedule a further refresh
+                callback = refresh.callback
+                refresh.callback = None
+                refresh.due = None
+                try:
+                    await asyncio.shield(asyncio.create_task(callback()))
+                except asyncio.CancelledError:
+                    raise
+                except Exception:
+                    logger.exception(
+                        f"Unhandled exception while refreshing message <key: {key}>"
+                    )
+        except asyncio.CancelledError:
+            pass
+        finally:
+            if self._refreshes.get(key, None) is refresh:
+                self._refreshes.pop(key, None)